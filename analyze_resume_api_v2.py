@@ -1,14 +1,14 @@
 import os
 from flask import Flask, request, jsonify
 import docx2txt
-import tempfile
-import requests
-import openai
 import json
 import re
 import io
 import plotly.graph_objects as go
 from datetime import datetime
+from llm_gateway import chat_completion
+from plotly_exporter import exporter as plotly_exporter, export_image
+from slack_transport import get_transport as get_slack_transport
 
 # Slack Bot Token을 환경 변수에서 가져오기
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN", "your-slack-bot-token-here")
@@ -25,7 +25,6 @@ def analyze_resume():
             return jsonify({"error": "OpenAI API 키가 필요합니다."}), 401
         
         print(f"API 키 확인됨: {api_key[:10]}...")
-        openai.api_key = api_key
         
         # 요청 데이터 확인
         data = request.get_json()
@@ -76,7 +75,8 @@ def analyze_resume():
         }}
         """
         
-        response = openai.ChatCompletion.create(
+        response = chat_completion(
+            api_key=api_key,
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "You are a resume analyzer that only outputs in valid JSON format."},
@@ -174,18 +174,15 @@ def create_plotly_radar_chart(skills_dict):
         margin=dict(l=80, r=80, t=100, b=80)
     )
     
-    # 이미지로 저장
-    img_bytes = io.BytesIO()
-    fig.write_image(img_bytes, format='png', engine='kaleido')
-    img_bytes.seek(0)
+    # 이미지로 저장 (상주 내보내기 엔진 사용)
+    img_bytes = io.BytesIO(export_image(fig, format='png'))
     return img_bytes
 
 def upload_image_to_slack(image_bytes, title, channel_id):
     """이미지를 Slack에 업로드하고 URL 반환"""
     try:
-        response = requests.post(
-            'https://slack.com/api/files.upload',
-            headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}"},
+        result = get_slack_transport(SLACK_BOT_TOKEN).api_call(
+            "files.upload",
             files={
                 'file': ('chart.png', image_bytes, 'image/png')
             },
@@ -196,10 +193,8 @@ def upload_image_to_slack(image_bytes, title, channel_id):
             }
         )
         
-        if response.status_code == 200:
-            result = response.json()
-            if result.get('ok'):
-                return result['file']['url_private']
+        if result.get('ok'):
+            return result['file']['url_private']
         return None
     except Exception as e:
         print(f"이미지 업로드 오류: {str(e)}")
@@ -384,4 +379,6 @@ def create_stat_card_blocks(result, channel_id=None):
 
 if __name__ == "__main__":
     print("분석 API 서버 시작 (포트 5050)")
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        plotly_exporter.warm_up()
     app.run(port=5050, debug=True)
\ No newline at end of file
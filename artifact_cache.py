@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+메모리 아티팩트 캐시
+렌더링된 차트 PNG, 생성된 PDF 같은 바이트 결과물을 프로세스 메모리에 보관합니다.
+항목 수/전체 바이트 수 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제하고,
+ttl(초)을 주면 저장 후 ttl이 지난 항목은 만료됩니다.
+바이트가 아닌 값(str, dict 등)을 넣을 때는 sizeof로 항목 크기를 계산하는 함수를 넘깁니다 (기본: len).
+UserArtifactStore는 사용자마다 별도의 상한을 두는 저장소입니다 (사전 생성된 PDF 보고서 등).
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+
+class ArtifactCache:
+    """스레드 안전 LRU 바이트 캐시"""
+
+    def __init__(self, name="artifacts", max_entries=256, max_bytes=None, ttl=None, sizeof=len):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof  # 값 -> 바이트 수 (max_bytes와 stats()["bytes"]에 사용)
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()  # key -> (value, created_at, size)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """캐시 조회 (없거나 만료되었으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and entry[1] < time.time() - self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        """캐시 저장 후 상한을 넘으면 LRU 순서로 삭제"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            size = self.sizeof(value)
+            self._entries[key] = (value, time.time(), size)
+            self._total_bytes += size
+            while self._entries and (
+                    len(self._entries) > self.max_entries or
+                    (self.max_bytes is not None and self._total_bytes > self.max_bytes)):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                logging.debug(f"아티팩트 캐시 LRU 정리 ({self.name}): {str(oldest_key)[:12]}")
+
+    def invalidate(self, key=None):
+        """특정 키 또는 전체 삭제 - 삭제된 항목 수 반환"""
+        with self._lock:
+            if key is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._total_bytes = 0
+            elif key in self._entries:
+                self._remove(key)
+                removed = 1
+            else:
+                removed = 0
+        return removed
+
+    def stats(self):
+        """적중/미스 횟수와 현재 크기"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class UserArtifactStore:
+    """사용자별 아티팩트 캐시 묶음 - 사용자당 max_entries_per_user개, 최근 사용자 max_users명까지 보관"""
+
+    def __init__(self, name="user_artifacts", max_users=200, max_entries_per_user=3, ttl=None):
+        self.name = name
+        self.max_users = max_users
+        self.max_entries_per_user = max_entries_per_user
+        self.ttl = ttl
+
+        self._users = OrderedDict()  # user_id -> ArtifactCache
+        self._lock = threading.Lock()
+
+    def _user_cache(self, user_id, create=False):
+        with self._lock:
+            cache = self._users.get(user_id)
+            if cache is None and create:
+                cache = ArtifactCache(f"{self.name}:{user_id}", max_entries=self.max_entries_per_user, ttl=self.ttl)
+                self._users[user_id] = cache
+                while len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+            if cache is not None:
+                self._users.move_to_end(user_id)
+            return cache
+
+    def get(self, user_id, key):
+        cache = self._user_cache(user_id)
+        return cache.get(key) if cache is not None else None
+
+    def set(self, user_id, key, value):
+        self._user_cache(user_id, create=True).set(key, value)
+
+    def invalidate(self, user_id=None):
+        """특정 사용자 또는 전체 삭제 - 삭제된 항목 수 반환"""
+        with self._lock:
+            if user_id is None:
+                caches = list(self._users.values())
+                self._users.clear()
+            else:
+                cache = self._users.pop(user_id, None)
+                caches = [cache] if cache is not None else []
+        return sum(cache.invalidate() for cache in caches)
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+스레드 안전 레이더 차트 렌더러
+pyplot(전역 상태) 대신 Figure/FigureCanvasAgg 객체 API만 사용합니다.
+스레드마다 극좌표 축 템플릿을 한 번 만들어 두고, 렌더링할 때는 데이터와 라벨만 교체합니다.
+렌더링된 PNG는 (스킬 데이터, 차트 스타일 버전) 해시로 캐시하여
+DM 업로드/PDF 리포트/대시보드가 같은 차트를 한 번만 그리도록 합니다.
+시장 기술스택 분포 차트도 같은 방식(객체 API + 시장 스냅샷별 캐시)으로 그립니다.
+
+벤치마크: python chart_renderer.py [스레드 수] [렌더링 횟수]
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import threading
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from artifact_cache import ArtifactCache
+from result_cache import make_cache_key
+
+RADAR_MAX_SKILLS = 8  # 차트에 표시할 상위 스킬 수
+RADAR_COLOR = '#36A2EB'
+RADAR_DPI = 150
+CHART_STYLE_VERSION = "radar-v1"  # 차트 모양(크기/색상/라벨)을 바꾸면 올려서 캐시 무효화
+SKILL_CHART_STYLE_VERSION = "skill-bar-v1"
+SKILL_CHART_COLOR = '#FF6384'
+
+CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", "256"))  # 렌더링된 차트 최대 보관 개수
+CHART_CACHE_MAX_BYTES = int(os.getenv("CHART_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 차트 캐시 메모리 상한
+
+chart_cache = ArtifactCache("charts", max_entries=CHART_CACHE_SIZE, max_bytes=CHART_CACHE_MAX_BYTES)
+
+_local = threading.local()
+
+
+class _RadarTemplate:
+    """축/격자/제목/범례가 미리 구성된 레이더 차트 (한 스레드 전용)"""
+
+    def __init__(self):
+        self.figure = Figure(figsize=(10, 10))
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot(projection='polar')
+
+        # 데이터 자리표시 - 렌더링 때 좌표만 교체
+        self.line, = self.ax.plot([], [], 'o-', linewidth=2, label='기술 스킬', color=RADAR_COLOR)
+        self.area, = self.ax.fill([0, 0, 0], [0, 0, 0], alpha=0.25, color=RADAR_COLOR)
+
+        # Y축 (반지름) 설정
+        self.ax.set_ylim(0, 100)
+        self.ax.set_yticks([20, 40, 60, 80, 100])
+        self.ax.set_yticklabels(['20%', '40%', '60%', '80%', '100%'], fontsize=9)
+
+        # 격자 스타일 / 제목 / 범례
+        self.ax.grid(True, alpha=0.3)
+        self.ax.set_facecolor('#FAFAFA')
+        self.ax.set_title('기술 스킬 레이더 차트', size=16, fontweight='bold', pad=20)
+        self.ax.legend(loc='upper right', bbox_to_anchor=(1.2, 1.0))
+
+    def render(self, categories, values):
+        N = len(categories)
+
+        # 각도 계산 (360도를 N개로 분할) + 원을 완성하기 위해 첫 번째 값을 마지막에 추가
+        angles = [n / N * 2 * np.pi for n in range(N)]
+        angles += angles[:1]
+        values = list(values) + values[:1]
+
+        self.line.set_data(angles, values)
+        self.area.set_xy(np.column_stack([angles, values]))
+
+        # 카테고리 라벨 설정
+        self.ax.set_xticks(angles[:-1])
+        self.ax.set_xticklabels(categories, fontsize=11)
+
+        buffer = BytesIO()
+        self.figure.savefig(buffer, format='png', dpi=RADAR_DPI, bbox_inches='tight',
+                            facecolor='white', edgecolor='none')
+        return buffer.getvalue()
+
+
+def _get_template():
+    template = getattr(_local, "radar_template", None)
+    if template is None:
+        template = _RadarTemplate()
+        _local.radar_template = template
+    return template
+
+
+def render_radar_chart(skills_dict):
+    """스킬 dict로 레이더 차트 PNG 바이트 생성 (실패 시 None)"""
+    if not skills_dict:
+        logging.error("Empty skills dictionary provided")
+        return None
+
+    try:
+        # 데이터 정제 - 상위 8개 스킬만 선택
+        sorted_skills = sorted(skills_dict.items(), key=lambda x: x[1], reverse=True)[:RADAR_MAX_SKILLS]
+        categories = [skill for skill, _ in sorted_skills]
+        values = [value for _, value in sorted_skills]
+        if not categories:
+            logging.error("No skills to chart")
+            return None
+
+        png_bytes = _get_template().render(categories, values)
+        logging.debug("Generated PNG size: %d bytes", len(png_bytes))
+        return png_bytes
+
+    except Exception as e:
+        logging.error("Error creating radar chart: %s", str(e), exc_info=True)
+        # 템플릿 상태가 깨졌을 수 있으므로 다음 렌더링 때 새로 생성
+        _local.radar_template = None
+        return None
+
+
+def radar_chart_key(skills_dict):
+    """스킬 dict의 정규화된 해시 + 스타일 버전 (순서/정수·실수 표기와 무관)"""
+    canonical = {}
+    for skill, value in skills_dict.items():
+        try:
+            canonical[str(skill)] = float(value)
+        except (TypeError, ValueError):
+            canonical[str(skill)] = str(value)
+    return make_cache_key("radar", CHART_STYLE_VERSION, canonical)
+
+
+def get_radar_chart(skills_dict):
+    """캐시된 레이더 차트 PNG 반환 - 없으면 렌더링 후 저장"""
+    if not skills_dict:
+        return render_radar_chart(skills_dict)
+
+    key = radar_chart_key(skills_dict)
+    png_bytes = chart_cache.get(key)
+    if png_bytes is not None:
+        logging.debug("레이더 차트 캐시 적중 - key: %s", key[:12])
+        return png_bytes
+
+    png_bytes = render_radar_chart(skills_dict)
+    if png_bytes:
+        chart_cache.set(key, png_bytes)
+    return png_bytes
+
+
+def render_skill_distribution_chart(skill_counts, title='기술스택 분포'):
+    """기술스택별 공고 수 가로 막대 차트 PNG 바이트 생성 (실패 시 None)"""
+    if not skill_counts:
+        logging.error("Empty skill distribution provided")
+        return None
+
+    try:
+        # 많은 순서대로 위에서 아래로 표시
+        sorted_skills = sorted(skill_counts.items(), key=lambda x: x[1])
+        names = [skill for skill, _ in sorted_skills]
+        counts = [count for _, count in sorted_skills]
+
+        figure = Figure(figsize=(10, max(4, 0.45 * len(names) + 1.5)))
+        FigureCanvasAgg(figure)
+        ax = figure.add_subplot()
+        bars = ax.barh(names, counts, color=SKILL_CHART_COLOR, alpha=0.8)
+        ax.bar_label(bars, labels=[f"{count}개" for count in counts], padding=3, fontsize=10)
+
+        ax.set_title(title, size=16, fontweight='bold', pad=15)
+        ax.set_xlabel('공고 수')
+        ax.grid(True, axis='x', alpha=0.3)
+        ax.set_axisbelow(True)
+        for side in ('top', 'right'):
+            ax.spines[side].set_visible(False)
+
+        buffer = BytesIO()
+        figure.savefig(buffer, format='png', dpi=RADAR_DPI, bbox_inches='tight',
+                       facecolor='white', edgecolor='none')
+        return buffer.getvalue()
+
+    except Exception as e:
+        logging.error("Error creating skill distribution chart: %s", str(e), exc_info=True)
+        return None
+
+
+def get_skill_distribution_chart(skill_counts, title='기술스택 분포'):
+    """시장 스냅샷(기술스택 분포)별로 캐시된 막대 차트 PNG 반환 - 없으면 렌더링 후 저장"""
+    if not skill_counts:
+        return None
+
+    key = make_cache_key("skill_distribution", SKILL_CHART_STYLE_VERSION, title, skill_counts)
+    png_bytes = chart_cache.get(key)
+    if png_bytes is not None:
+        logging.debug("기술스택 분포 차트 캐시 적중 - key: %s", key[:12])
+        return png_bytes
+
+    png_bytes = render_skill_distribution_chart(skill_counts, title)
+    if png_bytes:
+        chart_cache.set(key, png_bytes)
+    return png_bytes
+
+
+def benchmark(threads=8, renders=200):
+    """threads개 스레드로 renders번 렌더링하여 초당 렌더링 수 측정"""
+    skill_names = ["Python", "Java", "React", "SQL", "Docker", "AWS", "Kotlin", "Spark", "Go", "TypeScript"]
+    rng = random.Random(42)
+    samples = [
+        {skill: rng.randint(10, 100) for skill in rng.sample(skill_names, rng.randint(3, 10))}
+        for _ in range(renders)
+    ]
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        # 스레드별 템플릿 생성 비용은 측정에서 제외
+        list(executor.map(lambda _: _get_template(), range(threads * 4)))
+
+        started_at = time.perf_counter()
+        results = list(executor.map(render_radar_chart, samples))
+        elapsed = time.perf_counter() - started_at
+
+    failed = sum(1 for png in results if not png)
+    return {
+        "threads": threads,
+        "renders": renders,
+        "failed": failed,
+        "seconds": round(elapsed, 3),
+        "renders_per_second": round(renders / elapsed, 2),
+    }
+
+
+if __name__ == "__main__":
+    thread_count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    render_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(benchmark(thread_count, render_count))
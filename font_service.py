@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+한글 폰트 서비스
+서버 시작 시 한 번만 한글 폰트를 찾아(환경변수 경로 → OS 기본 경로 → fontconfig → fonts/ 디렉토리)
+matplotlib, WordCloud, ReportLab, Plotly에 등록합니다.
+fonts/ 디렉토리의 NanumGothic.ttf / NanumGothicBold.ttf는 저장소에 포함되어 있지 않으므로
+한글 폰트가 없는 호스트에서는 배포 시 넣어 두거나 KOREAN_FONT_PATH를 지정해야 합니다.
+찾은 폰트는 한글 글리프가 있는지 확인한 뒤 사용합니다 (없으면 차트/PDF에 네모 문자가 표시됨).
+ReportLab TTF 파싱과 matplotlib 폰트 등록은 프로세스당 한 번만 수행되고,
+이후 보고서/차트 생성은 등록된 폰트 이름만 사용합니다.
+"""
+
+import os
+import shutil
+import logging
+import threading
+import subprocess
+
+KOREAN_FONT_PATH = os.getenv("KOREAN_FONT_PATH")  # 한글 폰트 경로 (지정 시 최우선)
+KOREAN_BOLD_FONT_PATH = os.getenv("KOREAN_BOLD_FONT_PATH")  # 한글 굵은 폰트 경로 (없으면 일반 폰트 사용)
+
+PROVISIONED_FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")  # 배포 시 폰트를 넣어 두는 디렉토리
+HANGUL_SAMPLE = "가한글"  # 한글 지원 여부를 확인할 글자
+
+# (일반, 굵게) 후보 - ReportLab은 TrueType(.ttf)만 지원
+_FONT_CANDIDATES = [
+    ("C:/Windows/Fonts/malgun.ttf", "C:/Windows/Fonts/malgunbd.ttf"),
+    ("C:/Windows/Fonts/NanumGothic.ttf", "C:/Windows/Fonts/NanumGothicBold.ttf"),
+    ("/usr/share/fonts/truetype/nanum/NanumGothic.ttf", "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf"),
+    ("/usr/share/fonts/nanum/NanumGothic.ttf", "/usr/share/fonts/nanum/NanumGothicBold.ttf"),
+    ("/Library/Fonts/NanumGothic.ttf", "/Library/Fonts/NanumGothicBold.ttf"),
+]
+_PROVISIONED_FONT = (os.path.join(PROVISIONED_FONT_DIR, "NanumGothic.ttf"),
+                     os.path.join(PROVISIONED_FONT_DIR, "NanumGothicBold.ttf"))
+
+PDF_FONT_NAME = "KoreanFont"
+PDF_BOLD_FONT_NAME = "KoreanFont-Bold"
+PDF_FALLBACK_FONT_NAME = "Helvetica"
+PDF_FALLBACK_BOLD_FONT_NAME = "Helvetica-Bold"
+
+_lock = threading.Lock()
+_resolved = None
+_matplotlib_configured = False
+_reportlab_fonts = None
+
+
+def _covers_hangul(path):
+    """폰트 파일에 한글 글리프가 있는지 (확인할 수 없으면 True)"""
+    try:
+        from matplotlib.ft2font import FT2Font
+        charmap = FT2Font(path).get_charmap()
+    except ImportError:
+        return True
+    except Exception as e:
+        logging.warning(f"폰트 글리프 확인 실패 ({path}): {str(e)}")
+        return False
+    return all(ord(char) in charmap for char in HANGUL_SAMPLE)
+
+
+def _fontconfig_lookup():
+    """fontconfig(fc-list)로 한글을 지원하는 TrueType 폰트 경로 조회 (없으면 None)
+
+    fc-match는 한글 폰트가 없어도 가장 가까운 폰트(DejaVuSans 등)를 돌려주므로 쓰지 않음
+    """
+    if not shutil.which("fc-list"):
+        return None
+    try:
+        output = subprocess.run(
+            ["fc-list", "-f", "%{file}\n", ":lang=ko"],
+            capture_output=True, text=True, timeout=5
+        ).stdout
+    except Exception as e:
+        logging.warning(f"fontconfig 조회 실패: {str(e)}")
+        return None
+    for path in sorted(line.strip() for line in output.splitlines()):
+        if path.lower().endswith(".ttf") and os.path.exists(path) and _covers_hangul(path):
+            return path
+    return None
+
+
+def _discover():
+    """한글 폰트 (일반, 굵게) 경로 탐색 - 찾지 못하면 (None, None)"""
+    if KOREAN_FONT_PATH:
+        if not os.path.exists(KOREAN_FONT_PATH):
+            logging.error(f"KOREAN_FONT_PATH 폰트 파일이 없습니다: {KOREAN_FONT_PATH}")
+        elif not _covers_hangul(KOREAN_FONT_PATH):
+            logging.error(f"KOREAN_FONT_PATH 폰트에 한글 글리프가 없습니다: {KOREAN_FONT_PATH}")
+        else:
+            bold_path = KOREAN_BOLD_FONT_PATH if KOREAN_BOLD_FONT_PATH and os.path.exists(KOREAN_BOLD_FONT_PATH) else None
+            return KOREAN_FONT_PATH, bold_path
+
+    for regular_path, bold_path in _FONT_CANDIDATES:
+        if os.path.exists(regular_path) and _covers_hangul(regular_path):
+            return regular_path, bold_path if os.path.exists(bold_path) else None
+
+    fontconfig_path = _fontconfig_lookup()
+    if fontconfig_path:
+        return fontconfig_path, None
+
+    regular_path, bold_path = _PROVISIONED_FONT
+    if os.path.exists(regular_path) and _covers_hangul(regular_path):
+        return regular_path, bold_path if os.path.exists(bold_path) else None
+
+    return None, None
+
+
+def get_korean_font():
+    """탐색된 한글 폰트 정보 {"path", "bold_path", "family"} (처음 호출 시 한 번만 탐색)"""
+    global _resolved
+    with _lock:
+        if _resolved is None:
+            regular_path, bold_path = _discover()
+            family = None
+            if regular_path:
+                try:
+                    from matplotlib import font_manager
+                    family = font_manager.FontProperties(fname=regular_path).get_name()
+                except Exception as e:
+                    logging.warning(f"폰트 이름 확인 실패 ({regular_path}): {str(e)}")
+                logging.info(f"한글 폰트 사용 - {regular_path} (굵게: {bold_path or '없음'}, family: {family})")
+            else:
+                logging.error("한글 폰트를 찾지 못했습니다 - 차트/PDF의 한글이 네모로 표시됩니다. "
+                              "KOREAN_FONT_PATH를 설정하거나 fonts/NanumGothic.ttf를 넣어 두세요 (저장소에는 포함되지 않음).")
+            _resolved = {"path": regular_path, "bold_path": bold_path or regular_path, "family": family}
+        return _resolved
+
+
+def configure_matplotlib():
+    """matplotlib 폰트 매니저에 한글 폰트를 한 번 등록하고 기본 글꼴로 지정"""
+    global _matplotlib_configured
+    font = get_korean_font()
+    with _lock:
+        if _matplotlib_configured:
+            return
+        import matplotlib
+        from matplotlib import font_manager
+        if font["path"]:
+            font_manager.fontManager.addfont(font["path"])
+            if font["bold_path"] != font["path"]:
+                font_manager.fontManager.addfont(font["bold_path"])
+            if font["family"]:
+                matplotlib.rcParams['font.family'] = font["family"]
+        matplotlib.rcParams['axes.unicode_minus'] = False
+        _matplotlib_configured = True
+
+
+def register_reportlab_fonts():
+    """ReportLab에 한글 폰트를 한 번만 등록 - (일반 폰트 이름, 굵은 폰트 이름) 반환"""
+    global _reportlab_fonts
+    font = get_korean_font()
+    with _lock:
+        if _reportlab_fonts is None:
+            _reportlab_fonts = (PDF_FALLBACK_FONT_NAME, PDF_FALLBACK_BOLD_FONT_NAME)
+            if font["path"]:
+                try:
+                    from reportlab.pdfbase import pdfmetrics
+                    from reportlab.pdfbase.ttfonts import TTFont
+                    pdfmetrics.registerFont(TTFont(PDF_FONT_NAME, font["path"]))
+                    if font["bold_path"] != font["path"]:
+                        pdfmetrics.registerFont(TTFont(PDF_BOLD_FONT_NAME, font["bold_path"]))
+                        _reportlab_fonts = (PDF_FONT_NAME, PDF_BOLD_FONT_NAME)
+                    else:
+                        # 굵은 폰트가 없으면 같은 TTF를 두 번 파싱하지 않고 일반 폰트 사용
+                        _reportlab_fonts = (PDF_FONT_NAME, PDF_FONT_NAME)
+                except Exception as e:
+                    logging.error(f"ReportLab 한글 폰트 등록 실패, 기본 폰트 사용: {str(e)}")
+        return _reportlab_fonts
+
+
+def wordcloud_font_path():
+    """WordCloud에 넘길 한글 폰트 경로 (없으면 None - WordCloud 기본 폰트)"""
+    return get_korean_font()["path"]
+
+
+def plotly_font_family():
+    """Plotly 차트용 글꼴 이름"""
+    return get_korean_font()["family"] or "sans-serif"
+
+
+def setup_fonts():
+    """서버 시작 시 모든 렌더러에 한글 폰트 등록"""
+    configure_matplotlib()
+    register_reportlab_fonts()
+    return get_korean_font()
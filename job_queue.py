@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+백그라운드 작업 큐
+Slack 핸들러는 작업을 등록만 하고 즉시 응답하며,
+실제 처리(다운로드, GPT 분석, 차트, 업로드)는 고정 크기 워커 풀이 수행합니다.
+작업은 SQLite에 저장되므로 서버가 재시작되어도 유실되지 않습니다.
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+
+# 작업 유형
+JOB_ANALYZE_RESUME = "analyze_resume"
+JOB_MATCH_JD = "match_jd"
+JOB_MATCH_ALL_JDS = "match_all_jds"
+JOB_REGISTER_JD = "register_jd"
+JOB_BUILD_PDF = "build_pdf"
+JOB_REFRESH_MARKET = "refresh_market"
+JOB_MARKET_CHART = "market_chart"
+JOB_NOTION_SYNC = "notion_sync"
+
+# 작업 상태
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+class JobQueue:
+    """SQLite에 영속화되는 작업 큐 + 제한된 워커 풀"""
+
+    def __init__(self, db_path="jobs.db", max_workers=4, max_attempts=2,
+                 poll_interval=1.0, retention_seconds=7 * 24 * 3600):
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+
+        self._handlers = {}
+        self._db_lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._workers = []
+        self._started = False
+        self._stopping = False
+
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+    def _init_db(self):
+        """작업 테이블 생성"""
+        with self._db_lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_type TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    dedupe_key TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs(dedupe_key, status)")
+
+    def register_handler(self, job_type, handler):
+        """작업 유형별 처리 함수 등록 (handler(payload))"""
+        self._handlers[job_type] = handler
+
+    def enqueue(self, job_type, payload, dedupe_key=None):
+        """작업 등록 - 같은 dedupe_key의 작업이 대기/실행 중이면 기존 작업 ID 반환"""
+        now = time.time()
+        with self._db_lock, self._conn:
+            if dedupe_key:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE dedupe_key = ? AND status IN (?, ?) LIMIT 1",
+                    (dedupe_key, STATUS_QUEUED, STATUS_RUNNING)
+                ).fetchone()
+                if row:
+                    logging.info(f"중복 작업 무시 - type: {job_type}, key: {dedupe_key}, job_id: {row['id']}")
+                    return row["id"]
+
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (job_type, payload, status, dedupe_key, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_type, json.dumps(payload, ensure_ascii=False), STATUS_QUEUED, dedupe_key, now, now)
+            )
+            job_id = cursor.lastrowid
+
+        logging.info(f"작업 등록 - type: {job_type}, job_id: {job_id}")
+        self.start()
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def get_job(self, job_id):
+        """작업 상태 조회"""
+        with self._db_lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def pending_count(self):
+        """대기 중인 작업 수"""
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS cnt FROM jobs WHERE status = ?", (STATUS_QUEUED,)
+            ).fetchone()
+        return row["cnt"]
+
+    def start(self):
+        """워커 풀 시작 (여러 번 호출해도 한 번만 시작)"""
+        with self._wakeup:
+            if self._started:
+                return
+            self._started = True
+            self._stopping = False
+
+        self._recover_interrupted_jobs()
+        self._purge_old_jobs()
+
+        for i in range(self.max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}")
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+        logging.info(f"작업 워커 풀 시작 - workers: {self.max_workers}, db: {self.db_path}")
+
+    def stop(self, timeout=None):
+        """워커 풀 종료"""
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+        self._started = False
+
+    def _recover_interrupted_jobs(self):
+        """이전 프로세스에서 실행 중이던 작업을 다시 대기열로 복구"""
+        now = time.time()
+        with self._db_lock, self._conn:
+            failed = self._conn.execute(
+                "UPDATE jobs SET status = ?, last_error = ?, updated_at = ? "
+                "WHERE status = ? AND attempts >= ?",
+                (STATUS_FAILED, "interrupted", now, STATUS_RUNNING, self.max_attempts)
+            ).rowcount
+            recovered = self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (STATUS_QUEUED, now, STATUS_RUNNING)
+            ).rowcount
+        if recovered or failed:
+            logging.info(f"중단된 작업 복구 - 재시도: {recovered}개, 실패 처리: {failed}개")
+
+    def _purge_old_jobs(self):
+        """보관 기간이 지난 완료/실패 작업 삭제"""
+        cutoff = time.time() - self.retention_seconds
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (STATUS_DONE, STATUS_FAILED, cutoff)
+            )
+
+    def _claim_next_job(self):
+        """대기 중인 작업 하나를 실행 상태로 가져오기"""
+        with self._db_lock, self._conn:
+            while True:
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (STATUS_QUEUED,)
+                ).fetchone()
+                if not row:
+                    return None
+                # 다른 프로세스가 먼저 가져간 경우를 대비해 상태 조건으로 갱신
+                claimed = self._conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? "
+                    "WHERE id = ? AND status = ?",
+                    (STATUS_RUNNING, time.time(), row["id"], STATUS_QUEUED)
+                ).rowcount
+                if claimed:
+                    job = dict(row)
+                    job["attempts"] += 1
+                    return job
+
+    def _finish_job(self, job, error=None):
+        """작업 결과 기록 (실패 시 재시도 횟수가 남아 있으면 다시 대기열로)"""
+        if error is None:
+            status = STATUS_DONE
+        elif job["attempts"] < self.max_attempts:
+            status = STATUS_QUEUED
+        else:
+            status = STATUS_FAILED
+
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                (status, error, time.time(), job["id"])
+            )
+        return status
+
+    def _worker_loop(self):
+        while True:
+            with self._wakeup:
+                if self._stopping:
+                    return
+
+            try:
+                job = self._claim_next_job()
+            except Exception as e:
+                logging.error(f"작업 조회 오류: {str(e)}", exc_info=True)
+                job = None
+
+            if not job:
+                with self._wakeup:
+                    if not self._stopping:
+                        self._wakeup.wait(self.poll_interval)
+                continue
+
+            self._run_job(job)
+
+    def _run_job(self, job):
+        job_type = job["job_type"]
+        handler = self._handlers.get(job_type)
+        started_at = time.time()
+
+        if not handler:
+            logging.error(f"등록되지 않은 작업 유형: {job_type} (job_id: {job['id']})")
+            self._finish_job(dict(job, attempts=self.max_attempts), error=f"no handler for {job_type}")
+            return
+
+        logging.info(f"작업 시작 - type: {job_type}, job_id: {job['id']}, attempt: {job['attempts']}")
+        try:
+            handler(json.loads(job["payload"]))
+            self._finish_job(job)
+            logging.info(f"작업 완료 - type: {job_type}, job_id: {job['id']}, "
+                         f"소요: {time.time() - started_at:.2f}s")
+        except Exception as e:
+            status = self._finish_job(job, error=str(e))
+            logging.error(f"작업 실패 - type: {job_type}, job_id: {job['id']}, status: {status}, "
+                          f"error: {str(e)}", exc_info=True)
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+LLM 게이트웨이
+모든 OpenAI 호출이 이 모듈을 거치도록 하여
+- 하나의 커넥션 풀(클라이언트)을 재사용하고
+- 분당 요청 수(RPM)/토큰 수(TPM) 토큰 버킷으로 프로세스 전체 쿼터를 공유하며
+- 429/5xx/네트워크 오류는 지터가 들어간 지수 백오프로 재시도하고
+- 호출별 마감 시간(deadline)을 넘기면 중단합니다.
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+from collections import OrderedDict
+
+import httpx
+from openai import OpenAI, RateLimitError, APIConnectionError, InternalServerError
+
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "60"))  # 분당 요청 수 쿼터
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "40000"))  # 분당 토큰 수 쿼터
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))  # 동시 호출 상한
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))  # 재시도 횟수
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "120"))  # 호출당 기본 마감 시간 (재시도 포함)
+LLM_BACKOFF_BASE = 1.0  # 첫 재시도 대기 시간 (초)
+LLM_BACKOFF_MAX = 30.0  # 재시도 대기 시간 상한 (초)
+DEFAULT_COMPLETION_TOKENS = 1500  # max_tokens 미지정 시 응답 토큰 추정치
+LLM_CLIENT_CACHE_SIZE = 4  # 서버 키 외에 재사용할 요청자 API 키별 클라이언트 수 (최근 사용 순)
+
+
+class LLMDeadlineExceeded(Exception):
+    """쿼터 대기나 재시도 중 호출 마감 시간을 넘긴 경우"""
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷 (capacity 만큼 쌓이고 초당 refill_rate 만큼 채워짐)"""
+
+    def __init__(self, capacity, refill_rate):
+        self.capacity = float(capacity)
+        self.refill_rate = float(refill_rate)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+    def acquire(self, amount=1, deadline=None):
+        """토큰을 얻을 때까지 대기 - deadline(monotonic 시각)까지 못 얻으면 False"""
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return True
+                wait = (amount - self._tokens) / self.refill_rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(min(wait, 1.0))
+
+    def adjust(self, amount):
+        """실제 사용량과 추정치의 차이 보정 (양수: 반환, 음수: 추가 차감)"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+_request_bucket = TokenBucket(LLM_RPM_LIMIT, LLM_RPM_LIMIT / 60.0)
+_token_bucket = TokenBucket(LLM_TPM_LIMIT, LLM_TPM_LIMIT / 60.0)
+_concurrency = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+
+_server_clients = {}  # 서버 자체 키 -> 클라이언트 (프로세스 수명 동안 유지)
+_request_clients = OrderedDict()  # 요청자가 보낸 키 -> 클라이언트 (최근 LLM_CLIENT_CACHE_SIZE개만 보관)
+_clients_lock = threading.Lock()
+
+
+def _create_client(api_key):
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONCURRENCY * 2,
+            max_keepalive_connections=LLM_MAX_CONCURRENCY
+        ),
+        timeout=LLM_DEADLINE_SECONDS
+    )
+    # 재시도는 게이트웨이가 직접 관리하므로 SDK 자체 재시도는 끔
+    return OpenAI(api_key=api_key, max_retries=0, http_client=http_client)
+
+
+def get_client(api_key=None):
+    """API 키별 OpenAI 클라이언트(커넥션 풀) 재사용 - 서버 키는 계속 유지하고,
+    요청자가 보낸 키는 최근 LLM_CLIENT_CACHE_SIZE개만 보관 (오래된 키와 클라이언트는 메모리에서 제거)"""
+    server_keys = {os.getenv("GPT_API_KEY"), os.getenv("OPENAI_API_KEY")} - {None, ""}
+    api_key = api_key or os.getenv("GPT_API_KEY") or os.getenv("OPENAI_API_KEY")
+    with _clients_lock:
+        if api_key in server_keys:
+            openai_client = _server_clients.get(api_key)
+            if openai_client is None:
+                openai_client = _server_clients[api_key] = _create_client(api_key)
+            return openai_client
+
+        openai_client = _request_clients.get(api_key)
+        if openai_client is None:
+            openai_client = _request_clients[api_key] = _create_client(api_key)
+            while len(_request_clients) > LLM_CLIENT_CACHE_SIZE:
+                # 진행 중인 호출이 있을 수 있으므로 닫지 않고 참조만 제거 (호출이 끝나면 정리됨)
+                _request_clients.popitem(last=False)
+        _request_clients.move_to_end(api_key)
+        return openai_client
+
+
+def estimate_tokens(messages, max_tokens=None):
+    """요청 토큰 수 대략 추정 (한글 위주 텍스트 기준 약 2자당 1토큰) + 응답 토큰"""
+    prompt_chars = sum(len(message.get("content") or "") for message in messages)
+    return prompt_chars // 2 + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+def _retry_delay(error, attempt):
+    """Retry-After 헤더가 있으면 따르고, 없으면 지터가 들어간 지수 백오프"""
+    response = getattr(error, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+    delay = min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.5)
+
+
+def chat_completion(messages, model, deadline=None, api_key=None, **kwargs):
+    """쿼터/재시도/마감 시간이 적용된 chat.completions.create 호출"""
+    deadline_at = time.monotonic() + (deadline or LLM_DEADLINE_SECONDS)
+    estimated_tokens = estimate_tokens(messages, kwargs.get("max_tokens"))
+    openai_client = get_client(api_key)
+
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        if not _request_bucket.acquire(1, deadline_at) or \
+                not _token_bucket.acquire(estimated_tokens, deadline_at):
+            raise LLMDeadlineExceeded(f"LLM 쿼터 대기 중 마감 시간 초과 (model: {model})")
+
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0 or not _concurrency.acquire(timeout=remaining):
+            raise LLMDeadlineExceeded(f"LLM 동시 호출 대기 중 마감 시간 초과 (model: {model})")
+
+        started_at = time.monotonic()
+        try:
+            response = openai_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                timeout=max(1.0, deadline_at - started_at),
+                **kwargs
+            )
+        except (RateLimitError, APIConnectionError, InternalServerError) as e:
+            delay = _retry_delay(e, attempt)
+            if attempt >= LLM_MAX_RETRIES or time.monotonic() + delay > deadline_at:
+                logging.error(f"LLM 호출 실패 (재시도 중단) - model: {model}, attempt: {attempt + 1}, error: {str(e)}")
+                raise
+            logging.warning(f"LLM 호출 재시도 예정 - model: {model}, attempt: {attempt + 1}, "
+                            f"대기: {delay:.1f}s, error: {type(e).__name__}")
+            time.sleep(delay)
+            continue
+        finally:
+            _concurrency.release()
+
+        usage = getattr(response, "usage", None)
+        if usage is not None and getattr(usage, "total_tokens", None):
+            _token_bucket.adjust(estimated_tokens - usage.total_tokens)
+        logging.info(f"LLM 호출 완료 - model: {model}, 소요: {time.monotonic() - started_at:.2f}s, "
+                     f"tokens: {getattr(usage, 'total_tokens', 'N/A')}")
+        return response
+
+    raise LLMDeadlineExceeded(f"LLM 재시도 횟수 초과 (model: {model})")
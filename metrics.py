@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+프로세스 내 메트릭 레지스트리
+카운터/히스토그램/게이지를 라벨별로 모아 두고 Prometheus 텍스트 형식으로 내보냅니다.
+Slack 서버의 /metrics 엔드포인트가 render_prometheus() 결과를 그대로 돌려줍니다.
+"""
+
+import threading
+
+# 기본 지연 시간 버킷 (초)
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels):
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+def _format_labels(label_key, extra=()):
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    """누적 카운터"""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text=""):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def render(self):
+        with self._lock:
+            return [f"{self.name}{_format_labels(key)} {value}" for key, value in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    """현재 값 게이지"""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus 방식)"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text="", buckets=DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label_key -> [bucket_counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * len(self.buckets), 0.0, 0]
+                self._series[key] = series
+            for i, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def summary(self, **labels):
+        """관측 횟수/합계/평균"""
+        with self._lock:
+            series = self._series.get(_label_key(labels))
+            if series is None:
+                return {"count": 0, "sum": 0.0, "avg": 0.0}
+            return {"count": series[2], "sum": series[1], "avg": series[1] / series[2]}
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._series.items()):
+                for upper_bound, bucket_count in zip(self.buckets, bucket_counts):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, [('le', str(upper_bound))])} {bucket_count}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', '+Inf')])} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+
+def _get_or_create(metric_class, name, help_text, **kwargs):
+    with _metrics_lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = metric_class(name, help_text, **kwargs)
+            _metrics[name] = metric
+        elif type(metric) is not metric_class:
+            raise ValueError(f"메트릭 {name}이(가) 다른 유형으로 이미 등록되어 있습니다")
+        return metric
+
+
+def counter(name, help_text=""):
+    """이름으로 카운터 조회 (없으면 생성)"""
+    return _get_or_create(Counter, name, help_text)
+
+
+def gauge(name, help_text=""):
+    """이름으로 게이지 조회 (없으면 생성)"""
+    return _get_or_create(Gauge, name, help_text)
+
+
+def histogram(name, help_text="", buckets=DEFAULT_LATENCY_BUCKETS):
+    """이름으로 히스토그램 조회 (없으면 생성)"""
+    return _get_or_create(Histogram, name, help_text, buckets=buckets)
+
+
+def render_prometheus():
+    """등록된 모든 메트릭을 Prometheus 텍스트 형식으로 변환"""
+    with _metrics_lock:
+        metrics = sorted(_metrics.values(), key=lambda metric: metric.name)
+    lines = []
+    for metric in metrics:
+        if metric.help_text:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
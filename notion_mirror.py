@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+"""
+Notion 이력서 DB 로컬 미러
+Notion DB의 이력서 페이지를 파싱된 행과 원본 JSON으로 SQLite에 보관하고,
+백그라운드 스레드가 last_edited_time 기준으로 변경된 페이지만 주기적으로 가져옵니다.
+주기적인 전체 동기화에서 Notion에 더 이상 없는 페이지(삭제/보관)를 정리합니다.
+대시보드와 DM 검색은 Notion 대신 이 미러만 읽으므로 Notion 지연/쿼터와 무관하게 바로 응답합니다.
+DM 검색용 BM25 역색인(search_index)은 시작 시 미러 행으로 만들고, 동기화로 저장/삭제되는 페이지만 반영합니다.
+Notion 조회는 iter_database_pages() 제너레이터로 has_more/next_cursor를 끝까지 따라가며
+페이지를 하나씩 흘려보내므로 DB 전체 JSON을 한꺼번에 메모리에 올리지 않습니다.
+"""
+
+import os
+import json
+import time
+import queue
+import sqlite3
+import logging
+import threading
+
+import metrics
+from search_index import ResumeSearchIndex
+
+NOTION_REQUEST_INTERVAL = 0.35  # Notion API 요청 간격 (초) - 초당 약 3건 제한
+NOTION_PAGE_SIZE = min(int(os.getenv("NOTION_PAGE_SIZE", "100")), 100)  # databases.query 한 번에 가져올 페이지 수 (Notion 최대 100)
+NOTION_PREFETCH_PAGES = int(os.getenv("NOTION_PREFETCH_PAGES", "1"))  # 소비 중에 미리 받아 둘 다음 커서 응답 수 (0: 미리 받지 않음)
+
+# 대시보드 정렬 옵션 -> ORDER BY (같은 값이면 최근 생성 순)
+DASHBOARD_SORTS = {
+    "latest": "created_time DESC",
+    "matching_desc": "matching_score DESC, created_time DESC",
+    "years_desc": "years DESC, created_time DESC",
+    "name": "name ASC, created_time DESC",
+}
+
+_sync_seconds = metrics.histogram("notion_sync_seconds", "Notion 미러 동기화 소요 시간 (초)")
+_sync_errors = metrics.counter("notion_sync_errors_total", "Notion 미러 동기화 실패 횟수")
+_mirror_rows = metrics.gauge("notion_mirror_rows", "Notion 미러에 보관 중인 이력서 수")
+
+INDEX_FIELDS = ("name", "strengths", "summary", "tech_skills")  # 검색 인덱스에 넣는 열 (성명/강점 Top3/역량카드 요약/기술스택)
+
+
+def property_text(page, name):
+    """title/rich_text 속성의 전체 텍스트 (없으면 빈 문자열)"""
+    prop = page.get("properties", {}).get(name) or {}
+    items = prop.get("title") or prop.get("rich_text") or []
+    return "".join(item.get("plain_text") or item.get("text", {}).get("content", "") for item in items)
+
+
+class _FetchFailed:
+    """미리 받기 스레드에서 난 예외를 소비 측으로 전달"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+_FETCH_DONE = object()
+
+
+def _fetch_batches(notion_client, query):
+    """databases.query를 next_cursor로 이어 부르며 응답의 results 묶음을 차례로 반환"""
+    cursor = None
+    while True:
+        response = notion_client.databases.query(**(dict(query, start_cursor=cursor) if cursor else query))
+        yield response.get("results", [])
+
+        cursor = response.get("next_cursor")
+        if not response.get("has_more") or not cursor:
+            return
+        time.sleep(NOTION_REQUEST_INTERVAL)
+
+
+def _prefetch(batches, depth):
+    """별도 스레드가 다음 커서 응답을 최대 depth개까지 미리 받아 두는 제너레이터"""
+    buffer = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for batch in batches:
+                if not put(batch):
+                    return
+            put(_FETCH_DONE)
+        except Exception as e:
+            put(_FetchFailed(e))
+
+    producer = threading.Thread(target=produce, name="notion-prefetch")
+    producer.daemon = True
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _FETCH_DONE:
+                return
+            if isinstance(item, _FetchFailed):
+                raise item.error
+            yield item
+    finally:
+        # 소비 측이 중간에 멈추면 미리 받기도 중단
+        stopped.set()
+
+
+def iter_database_pages(notion_client, database_id, filter_conditions=None, sorts=None,
+                        page_size=NOTION_PAGE_SIZE, prefetch=NOTION_PREFETCH_PAGES):
+    """Notion DB 페이지를 하나씩 반환하는 제너레이터 (has_more/next_cursor를 끝까지 따라감)
+
+    커서는 이전 응답을 받아야 알 수 있으므로 요청 자체는 순서대로 보내고,
+    prefetch > 0이면 소비하는 동안 다음 응답을 최대 prefetch개까지 미리 받아 둡니다.
+    """
+    query = {"database_id": database_id, "page_size": min(page_size, 100)}
+    if filter_conditions:
+        query["filter"] = filter_conditions
+    if sorts:
+        query["sorts"] = sorts
+
+    batches = _fetch_batches(notion_client, query)
+    if prefetch > 0:
+        batches = _prefetch(batches, prefetch)
+    try:
+        for batch in batches:
+            yield from batch
+    finally:
+        batches.close()
+
+
+class NotionMirror:
+    """SQLite에 저장되는 Notion DB 미러 + 증분 동기화 스레드"""
+
+    def __init__(self, db_path, notion_client, database_id, parse_pages,
+                 sync_interval=60, full_resync_interval=6 * 3600):
+        self.db_path = db_path
+        self.notion = notion_client
+        self.database_id = database_id
+        self.parse_pages = parse_pages  # Notion 페이지 목록 -> 대시보드용 행 목록 (각 행에 'id')
+        self.sync_interval = sync_interval
+        self.full_resync_interval = full_resync_interval
+
+        self._db_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._thread = None
+
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+        self.index = ResumeSearchIndex()
+        self._load_index()
+
+    def _init_db(self):
+        """미러 테이블 생성"""
+        with self._db_lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS resumes (
+                    page_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    years INTEGER NOT NULL,
+                    career_text TEXT NOT NULL,
+                    job_category TEXT NOT NULL,
+                    matching_score REAL NOT NULL,
+                    strengths TEXT NOT NULL,
+                    tech_skills TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    created_time TEXT NOT NULL,
+                    last_edited_time TEXT NOT NULL,
+                    notion_url TEXT NOT NULL,
+                    page_json TEXT NOT NULL,
+                    synced_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_created ON resumes(created_time)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_job ON resumes(job_category, years)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+
+    def _load_index(self):
+        """저장된 행으로 검색 인덱스 구성 (시작 시 1회)"""
+        started_at = time.time()
+        with self._db_lock:
+            rows = self._conn.execute(f"SELECT page_id, {', '.join(INDEX_FIELDS)} FROM resumes").fetchall()
+        for start in range(0, len(rows), NOTION_PAGE_SIZE):
+            self.index.add_many(
+                (row["page_id"], {name: row[name] for name in INDEX_FIELDS})
+                for row in rows[start:start + NOTION_PAGE_SIZE]
+            )
+        if rows:
+            logging.info(f"검색 인덱스 구성 완료 - {self.index.stats()}, {time.time() - started_at:.2f}초")
+
+    def _get_state(self, key):
+        with self._db_lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_state(self, key, value):
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, str(value))
+            )
+
+    # ---- 읽기 (대시보드 / 검색) ----
+
+    def dashboard(self, job_category=None, min_years=None, max_years=None, sort="latest", limit=10):
+        """대시보드 데이터 - 필터/정렬/통계는 SQL로 처리하고 화면에 보일 상위 limit명만 행으로 가져옴
+
+        반환: total(전체 인원), count(필터 결과 인원), avg_years, avg_matching(매칭률 있는 사람 평균, 없으면 None),
+        job_counts([(직무, 인원)]), items(상위 limit명), matching_scores(필터 결과의 매칭률 목록, 차트용)
+        """
+        conditions, params = [], []
+        if job_category:
+            conditions.append("job_category = ?")
+            params.append(job_category)
+        if min_years is not None:
+            conditions.append("years >= ?")
+            params.append(min_years)
+        if max_years is not None:
+            conditions.append("years <= ?")
+            params.append(max_years)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        scored_where = (where + " AND" if where else " WHERE") + " matching_score > 0"
+        order_by = DASHBOARD_SORTS.get(sort, DASHBOARD_SORTS["latest"])
+
+        with self._db_lock:
+            total = self._conn.execute("SELECT COUNT(*) AS cnt FROM resumes").fetchone()["cnt"]
+            stats = self._conn.execute(
+                f"SELECT COUNT(*) AS cnt, AVG(years) AS avg_years FROM resumes{where}", params
+            ).fetchone()
+            job_counts = self._conn.execute(
+                f"SELECT job_category, COUNT(*) AS cnt FROM resumes{where} "
+                f"GROUP BY job_category ORDER BY cnt DESC", params
+            ).fetchall()
+            rows = self._conn.execute(
+                "SELECT page_id, name, years, career_text, job_category, matching_score, strengths, "
+                f"tech_skills, created_time, notion_url FROM resumes{where} ORDER BY {order_by} LIMIT ?",
+                params + [limit]
+            ).fetchall()
+            matching_scores = [row["matching_score"] for row in self._conn.execute(
+                f"SELECT matching_score FROM resumes{scored_where}", params
+            )]
+
+        return {
+            "total": total,
+            "count": stats["cnt"],
+            "avg_years": stats["avg_years"] or 0.0,
+            "avg_matching": sum(matching_scores) / len(matching_scores) if matching_scores else None,
+            "job_counts": [(row["job_category"], row["cnt"]) for row in job_counts],
+            "items": [self._to_resume(row) for row in rows],
+            "matching_scores": matching_scores,
+        }
+
+    def search(self, query, limit=10):
+        """검색 인덱스에서 BM25 점수가 높은 순서로 최대 limit개의 Notion 페이지 (원본 JSON)"""
+        page_ids = [page_id for page_id, _ in self.index.search(query, limit)]
+        if not page_ids:
+            return []
+        placeholders = ", ".join("?" * len(page_ids))
+        with self._db_lock:
+            rows = self._conn.execute(
+                f"SELECT page_id, page_json FROM resumes WHERE page_id IN ({placeholders})", page_ids
+            ).fetchall()
+        pages = {row["page_id"]: row["page_json"] for row in rows}
+        return [json.loads(pages[page_id]) for page_id in page_ids if page_id in pages]
+
+    def count(self):
+        with self._db_lock:
+            return self._conn.execute("SELECT COUNT(*) AS cnt FROM resumes").fetchone()["cnt"]
+
+    def last_synced_at(self):
+        """마지막 동기화 완료 시각 (epoch 초, 한 번도 안 했으면 None)"""
+        value = self._get_state("last_synced_at")
+        return float(value) if value else None
+
+    @staticmethod
+    def _to_resume(row):
+        return {
+            'id': row['page_id'],
+            'name': row['name'],
+            'years': row['years'],
+            'career_text': row['career_text'],
+            'job_category': row['job_category'],
+            'matching_score': row['matching_score'],
+            'strengths': row['strengths'],
+            'tech_skills': row['tech_skills'],
+            'created_time': row['created_time'],
+            'notion_url': row['notion_url'],
+        }
+
+    # ---- 동기화 ----
+
+    def _upsert(self, pages, synced_at):
+        """Notion 페이지를 파싱해서 저장 - 파싱에 실패한 페이지는 건너뛰고 그 페이지 목록을 반환
+        (이미 저장된 행이 있으면 이전 내용을 유지하도록 synced_at만 갱신해 전체 동기화에서 지워지지 않게 함)"""
+        parsed_by_id = {row['id']: row for row in self.parse_pages(pages)}
+        rows, docs, skipped = [], [], []
+        for page in pages:
+            parsed = parsed_by_id.get(page["id"])
+            if parsed is None:
+                skipped.append(page)
+                continue
+            summary = property_text(page, "역량카드 요약")
+            rows.append((
+                page["id"], parsed['name'], parsed['years'], parsed['career_text'], parsed['job_category'],
+                parsed['matching_score'] or 0, parsed['strengths'], parsed['tech_skills'],
+                summary, parsed['created_time'], page.get("last_edited_time", ""),
+                parsed['notion_url'], json.dumps(page, ensure_ascii=False), synced_at
+            ))
+            docs.append((page["id"], {"name": parsed['name'], "strengths": parsed['strengths'],
+                                      "summary": summary, "tech_skills": parsed['tech_skills']}))
+        with self._db_lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO resumes (page_id, name, years, career_text, job_category, "
+                "matching_score, strengths, tech_skills, summary, created_time, last_edited_time, "
+                "notion_url, page_json, synced_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            if skipped:
+                self._conn.executemany(
+                    "UPDATE resumes SET synced_at = ? WHERE page_id = ?",
+                    [(synced_at, page["id"]) for page in skipped]
+                )
+        # 새로 저장된 분석 결과를 바로 검색할 수 있도록 인덱스에도 반영 (내용이 같은 페이지는 건너뜀)
+        self.index.add_many(docs)
+        return skipped
+
+    def _store_batch(self, batch, synced_at, latest_edit, first_skipped_edit):
+        """한 묶음을 저장하고 (저장된 페이지 기준 최신 편집 시각, 실패한 페이지의 가장 이른 편집 시각, 저장 수) 반환"""
+        skipped = self._upsert(batch, synced_at)
+        skipped_ids = {page["id"] for page in skipped}
+        for page in batch:
+            edited = page.get("last_edited_time")
+            if not edited:
+                continue
+            if page["id"] in skipped_ids:
+                if first_skipped_edit is None or edited < first_skipped_edit:
+                    first_skipped_edit = edited
+            elif latest_edit is None or edited > latest_edit:
+                latest_edit = edited
+        return latest_edit, first_skipped_edit, len(batch) - len(skipped)
+
+    def sync(self, full=False):
+        """Notion에서 변경분(full=True면 전체)을 가져와 미러 갱신 - 동기화 결과 요약 반환"""
+        with self._sync_lock:
+            started_at = time.time()
+            cursor = None if full else self._get_state("last_edited_time")
+            mode = "incremental" if cursor else "full"
+            filter_conditions = None
+            if cursor:
+                # last_edited_time은 분 단위라 같은 시각 페이지를 다시 받을 수 있음 (upsert라 무해)
+                filter_conditions = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": cursor}}
+
+            fetched = upserted = skipped = removed = 0
+            latest_edit = cursor
+            first_skipped_edit = None  # 파싱에 실패한 페이지 중 가장 이른 last_edited_time
+            batch = []
+            try:
+                pages = iter_database_pages(
+                    self.notion, self.database_id, filter_conditions=filter_conditions,
+                    sorts=[{"timestamp": "last_edited_time", "direction": "ascending"}]
+                )
+                # 스트림을 NOTION_PAGE_SIZE개씩 나눠 저장 (메모리에는 한 묶음만 유지)
+                for page in pages:
+                    fetched += 1
+                    batch.append(page)
+                    if len(batch) < NOTION_PAGE_SIZE:
+                        continue
+                    latest_edit, first_skipped_edit, stored = self._store_batch(
+                        batch, started_at, latest_edit, first_skipped_edit)
+                    upserted += stored
+                    skipped += len(batch) - stored
+                    batch = []
+                if batch:
+                    latest_edit, first_skipped_edit, stored = self._store_batch(
+                        batch, started_at, latest_edit, first_skipped_edit)
+                    upserted += stored
+                    skipped += len(batch) - stored
+            except Exception as e:
+                _sync_errors.inc(mode=mode)
+                logging.error(f"Notion 미러 동기화 실패 ({mode}): {str(e)}", exc_info=True)
+                raise
+            finally:
+                _sync_seconds.observe(time.time() - started_at, mode=mode)
+
+            if mode == "full":
+                # 전체 동기화에서 보이지 않은 페이지는 Notion에서 삭제/보관된 것
+                with self._db_lock, self._conn:
+                    removed_ids = [row["page_id"] for row in self._conn.execute(
+                        "SELECT page_id FROM resumes WHERE synced_at < ?", (started_at,)
+                    )]
+                    self._conn.execute("DELETE FROM resumes WHERE synced_at < ?", (started_at,))
+                removed = len(removed_ids)
+                self.index.remove_many(removed_ids)
+                self._set_state("last_full_sync_at", started_at)
+            if first_skipped_edit and (latest_edit is None or first_skipped_edit < latest_edit):
+                # 파싱에 실패한 페이지부터 다음 증분 동기화에서 다시 가져오도록 커서를 그 앞에서 멈춤
+                latest_edit = first_skipped_edit
+            if latest_edit:
+                self._set_state("last_edited_time", latest_edit)
+            self._set_state("last_synced_at", time.time())
+
+            total = self.count()
+            _mirror_rows.set(total)
+            result = {"mode": mode, "fetched": fetched, "upserted": upserted, "skipped": skipped, "removed": removed,
+                      "total": total, "seconds": round(time.time() - started_at, 2)}
+            logging.info(f"Notion 미러 동기화 완료 - {result}")
+            return result
+
+    def start(self):
+        """백그라운드 동기화 스레드 시작 (여러 번 호출해도 한 번만 시작)"""
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._sync_loop, name="notion-mirror-sync")
+            self._thread.daemon = True
+            self._thread.start()
+        logging.info(f"Notion 미러 동기화 시작 - interval: {self.sync_interval}s, db: {self.db_path}")
+
+    def _sync_loop(self):
+        while True:
+            last_full = self._get_state("last_full_sync_at")
+            full = last_full is None or time.time() - float(last_full) >= self.full_resync_interval
+            try:
+                self.sync(full=full)
+            except Exception:
+                pass  # sync()에서 기록함 - 다음 주기에 다시 시도
+            time.sleep(self.sync_interval)
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+PDF 분석 보고서 템플릿 엔진
+문단 스타일과 이모지 변환 테이블을 프로세스당 한 번만 만들어 두고,
+보고서마다 내용만 채워 ReportLab 문서를 생성합니다.
+
+벤치마크: python pdf_report.py [보고서 수]
+"""
+
+import sys
+import time
+import logging
+import threading
+from io import BytesIO
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image as RLImage
+
+import font_service
+
+# PDF 폰트에 없는 이모지 → 텍스트
+EMOJI_REPLACEMENTS = {
+    '📊': '[차트]',
+    '👤': '[인물]',
+    '💫': '[별]',
+    '⭐': '[별점]',
+    '📈': '[그래프]',
+    '🎯': '[다트]',
+    '📌': '[핀]',
+    '💻': '[컴퓨터]',
+    '👥': '[사람들]',
+    '✅': '[체크]',
+    '📚': '[책]',
+    '🔍': '[검색]',
+    '❌': '[X]',
+    '📋': '[클립보드]',
+    '🎉': '[축하]',
+    '💡': '[전구]',
+    '🚀': '[로켓]',
+    '🏆': '[트로피]',
+    '📝': '[메모]',
+    '⚡': '[번개]',
+    '🌟': '[별]',
+    '🎨': '[팔레트]',
+    '🔧': '[도구]',
+    '📖': '[열린책]',
+    '🎭': '[연극]',
+    '🎪': '[서커스]',
+    '🎸': '[기타]',
+}
+
+# 한 번의 str.translate로 모든 이모지를 변환하는 테이블
+_EMOJI_TABLE = str.maketrans(EMOJI_REPLACEMENTS)
+
+
+def replace_emojis(text):
+    """PDF용으로 이모지를 텍스트로 변환"""
+    return str(text).translate(_EMOJI_TABLE)
+
+
+def _replace_emojis_sequential(text):
+    """이모지마다 str.replace를 반복하는 이전 방식 (벤치마크 비교용)"""
+    result = str(text)
+    for emoji, replacement in EMOJI_REPLACEMENTS.items():
+        result = result.replace(emoji, replacement)
+    return result
+
+
+class ReportTemplate:
+    """스타일/고정 문구가 미리 준비된 보고서 템플릿 (생성 후 읽기 전용이라 여러 스레드에서 공유 가능)"""
+
+    def __init__(self, emoji_replacer=replace_emojis):
+        self.replace_emojis = emoji_replacer
+        font_name, bold_font_name = font_service.register_reportlab_fonts()
+
+        styles = getSampleStyleSheet()
+        self.title_style = ParagraphStyle(
+            'TitleStyle',
+            parent=styles['Title'],
+            fontName=bold_font_name,
+            fontSize=24,
+            spaceAfter=30,
+            textColor=colors.darkblue,
+            alignment=1  # center
+        )
+        self.heading_style = ParagraphStyle(
+            'HeadingStyle',
+            parent=styles['Heading2'],
+            fontName=bold_font_name,
+            fontSize=14,
+            spaceAfter=12,
+            textColor=colors.darkblue,
+            spaceBefore=20
+        )
+        self.normal_style = ParagraphStyle(
+            'NormalStyle',
+            parent=styles['Normal'],
+            fontName=font_name,
+            fontSize=11,
+            spaceAfter=8,
+            leftIndent=20
+        )
+        self.info_style = ParagraphStyle(
+            'InfoStyle',
+            parent=styles['Normal'],
+            fontName=font_name,
+            fontSize=10,
+            spaceAfter=8
+        )
+
+        # 고정 제목/소제목은 미리 변환
+        self.headings = {key: self.replace_emojis(text) for key, text in {
+            "title": "📊 이력서 분석 보고서",
+            "profile": "👤 분석 대상자 정보",
+            "catchphrase": "💫 캐치프레이즈",
+            "strengths": "⭐ 강점 Top 3",
+            "chart": "📈 기술 스킬 레이더 차트",
+            "skill_cards": "🎯 역량 분석",
+            "domain_knowledge": "📌 Domain Knowledge",
+            "tech_skills": "💻 Tech Skills",
+            "soft_skills": "👥 Soft Skills",
+        }.items()}
+
+    def _heading(self, key):
+        return Paragraph(self.headings[key], self.heading_style)
+
+    def _text(self, text):
+        return Paragraph(self.replace_emojis(text), self.normal_style)
+
+    def render(self, result, chart_image=None):
+        """분석 결과로 PDF 바이트 생성"""
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*inch, bottomMargin=1*inch)
+        story = []
+
+        # 제목 / 기본 정보
+        story.append(Paragraph(self.headings["title"], self.title_style))
+        story.append(Spacer(1, 20))
+        current_time = datetime.now().strftime('%Y년 %m월 %d일 %H:%M')
+        story.append(Paragraph(f"생성일시: {current_time}", self.info_style))
+        story.append(Spacer(1, 20))
+
+        # 분석 대상자 정보
+        story.append(self._heading("profile"))
+        story.append(self._text(f"• 이름: {result.get('name', '미기재')}"))
+        story.append(self._text(f"• 총 경력: {result.get('total_years', 'N/A')}년"))
+        story.append(Spacer(1, 15))
+
+        # 캐치프레이즈
+        story.append(self._heading("catchphrase"))
+        story.append(self._text(f"'{result.get('catchphrase', 'N/A')}'"))
+        story.append(Spacer(1, 15))
+
+        # 강점 Top 3
+        story.append(self._heading("strengths"))
+        for i, strength in enumerate(result.get('top_strengths', []), 1):
+            story.append(self._text(f"{i}. {strength}"))
+        story.append(Spacer(1, 15))
+
+        # 기술 스킬 차트 (있는 경우) - 메모리에서 바로 삽입
+        if chart_image:
+            story.append(self._heading("chart"))
+            try:
+                story.append(RLImage(BytesIO(chart_image), width=5*inch, height=5*inch))
+            except Exception as e:
+                logging.error(f"Chart image processing error: {str(e)}")
+                story.append(Paragraph("차트 이미지를 포함할 수 없습니다.", self.normal_style))
+            story.append(Spacer(1, 15))
+
+        # 역량 카드
+        story.append(self._heading("skill_cards"))
+        skill_cards = result.get('skill_cards', {})
+        for key in ("domain_knowledge", "tech_skills", "soft_skills"):
+            story.append(self._heading(key))
+            story.append(self._text(skill_cards.get(key, 'N/A')))
+            if key != "soft_skills":
+                story.append(Spacer(1, 10))
+
+        doc.build(story)
+        return buffer.getvalue()
+
+
+_template = None
+_template_lock = threading.Lock()
+
+
+def get_report_template():
+    """공용 보고서 템플릿 (처음 필요할 때 한 번 생성)"""
+    global _template
+    with _template_lock:
+        if _template is None:
+            _template = ReportTemplate()
+        return _template
+
+
+def render_report(result, chart_image=None):
+    """공용 템플릿으로 PDF 보고서 생성"""
+    return get_report_template().render(result, chart_image)
+
+
+def _render_per_call(result, chart_image=None):
+    """템플릿 도입 전 방식 (벤치마크 비교용) - 보고서마다 한글 폰트 TTF를 다시 읽어 등록하고
+    스타일시트/문단 스타일을 새로 만들며 이모지를 str.replace로 하나씩 변환"""
+    font = font_service.get_korean_font()
+    if font["path"]:
+        pdfmetrics.registerFont(TTFont(font_service.PDF_FONT_NAME, font["path"]))
+        if font["bold_path"] != font["path"]:
+            pdfmetrics.registerFont(TTFont(font_service.PDF_BOLD_FONT_NAME, font["bold_path"]))
+    return ReportTemplate(emoji_replacer=_replace_emojis_sequential).render(result, chart_image)
+
+
+def benchmark(reports=50, rounds=5):
+    """이전 방식(보고서마다 폰트 등록/스타일 생성)과 템플릿 재사용 방식의 초당 보고서 수 비교
+    (두 방식을 rounds번 번갈아 측정해 중앙값 사용 - 한글 폰트가 없으면 폰트 등록 비용은 빠짐)"""
+    sample = {
+        "name": "홍길동",
+        "total_years": 5,
+        "catchphrase": "🚀 데이터로 문제를 푸는 백엔드 개발자",
+        "top_strengths": ["⚡ 대용량 트래픽 처리", "📊 데이터 파이프라인 설계", "👥 팀 리딩"],
+        "skill_cards": {
+            "domain_knowledge": "💡 커머스/결제 도메인 5년 " * 10,
+            "tech_skills": "💻 Python, Django, Kafka, AWS " * 10,
+            "soft_skills": "👥 협업, 코드 리뷰 문화 정착 " * 10,
+        },
+    }
+
+    template = ReportTemplate()
+    before_samples, after_samples = [], []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        for _ in range(reports):
+            _render_per_call(sample)
+        before_samples.append(time.perf_counter() - started_at)
+
+        started_at = time.perf_counter()
+        for _ in range(reports):
+            template.render(sample)
+        after_samples.append(time.perf_counter() - started_at)
+    before = sorted(before_samples)[rounds // 2]
+    after = sorted(after_samples)[rounds // 2]
+
+    return {
+        "reports": reports,
+        "korean_font": font_service.get_korean_font()["path"],
+        "before_reports_per_second": round(reports / before, 2),
+        "after_reports_per_second": round(reports / after, 2),
+        "speedup": round(before / after, 2),
+    }
+
+
+if __name__ == "__main__":
+    report_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(benchmark(report_count))
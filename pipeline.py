@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+의존성 그래프 기반 파이프라인 실행기
+서로 독립적인 단계는 executor에서 동시에 실행하고,
+의존 단계는 자신이 필요로 하는 단계가 끝나기만 기다립니다.
+"""
+
+import time
+import logging
+from concurrent.futures import wait, FIRST_COMPLETED
+
+
+class StageFailed(Exception):
+    """단계 실패 - message는 사용자에게 그대로 전달할 수 있는 문구"""
+
+
+class StageSkipped(Exception):
+    """선행 단계가 실패하여 실행하지 않은 단계"""
+
+
+class Stage:
+    """파이프라인 단계 - func는 depends_on 단계들의 결과를 같은 이름의 키워드 인자로 받음"""
+
+    def __init__(self, name, func, depends_on=()):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+
+
+def run_pipeline(stages, executor, name="pipeline"):
+    """단계들을 의존성 순서대로 실행하고 (결과 dict, 오류 dict) 반환"""
+    stage_names = {stage.name for stage in stages}
+    for stage in stages:
+        unknown = [dep for dep in stage.depends_on if dep not in stage_names]
+        if unknown:
+            raise ValueError(f"{stage.name} 단계의 알 수 없는 의존 단계: {unknown}")
+
+    results = {}
+    errors = {}
+    pending = {stage.name: stage for stage in stages}
+    running = {}
+    started_at = time.time()
+
+    while pending or running:
+        # 실행 가능한 단계 제출 (선행 단계가 실패했으면 건너뜀)
+        for stage_name, stage in list(pending.items()):
+            failed_deps = [dep for dep in stage.depends_on if dep in errors]
+            if failed_deps:
+                errors[stage_name] = StageSkipped(f"선행 단계 실패: {', '.join(failed_deps)}")
+                del pending[stage_name]
+            elif all(dep in results for dep in stage.depends_on):
+                kwargs = {dep: results[dep] for dep in stage.depends_on}
+                running[executor.submit(stage.func, **kwargs)] = stage_name
+                del pending[stage_name]
+
+        if not running:
+            if pending:
+                # 순환 의존성 - 더 이상 진행할 수 없음
+                for stage_name in pending:
+                    errors[stage_name] = StageSkipped("순환 의존성")
+                pending.clear()
+            break
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            stage_name = running.pop(future)
+            try:
+                results[stage_name] = future.result()
+            except Exception as e:
+                errors[stage_name] = e
+                if not isinstance(e, StageFailed):
+                    logging.error(f"[{name}] {stage_name} 단계 오류: {str(e)}", exc_info=e)
+
+    logging.info(f"[{name}] 파이프라인 완료 - 성공: {len(results)}개, 실패/건너뜀: {len(errors)}개, "
+                 f"소요: {time.time() - started_at:.2f}s")
+    return results, errors
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Plotly 이미지 내보내기 전담 스레드
+Kaleido(Chromium) 엔진은 시작 비용이 수 초이므로 서버 시작 시 한 번 띄워 워밍업해 두고,
+모든 to_image/write_image 요청을 큐로 받아 같은 엔진에서 순서대로 처리합니다.
+엔진이나 전담 스레드가 죽으면 자동으로 다시 시작하고, 내보내기 지연 시간을 메트릭으로 기록합니다.
+한 요청이 제한 시간을 넘겨 멈추면 감시 스레드가 그 요청을 실패 처리하고 엔진과 전담 스레드를 새로 띄웁니다.
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future, InvalidStateError
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+import metrics
+
+PLOTLY_EXPORT_TIMEOUT = float(os.getenv("PLOTLY_EXPORT_TIMEOUT", "60"))  # 요청당 최대 대기 시간 (초)
+
+_export_seconds = metrics.histogram("plotly_export_seconds", "Plotly 이미지 내보내기 소요 시간 (초)")
+_export_queue_depth = metrics.gauge("plotly_export_queue_depth", "대기 중인 Plotly 내보내기 요청 수")
+_exporter_restarts = metrics.counter("plotly_exporter_restarts_total", "Plotly 내보내기 엔진/스레드 재시작 횟수")
+
+
+def _start_engine():
+    """Kaleido 엔진 시작 (kaleido 1.x는 상주 서버, 0.2.x는 첫 내보내기 때 상주 프로세스 생성)"""
+    try:
+        import kaleido
+        if hasattr(kaleido, "start_sync_server"):
+            kaleido.start_sync_server(silence_warnings=True)
+    except Exception as e:
+        logging.warning(f"Kaleido 상주 서버 시작 실패 (요청마다 시작됨): {str(e)}")
+
+
+def _stop_engine():
+    """죽었거나 응답하지 않는 Kaleido 엔진 정리"""
+    try:
+        scope = getattr(getattr(pio, "kaleido", None), "scope", None)
+        if scope is not None and hasattr(scope, "_shutdown_kaleido"):
+            scope._shutdown_kaleido()
+        import kaleido
+        if hasattr(kaleido, "stop_sync_server"):
+            kaleido.stop_sync_server(silence_warnings=True)
+    except Exception as e:
+        logging.warning(f"Kaleido 엔진 정리 중 오류: {str(e)}")
+
+
+class PlotlyExporter:
+    """하나의 전담 스레드가 Kaleido 엔진을 소유하고 큐로 내보내기 요청을 처리"""
+
+    def __init__(self, timeout=PLOTLY_EXPORT_TIMEOUT):
+        self.timeout = timeout
+        self._requests = queue.Queue()
+        self._thread = None
+        self._watchdog = None
+        self._current = None  # 전담 스레드가 처리 중인 요청: (future, 시작 시각)
+        self._lock = threading.Lock()
+
+    def start(self):
+        """전담 스레드 시작 + 워밍업 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._thread is not None:
+                logging.error("Plotly 내보내기 스레드가 종료되어 다시 시작합니다")
+                _exporter_restarts.inc(reason="thread")
+            self._thread = threading.Thread(target=self._run, name="plotly-exporter")
+            self._thread.daemon = True
+            self._thread.start()
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(target=self._watch, name="plotly-exporter-watchdog")
+                self._watchdog.daemon = True
+                self._watchdog.start()
+
+    def warm_up(self):
+        """엔진을 미리 띄워 첫 요청이 시작 비용을 내지 않도록 함 (결과는 기다리지 않음)"""
+        self.start()
+        warm_up_figure = go.Figure(go.Bar(x=["warm-up"], y=[1]))
+        self._submit(warm_up_figure, {"format": "png", "width": 100, "height": 100}, label="warm_up")
+
+    def export(self, fig, format="png", width=None, height=None, scale=None, timeout=None):
+        """Figure를 이미지 바이트로 변환 (전담 스레드에서 처리될 때까지 대기)"""
+        self.start()
+        options = {"format": format}
+        if width is not None:
+            options["width"] = width
+        if height is not None:
+            options["height"] = height
+        if scale is not None:
+            options["scale"] = scale
+        future = self._submit(fig, options, label=format)
+        try:
+            return future.result(timeout=timeout or self.timeout)
+        except FutureTimeoutError:
+            future.cancel()  # 아직 큐에 있으면 처리하지 않음 (실행 중인 요청은 감시 스레드가 정리)
+            raise
+
+    def _submit(self, fig, options, label):
+        future = Future()
+        self._requests.put((fig, options, label, future, time.monotonic()))
+        _export_queue_depth.set(self._requests.qsize())
+        return future
+
+    def _run(self):
+        _start_engine()
+        # 감시 스레드가 새 전담 스레드로 교체했으면 (멈췄던 요청이 뒤늦게 끝난 경우) 종료
+        while self._thread is threading.current_thread():
+            fig, options, label, future, queued_at = self._requests.get()
+            _export_queue_depth.set(self._requests.qsize())
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            started_at = time.monotonic()
+            with self._lock:
+                self._current = (future, started_at)
+            try:
+                image_bytes = self._export_with_restart(fig, options)
+            except Exception as e:
+                _export_seconds.observe(time.monotonic() - started_at, format=label, status="error")
+                logging.error(f"Plotly 이미지 내보내기 실패: {str(e)}", exc_info=True)
+                _resolve(future, error=e)
+                continue
+            finally:
+                with self._lock:
+                    if self._current is not None and self._current[0] is future:
+                        self._current = None
+
+            export_seconds = time.monotonic() - started_at
+            _export_seconds.observe(export_seconds, format=label, status="ok")
+            logging.debug(f"Plotly 내보내기 완료 - {label}, 대기: {started_at - queued_at:.3f}s, "
+                          f"변환: {export_seconds:.3f}s, {len(image_bytes)} bytes")
+            _resolve(future, result=image_bytes)
+
+    def _watch(self):
+        """처리 중인 요청이 timeout을 넘기면 실패 처리하고 엔진과 전담 스레드를 새로 시작
+        (멈춘 Kaleido 호출은 예외를 내지 않으므로 _export_with_restart만으로는 복구되지 않음)"""
+        while True:
+            time.sleep(min(self.timeout / 4, 5))
+            with self._lock:
+                if self._current is None or time.monotonic() - self._current[1] < self.timeout:
+                    continue
+                future, _ = self._current
+                self._current = None
+                self._thread = None  # 멈춘 스레드는 버림 (호출이 끝나면 스스로 종료)
+            logging.error(f"Plotly 내보내기가 {self.timeout:.0f}초를 넘겨 엔진과 전담 스레드를 다시 시작합니다")
+            _exporter_restarts.inc(reason="watchdog")
+            _resolve(future, error=FutureTimeoutError(f"Plotly 내보내기 시간 초과 ({self.timeout:.0f}초)"))
+            _stop_engine()
+            self.start()
+
+    def _export_with_restart(self, fig, options):
+        """내보내기 실패 시 엔진을 재시작하고 한 번 더 시도"""
+        try:
+            return pio.to_image(fig, **options)
+        except Exception as e:
+            logging.warning(f"Plotly 내보내기 엔진 재시작: {str(e)}")
+            _exporter_restarts.inc(reason="engine")
+            _stop_engine()
+            _start_engine()
+            return pio.to_image(fig, **options)
+
+
+def _resolve(future, result=None, error=None):
+    """결과/예외 설정 (감시 스레드가 이미 시간 초과로 처리한 요청이면 무시)"""
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+exporter = PlotlyExporter()
+
+
+def export_image(fig, format="png", width=None, height=None, scale=None, timeout=None):
+    """공용 내보내기 함수 - fig.to_image()/fig.write_image() 대신 사용"""
+    return exporter.export(fig, format=format, width=width, height=height, scale=scale, timeout=timeout)
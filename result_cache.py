@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+GPT 분석 결과 캐시
+입력 내용의 해시(+ 프롬프트/모델 버전)를 키로 결과 JSON을 SQLite에 저장합니다.
+같은 이력서를 다시 분석하면 OpenAI 호출 없이 저장된 결과를 돌려줍니다.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+import re
+
+
+def normalize_text(text):
+    """캐시 키 계산용 텍스트 정규화 (유니코드 NFC + 공백 정리)"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFC", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def make_cache_key(*parts):
+    """여러 값을 묶어 SHA-256 캐시 키 생성"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, str):
+            part = json.dumps(part, ensure_ascii=False, sort_keys=True)
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """네임스페이스별 LRU 결과 캐시 (SQLite 영속화, 스레드 안전) - ttl(초)을 주면 저장 후 ttl이 지난 항목은 만료"""
+
+    def __init__(self, db_path="result_cache.db", namespace="default", max_entries=1000, ttl=None):
+        self.db_path = db_path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    cache_key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (namespace, cache_key)
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_lru ON cache_entries(namespace, last_access)"
+            )
+
+    def get(self, key):
+        """캐시 조회 (없으면 None) - 조회 시 최근 사용 시각 갱신"""
+        try:
+            with self._lock, self._conn:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND cache_key = ?",
+                    (self.namespace, key)
+                ).fetchone()
+                if row is None:
+                    return None
+                if self.ttl is not None and row[1] < time.time() - self.ttl:
+                    self._conn.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND cache_key = ?",
+                        (self.namespace, key)
+                    )
+                    return None
+                self._conn.execute(
+                    "UPDATE cache_entries SET last_access = ? WHERE namespace = ? AND cache_key = ?",
+                    (time.time(), self.namespace, key)
+                )
+            return json.loads(row[0])
+        except Exception as e:
+            logging.error(f"캐시 조회 오류 ({self.namespace}): {str(e)}")
+            return None
+
+    def set(self, key, value):
+        """캐시 저장 후 최대 개수를 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries (namespace, cache_key, value, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.namespace, key, json.dumps(value, ensure_ascii=False), now, now)
+                )
+                self._evict()
+        except Exception as e:
+            logging.error(f"캐시 저장 오류 ({self.namespace}): {str(e)}")
+
+    def _evict(self):
+        if self.ttl is not None:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?",
+                (self.namespace, time.time() - self.ttl)
+            )
+        count = self._conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE rowid IN ("
+                "SELECT rowid FROM cache_entries WHERE namespace = ? ORDER BY last_access LIMIT ?)",
+                (self.namespace, overflow)
+            )
+            logging.debug(f"캐시 LRU 정리 ({self.namespace}): {overflow}개 삭제")
+
+    def invalidate(self, key=None):
+        """특정 키 또는 네임스페이스 전체 삭제 - 삭제된 항목 수 반환"""
+        with self._lock, self._conn:
+            if key is None:
+                cursor = self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,)
+                )
+            else:
+                cursor = self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND cache_key = ?",
+                    (self.namespace, key)
+                )
+        logging.info(f"캐시 무효화 ({self.namespace}): {cursor.rowcount}개 삭제")
+        return cursor.rowcount
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+이력서 텍스트 추출기
+파일 앞부분의 매직 바이트와 Slack 파일 메타데이터(filetype, mimetype, 파일명)로
+형식을 판별한 뒤 PDF(PyMuPDF), DOCX(python-docx), 텍스트(UTF-8/CP949) 추출기로
+메모리 안에서 바로 처리합니다.
+페이지가 많은 PDF는 페이지 구간으로 나눠 프로세스 풀에서 병렬 추출하고,
+페이지/글자 수 상한에 도달하면 추출을 멈춥니다.
+프로세스 풀은 spawn으로 시작하며(스레드가 많은 서버 프로세스를 fork하면 잠금이 걸린 채 복제될 수 있음),
+각 작업에는 원본 전체가 아니라 맡은 페이지만 담은 PDF 바이트를 보냅니다.
+spawn 워커는 실행 중인 메인 스크립트를 __mp_main__으로 다시 import하므로, 메인 스크립트는
+무거운 초기화를 __name__ != "__mp_main__" 조건 뒤에 두어야 합니다(서버의 init_services 참고).
+"""
+
+import io
+import os
+import re
+import logging
+import unicodedata
+import zipfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import fitz  # PyMuPDF
+from docx import Document
+
+FORMAT_PDF = "pdf"
+FORMAT_DOCX = "docx"
+FORMAT_TEXT = "text"
+
+SUPPORTED_FORMATS = (FORMAT_PDF, FORMAT_DOCX, FORMAT_TEXT)
+
+# Slack filetype / mimetype / 확장자 → 형식
+_FILETYPE_FORMATS = {
+    "pdf": FORMAT_PDF,
+    "docx": FORMAT_DOCX,
+    "text": FORMAT_TEXT,
+    "txt": FORMAT_TEXT,
+    "markdown": FORMAT_TEXT,
+}
+_MIMETYPE_FORMATS = {
+    "application/pdf": FORMAT_PDF,
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": FORMAT_DOCX,
+    "text/plain": FORMAT_TEXT,
+    "text/markdown": FORMAT_TEXT,
+}
+_EXTENSION_FORMATS = {
+    ".pdf": FORMAT_PDF,
+    ".docx": FORMAT_DOCX,
+    ".txt": FORMAT_TEXT,
+    ".md": FORMAT_TEXT,
+}
+
+_TEXT_ENCODINGS = ("utf-8-sig", "cp949")
+
+EXTRACT_MAX_PAGES = int(os.getenv("EXTRACT_MAX_PAGES", "30"))  # 추출할 최대 페이지 수
+EXTRACT_MAX_CHARS = int(os.getenv("EXTRACT_MAX_CHARS", "30000"))  # 추출할 최대 글자 수 (분석에 충분한 분량)
+EXTRACT_PARALLEL_MIN_PAGES = int(os.getenv("EXTRACT_PARALLEL_MIN_PAGES", "12"))  # 병렬 추출을 시작하는 페이지 수
+EXTRACT_PAGES_PER_TASK = int(os.getenv("EXTRACT_PAGES_PER_TASK", "6"))  # 프로세스 작업 하나가 맡는 페이지 수
+EXTRACT_PROCESSES = int(os.getenv("EXTRACT_PROCESSES", str(min(4, os.cpu_count() or 1))))  # 추출 프로세스 수
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+class UnsupportedFormatError(Exception):
+    """지원하지 않는 파일 형식 - message는 사용자에게 그대로 전달할 수 있는 문구"""
+
+
+def format_from_metadata(filetype=None, mimetype=None, filename=None):
+    """Slack 파일 메타데이터만으로 형식 추정 (모르면 None)"""
+    if filetype and filetype.lower() in _FILETYPE_FORMATS:
+        return _FILETYPE_FORMATS[filetype.lower()]
+    if mimetype and mimetype.split(";")[0].strip().lower() in _MIMETYPE_FORMATS:
+        return _MIMETYPE_FORMATS[mimetype.split(";")[0].strip().lower()]
+    if filename:
+        extension = os.path.splitext(filename)[1].lower()
+        if extension in _EXTENSION_FORMATS:
+            return _EXTENSION_FORMATS[extension]
+    return None
+
+
+def is_supported_file(file_info):
+    """Slack files.info의 file 객체가 분석 가능한 형식인지 (다운로드 전 확인용)"""
+    return format_from_metadata(
+        file_info.get("filetype"), file_info.get("mimetype"), file_info.get("name")
+    ) is not None
+
+
+def _decode_text(data):
+    """UTF-8 → CP949 순서로 디코딩 (바이너리로 보이면 None)"""
+    if b"\x00" in data[:4096]:
+        return None
+    for encoding in _TEXT_ENCODINGS:
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+def detect_format(data, filetype=None, mimetype=None, filename=None):
+    """매직 바이트 우선, 애매한 경우 메타데이터로 형식 판별"""
+    hinted_format = format_from_metadata(filetype, mimetype, filename)
+
+    if data[:5] == b"%PDF-":
+        return FORMAT_PDF
+    if data[:4] == b"PK\x03\x04":
+        # DOCX는 zip 컨테이너 - 실제 Word 문서인지 내부 항목으로 확인
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return FORMAT_DOCX
+        except zipfile.BadZipFile:
+            pass
+        raise UnsupportedFormatError("지원하지 않는 압축 파일 형식입니다. PDF, DOCX, TXT 파일을 올려주세요.")
+    if hinted_format == FORMAT_TEXT and not data.lstrip()[:15].lower().startswith((b"<!doctype html", b"<html")):
+        # 로그인 페이지(HTML)가 내려온 경우는 텍스트로 보지 않음
+        if _decode_text(data) is not None:
+            return FORMAT_TEXT
+
+    raise UnsupportedFormatError("지원하지 않는 파일 형식입니다. PDF, DOCX, TXT 파일을 올려주세요.")
+
+
+def _get_process_pool():
+    """PDF 추출용 프로세스 풀 (처음 필요할 때 생성)"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=EXTRACT_PROCESSES,
+                                                mp_context=multiprocessing.get_context("spawn"))
+        return _process_pool
+
+
+def _reset_process_pool():
+    """워커 프로세스가 죽은 풀은 버리고 다음 호출 때 새로 생성"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False)
+            _process_pool = None
+
+
+def _extract_pdf_pages(data, start, end, max_chars):
+    """start~end-1 페이지 텍스트 추출 (max_chars를 넘으면 중단) - 프로세스 풀에서도 실행"""
+    page_texts = []
+    total_chars = 0
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        for page_number in range(start, end):
+            page_text = doc[page_number].get_text()
+            page_texts.append(page_text)
+            total_chars += len(page_text)
+            if total_chars >= max_chars:
+                break
+    return page_texts
+
+
+def _page_range_bytes(doc, start, end):
+    """start~end-1 페이지만 담은 PDF 바이트 (작업마다 원본 전체를 보내지 않도록)"""
+    with fitz.open() as part:
+        part.insert_pdf(doc, from_page=start, to_page=end - 1)
+        return part.tobytes(garbage=1)
+
+
+def _extract_pdf_parallel(data, page_limit, max_chars):
+    """페이지 구간별로 나눠 병렬 추출 - 앞 구간부터 모아 글자 수 상한에 도달하면 나머지 취소"""
+    pool = _get_process_pool()
+    futures = []
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        for start in range(0, page_limit, EXTRACT_PAGES_PER_TASK):
+            end = min(start + EXTRACT_PAGES_PER_TASK, page_limit)
+            futures.append(pool.submit(_extract_pdf_pages, _page_range_bytes(doc, start, end),
+                                       0, end - start, max_chars))
+    page_texts = []
+    total_chars = 0
+    try:
+        for future in futures:
+            for page_text in future.result():
+                page_texts.append(page_text)
+                total_chars += len(page_text)
+                if total_chars >= max_chars:
+                    return page_texts
+        return page_texts
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _extract_pdf(data):
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        page_count = doc.page_count
+    page_limit = min(page_count, EXTRACT_MAX_PAGES)
+    if page_count > page_limit:
+        logging.info(f"PDF 페이지 상한 적용 - 전체: {page_count}페이지, 추출: {page_limit}페이지")
+
+    page_texts = None
+    if page_limit >= EXTRACT_PARALLEL_MIN_PAGES and EXTRACT_PROCESSES > 1:
+        try:
+            page_texts = _extract_pdf_parallel(data, page_limit, EXTRACT_MAX_CHARS)
+        except BrokenProcessPool as e:
+            logging.error(f"PDF 병렬 추출 실패, 순차 추출로 전환: {str(e)}")
+            _reset_process_pool()
+    if page_texts is None:
+        page_texts = _extract_pdf_pages(data, 0, page_limit, EXTRACT_MAX_CHARS)
+
+    return "".join(page_texts)[:EXTRACT_MAX_CHARS], page_count
+
+
+def _extract_docx(data):
+    document = Document(io.BytesIO(data))
+    lines = [paragraph.text for paragraph in document.paragraphs]
+    # 표 안의 내용(경력/학력 표 등)도 함께 추출
+    for table in document.tables:
+        for row in table.rows:
+            lines.append(" | ".join(cell.text for cell in row.cells))
+    return "\n".join(lines)[:EXTRACT_MAX_CHARS], 1
+
+
+def _extract_plain_text(data):
+    text = _decode_text(data)
+    if text is None:
+        raise UnsupportedFormatError("텍스트 파일 인코딩을 인식할 수 없습니다. UTF-8로 저장해주세요.")
+    return text[:EXTRACT_MAX_CHARS], 1
+
+
+_EXTRACTORS = {
+    FORMAT_PDF: _extract_pdf,
+    FORMAT_DOCX: _extract_docx,
+    FORMAT_TEXT: _extract_plain_text,
+}
+
+
+def tidy_text(text):
+    """추출 텍스트 정리 - 유니코드 NFC, 줄 안의 연속 공백은 하나로, 빈 줄은 최대 한 줄 (줄/섹션 구분은 유지)"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFC", text)
+    lines = [re.sub(r"[^\S\n]+", " ", line).strip() for line in text.splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def extract_text(data, filetype=None, mimetype=None, filename=None):
+    """파일 바이트에서 텍스트 추출 - {"format", "text", "page_count"} 반환"""
+    file_format = detect_format(data, filetype, mimetype, filename)
+    text, page_count = _EXTRACTORS[file_format](data)
+    return {"format": file_format, "text": text, "page_count": page_count}
@@ -0,0 +1,453 @@
+# -*- coding: utf-8 -*-
+"""
+이력서 키워드 검색 인덱스
+Notion 미러의 성명/강점 Top3/역량카드 요약/기술스택으로 프로세스 내 역색인을 만들고 BM25로 순위를 매깁니다.
+- 한글은 글자 바이그램(파이썬개발자 -> 파이/이썬/썬개/개발/발자)으로 쪼개 복합어 일부로도 찾을 수 있고,
+  문서에는 글자 하나씩도 색인해 한 글자 검색어(성씨 '김' 등)도 찾을 수 있으며
+- 영문/숫자 기술 용어는 단어 단위(react, c++, node.js)로 색인하고 점으로 이어진 용어는 각 부분도 색인합니다
+  (react.js -> react.js/react/js).
+문서가 추가/수정/삭제될 때마다 해당 문서만 반영하며(삭제는 표시만 하고 모이면 재구성),
+단어마다 점수 기여가 큰 문서 목록(champion list)을 따로 유지해 흔한 단어도 전체 목록을 훑지 않고 상위 k개를 구합니다.
+단어별 문서 비트맵(파이썬 int)의 AND/OR로 검색어 토큰을 충분히 가진 문서를 먼저 구해 적으면 모두 채점하고,
+많으면 champion list 합집합만 채점한 뒤 상한 검사로 결과가 전체 탐색과 같음을 확인합니다
+(확인되지 않으면 더 긴 champion list로 다시 확인하고, 그래도 확인되지 않으면 해당 문서를 모두 채점).
+champion list는 색인/재구성할 때 긴 길이(DEEP_CHAMPION_LIST_SIZE)로 유지하므로 검색 중에는 정렬하지 않습니다.
+
+벤치마크: python search_index.py [문서 수] [검색어 종류별 검색 수]
+"""
+
+import re
+import sys
+import math
+import time
+import heapq
+import random
+import bisect
+import logging
+import threading
+from array import array
+
+import metrics
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# 필드별 가중치 (단어 빈도에 곱함)
+FIELD_WEIGHTS = {"name": 3, "tech_skills": 2, "strengths": 2, "summary": 1}
+MIN_SHOULD_MATCH = 0.75  # 검색어 토큰 중 이 비율 이상이 들어 있는 문서만 결과로 반환
+CHAMPION_LIST_SIZE = 100  # 단어별로 점수 기여가 큰 순서로 따로 보관할 문서 수
+DEEP_CHAMPION_LIST_SIZE = 800  # champion list 보관 길이 - 상위 CHAMPION_LIST_SIZE개로 확인이 안 되면 이 길이로 다시 확인
+DIRECT_SCORE_MAX_DOCS = 1000  # 검색어 토큰을 충분히 가진 문서가 이 수 이하면 champion list 없이 모두 채점
+COMPACT_MIN_DEAD = 500  # 삭제/교체된 문서가 이 수 이상이고
+COMPACT_DEAD_RATIO = 0.2  # 살아 있는 문서의 이 비율을 넘으면 인덱스 재구성
+AVGDL_DRIFT_RATIO = 0.1  # 평균 문서 길이가 점수 계산 기준값과 이만큼 달라지면 재구성
+MAX_TERM_FREQUENCY = 65535
+
+_TOKEN_RE = re.compile(r"[가-힣]+|[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+# 바이트 값 -> 켜진 비트 위치 (비트맵에서 문서 번호를 꺼낼 때 사용)
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+_search_seconds = metrics.histogram("resume_search_seconds", "이력서 키워드 검색 소요 시간 (초)")
+_index_docs = metrics.gauge("resume_search_index_docs", "검색 인덱스에 색인된 이력서 수")
+
+
+def tokenize(text, unigrams=False):
+    """검색 토큰 목록 - 한글은 글자 바이그램(한 글자 단어는 그대로, unigrams=True면 모든 글자도 추가),
+    영문/숫자는 소문자 단어와 점으로 나뉜 각 부분 (숫자만인 토큰 제외)"""
+    tokens = []
+    for match in _TOKEN_RE.finditer((text or "").lower()):
+        word = match.group()
+        if "가" <= word[0] <= "힣":
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+                if unigrams:
+                    tokens.extend(word)
+        elif "." in word:
+            tokens.extend(part for part in (word, *word.split(".")) if not part.isdigit())
+        elif not word.isdigit():
+            tokens.append(word)
+    return tokens
+
+
+class _Postings:
+    """단어 하나의 문서 목록 - 문서 번호 오름차순 배열 + 점수 기여 상위 DEEP_CHAMPION_LIST_SIZE개(champion list)
+    + 문서 비트맵 (문서 수가 CHAMPION_LIST_SIZE를 넘는 단어만 보관, 작은 목록은 검색 때 만듦)"""
+
+    __slots__ = ("nums", "tfs", "impacts", "champions", "bits")
+
+    def __init__(self):
+        self.nums = array("I")  # 문서 번호 (추가 순서 = 오름차순)
+        self.tfs = array("H")  # 가중 단어 빈도
+        self.impacts = array("f")  # BM25 단어 빈도 항 (idf 제외)
+        self.champions = None  # [(-impact, 문서 번호)] 오름차순 - 문서 수가 CHAMPION_LIST_SIZE 이하면 None
+        self.bits = None  # 문서 번호 비트맵 (little-endian bytearray) - champions와 같은 시점부터 유지
+
+    def append(self, num, tf, impact):
+        self.nums.append(num)
+        self.tfs.append(min(tf, MAX_TERM_FREQUENCY))
+        self.impacts.append(impact)
+        impact = self.impacts[-1]  # float32로 저장된 값과 같게 비교
+        if self.champions is None:
+            if len(self.nums) > CHAMPION_LIST_SIZE:
+                self.champions = heapq.nsmallest(
+                    DEEP_CHAMPION_LIST_SIZE, zip([-value for value in self.impacts], self.nums))
+                self.bits = _bitmap_bytes(self.nums)
+        else:
+            if len(self.champions) < DEEP_CHAMPION_LIST_SIZE or impact > -self.champions[-1][0]:
+                bisect.insort(self.champions, (-impact, num))
+                if len(self.champions) > DEEP_CHAMPION_LIST_SIZE:
+                    self.champions.pop()
+            if num >> 3 >= len(self.bits):
+                self.bits.extend(bytes((num >> 3) + 1 - len(self.bits)))
+            self.bits[num >> 3] |= 1 << (num & 7)
+
+    def floor(self, depth=CHAMPION_LIST_SIZE):
+        """champion list 상위 depth개(DEEP_CHAMPION_LIST_SIZE 이하) 밖 문서의 점수 기여 상한"""
+        if self.champions is None or depth >= len(self.nums):
+            return 0.0
+        return -self.champions[depth - 1][0]
+
+    def impact(self, num):
+        index = bisect.bisect_left(self.nums, num)
+        if index < len(self.nums) and self.nums[index] == num:
+            return self.impacts[index]
+        return 0.0
+
+    def bitmap(self):
+        """문서 번호 비트맵 (int)"""
+        return int.from_bytes(self.bits if self.bits is not None else _bitmap_bytes(self.nums), "little")
+
+
+def _bitmap_bytes(nums):
+    bits = bytearray((nums[-1] >> 3) + 1 if nums else 0)
+    for num in nums:
+        bits[num >> 3] |= 1 << (num & 7)
+    return bits
+
+
+class ResumeSearchIndex:
+    """BM25 역색인 (스레드 안전) - doc_id별 필드 텍스트를 색인하고 검색어와 가까운 doc_id 상위 k개 반환"""
+
+    def __init__(self, field_weights=None, k1=BM25_K1, b=BM25_B):
+        self.field_weights = field_weights or FIELD_WEIGHTS
+        self.k1 = k1
+        self.b = b
+
+        self._ids = []  # 문서 번호 -> doc_id (삭제/교체된 번호는 None)
+        self._nums = {}  # doc_id -> 문서 번호
+        self._signatures = {}  # doc_id -> 필드 텍스트 해시 (내용이 같으면 다시 색인하지 않음)
+        self._lengths = array("f")  # 문서 번호 -> 가중 문서 길이
+        self._postings = {}  # 단어 -> _Postings
+        self._live = 0
+        self._live_length = 0.0
+        self._dead = 0
+        self._avgdl = 0.0  # 저장된 점수 기여를 계산할 때 쓴 평균 문서 길이
+
+        self._lock = threading.Lock()  # 검색/반영
+        self._write_lock = threading.Lock()  # 반영 작업 직렬화 (재구성은 검색을 막지 않고 진행)
+
+    def __len__(self):
+        return self._live
+
+    def add(self, doc_id, fields):
+        return self.add_many([(doc_id, fields)])
+
+    def add_many(self, docs):
+        """(doc_id, {필드: 텍스트}) 목록 색인 - 이미 있는 doc_id는 교체, 내용이 같으면 건너뜀. 색인한 문서 수 반환"""
+        with self._write_lock:
+            prepared = []
+            for doc_id, fields in docs:
+                signature = hash(tuple(fields.get(name) or "" for name in self.field_weights))
+                if self._signatures.get(doc_id) == signature:
+                    continue
+                prepared.append((doc_id, signature, self._term_counts(fields)))
+            if not prepared:
+                return 0
+
+            with self._lock:
+                for doc_id, signature, counts in prepared:
+                    self._remove_locked(doc_id)
+                    self._insert_locked(doc_id, signature, counts)
+                _index_docs.set(self._live)
+            self._maybe_compact()
+            return len(prepared)
+
+    def remove(self, doc_id):
+        return self.remove_many([doc_id])
+
+    def remove_many(self, doc_ids):
+        """doc_id 목록 삭제 - 삭제한 문서 수 반환"""
+        with self._write_lock:
+            with self._lock:
+                removed = sum(1 for doc_id in doc_ids if self._remove_locked(doc_id))
+                _index_docs.set(self._live)
+            if removed:
+                self._maybe_compact()
+            return removed
+
+    def search(self, query, k=10):
+        """검색어와 BM25 점수가 높은 순서로 [(doc_id, 점수)] 최대 k개"""
+        started_at = time.monotonic()
+        terms = set(tokenize(query))
+        if not terms or k <= 0:
+            return []
+        required = max(1, math.ceil(len(terms) * MIN_SHOULD_MATCH))
+
+        with self._lock:
+            weighted = []
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is not None:
+                    df = min(len(postings.nums), self._live)
+                    idf = math.log(1 + (self._live - df + 0.5) / (df + 0.5))
+                    weighted.append((postings, idf))
+            matched = self._match_bitmap(weighted, required) if len(weighted) >= required else 0
+            if not matched:
+                hits, path = [], "empty"
+            elif matched.bit_count() <= DIRECT_SCORE_MAX_DOCS:
+                hits, path = self._score_matched(weighted, matched, k), "bitmap"
+            else:
+                path = "champion"
+                hits, exact = self._search_champions(weighted, required, matched, k, CHAMPION_LIST_SIZE)
+                if not exact:
+                    hits, exact = self._search_champions(weighted, required, matched, k, DEEP_CHAMPION_LIST_SIZE)
+                if not exact:
+                    hits, path = self._score_matched(weighted, matched, k), "bitmap"
+            results = [(self._ids[num], score) for score, num in hits]
+
+        _search_seconds.observe(time.monotonic() - started_at, path=path)
+        return results
+
+    def stats(self):
+        with self._lock:
+            return {"docs": self._live, "terms": len(self._postings), "dead": self._dead,
+                    "avgdl": round(self._avgdl, 1)}
+
+    # ---- 내부 ----
+
+    def _term_counts(self, fields):
+        counts = {}
+        for name, weight in self.field_weights.items():
+            for token in tokenize(fields.get(name), unigrams=True):
+                counts[token] = counts.get(token, 0) + weight
+        return counts
+
+    def _norm(self, length, avgdl):
+        return self.k1 * (1 - self.b + self.b * length / avgdl)
+
+    def _insert_locked(self, doc_id, signature, counts):
+        num = len(self._ids)
+        length = float(sum(counts.values()))
+        self._ids.append(doc_id)
+        self._nums[doc_id] = num
+        self._signatures[doc_id] = signature
+        self._lengths.append(length)
+        self._live += 1
+        self._live_length += length
+        if not self._avgdl:
+            self._avgdl = max(self._live_length / self._live, 1.0)
+
+        norm = self._norm(length, self._avgdl)
+        for term, tf in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = _Postings()
+            postings.append(num, tf, (self.k1 + 1) * tf / (tf + norm))
+
+    def _remove_locked(self, doc_id):
+        num = self._nums.pop(doc_id, None)
+        self._signatures.pop(doc_id, None)
+        if num is None:
+            return False
+        self._ids[num] = None
+        self._live -= 1
+        self._live_length -= self._lengths[num]
+        self._dead += 1
+        return True
+
+    @staticmethod
+    def _match_bitmap(weighted, required):
+        """검색어 토큰을 required개 이상 가진 문서의 비트맵 (삭제된 문서 포함)"""
+        # at_least[j]: 지금까지 본 단어 중 j개 이상을 가진 문서 (-1은 모든 비트가 켜진 값)
+        at_least = [-1] + [0] * required
+        for postings, _ in weighted:
+            bits = postings.bitmap()
+            for count in range(required, 0, -1):
+                at_least[count] |= at_least[count - 1] & bits
+        return at_least[required]
+
+    def _search_champions(self, weighted, required, matched, k, depth):
+        """champion list 상위 depth개 합집합 중 matched 문서만 채점 - (상위 k개, 목록 밖 문서가 상위 k에 들 수 없음이
+        확인되었는지). 목록에 든 점수 기여와 나머지 단어의 상한(floor)으로 문서별 상한을 구해 높은 순서로 보고,
+        상한이 k번째 점수보다 낮아지면 멈추므로 정확한 점수(이진 탐색)는 일부 문서에만 계산"""
+        gains = {}  # 문서 번호 -> champion list에서 확인된 (점수 기여 - floor) 합 (문서 상한 = gain + 전체 floor 합)
+        gain = gains.get
+        total_floor = 0.0
+        for postings, idf in weighted:
+            if postings.champions is None:
+                for num, impact in zip(postings.nums, postings.impacts):
+                    gains[num] = gain(num, 0.0) + idf * impact
+                continue
+            floor = idf * postings.floor(depth)
+            total_floor += floor
+            for negative, num in postings.champions[:depth]:
+                gains[num] = gain(num, 0.0) - idf * negative - floor
+
+        data = matched.to_bytes((matched.bit_length() + 7) // 8, "little")
+        ids = self._ids
+        bounds = sorted(((total_floor + excess, num) for num, excess in gains.items()
+                         if num >> 3 < len(data) and data[num >> 3] >> (num & 7) & 1 and ids[num] is not None),
+                        reverse=True)
+        top = []  # (점수, 문서 번호) 최소 힙
+        for bound, num in bounds:
+            if len(top) == k and bound < top[0][0]:
+                break
+            score = 0.0
+            for postings, idf in weighted:
+                impact = postings.impact(num)
+                if impact:
+                    score += idf * impact
+            if len(top) < k:
+                heapq.heappush(top, (score, num))
+            else:
+                heapq.heappushpop(top, (score, num))
+        hits = sorted(top, reverse=True)
+
+        # 후보 밖 문서는 목록 전체가 후보에 든 단어를 가질 수 없으므로 나머지 단어만으로 required개를 채워야 함
+        large = [postings for postings, _ in weighted if len(postings.nums) > depth]
+        if len(large) < required:
+            return hits, True
+        return hits, len(hits) == k and hits[-1][0] >= total_floor
+
+    def _score_matched(self, weighted, matched, k):
+        """matched 비트맵의 문서를 모두 정확히 채점 (문서가 적으면 이진 탐색, 많으면 목록을 훑어 반영)"""
+        data = matched.to_bytes((matched.bit_length() + 7) // 8, "little")
+        ids = self._ids
+        scores = dict.fromkeys(
+            (num for offset, byte in enumerate(data) if byte
+             for num in (offset * 8 + bit for bit in _BYTE_BITS[byte]) if ids[num] is not None), 0.0)
+
+        for postings, idf in weighted:
+            if len(scores) * 4 < len(postings.nums):
+                for num in scores:
+                    impact = postings.impact(num)
+                    if impact:
+                        scores[num] += idf * impact
+            else:
+                for num, impact in zip(postings.nums, postings.impacts):
+                    if num in scores:
+                        scores[num] += idf * impact
+        return heapq.nlargest(k, ((score, num) for num, score in scores.items()))
+
+    def _maybe_compact(self):
+        """삭제 표시가 많이 쌓였거나 평균 문서 길이가 바뀌었으면 재구성 - _write_lock 안에서 호출"""
+        avgdl = self._live_length / self._live if self._live else 0.0
+        drifted = self._avgdl and abs(avgdl - self._avgdl) > self._avgdl * AVGDL_DRIFT_RATIO
+        if not drifted and not (self._dead >= COMPACT_MIN_DEAD and self._dead > self._live * COMPACT_DEAD_RATIO):
+            return
+        started_at = time.monotonic()
+
+        # 반영 작업은 _write_lock으로 막혀 있으므로 기존 구조를 잠금 없이 읽어 새로 만들고 마지막에 교체
+        alive = [num for num, doc_id in enumerate(self._ids) if doc_id is not None]
+        remap = array("l", [-1]) * len(self._ids)
+        for new_num, old_num in enumerate(alive):
+            remap[old_num] = new_num
+        avgdl = max(avgdl, 1.0)
+        lengths = array("f", (self._lengths[num] for num in alive))
+        norms = [self._norm(length, avgdl) for length in lengths]
+        k1_plus_1 = self.k1 + 1
+
+        postings_by_term = {}
+        for term, postings in list(self._postings.items()):
+            rebuilt = _Postings()
+            for old_num, tf in zip(postings.nums, postings.tfs):
+                new_num = remap[old_num]
+                if new_num >= 0:
+                    rebuilt.append(new_num, tf, k1_plus_1 * tf / (tf + norms[new_num]))
+            if rebuilt.nums:
+                postings_by_term[term] = rebuilt
+        ids = [self._ids[num] for num in alive]
+
+        with self._lock:
+            self._ids = ids
+            self._nums = {doc_id: num for num, doc_id in enumerate(ids)}
+            self._lengths = lengths
+            self._postings = postings_by_term
+            self._live_length = float(sum(lengths))
+            self._dead = 0
+            self._avgdl = avgdl if ids else 0.0
+        logging.info(f"검색 인덱스 재구성 - 문서 {len(ids)}개, 단어 {len(postings_by_term)}개, "
+                     f"{time.monotonic() - started_at:.2f}초")
+
+
+def _synthetic_resumes(count, seed=42):
+    """벤치마크용 가짜 이력서 (doc_id, 필드) 목록"""
+    rng = random.Random(seed)
+    surnames = "김이박최정강조윤장임한오서신권황안송류홍"
+    given = "민서준현우지하윤도예진수영성호재은채원태경"
+    skills = ["Python", "Java", "JavaScript", "TypeScript", "React.js", "Vue.js", "Node.js", "Django", "Spring",
+              "SQL", "MySQL", "PostgreSQL", "Redis", "Kafka", "Docker", "Kubernetes", "AWS", "GCP", "Go", "Kotlin",
+              "C++", "C#", "Spark", "Airflow", "TensorFlow", "PyTorch", "Figma", "Swift", "Flutter", "Linux"]
+    strengths = ["대용량 트래픽 처리", "데이터 파이프라인 설계", "팀 리딩", "코드 리뷰 문화 정착", "성능 최적화",
+                 "클라우드 인프라 구축", "머신러닝 모델 서빙", "결제 시스템 개발", "모바일 앱 출시", "검색 품질 개선",
+                 "테스트 자동화", "장애 대응", "서비스 기획 협업", "레거시 마이그레이션", "실시간 추천 시스템"]
+    roles = ["백엔드 개발자", "프론트엔드 개발자", "데이터 엔지니어", "머신러닝 엔지니어", "풀스택 개발자",
+             "모바일 개발자", "DevOps 엔지니어", "데이터 분석가"]
+    domains = ["커머스", "핀테크", "게임", "헬스케어", "물류", "교육", "광고", "미디어"]
+    docs = []
+    for number in range(count):
+        picked = rng.sample(skills, rng.randint(3, 8))
+        summary = (f"{rng.choice(domains)} 도메인 {rng.randint(1, 15)}년차 {rng.choice(roles)}. "
+                   f"{' '.join(rng.sample(picked, min(3, len(picked))))} 기반 서비스 개발 경험. "
+                   f"{rng.choice(strengths)}에 강점.")
+        docs.append((f"page-{number}", {
+            "name": rng.choice(surnames) + "".join(rng.sample(given, 2)),
+            "strengths": ", ".join(rng.sample(strengths, 3)),
+            "summary": summary,
+            "tech_skills": ", ".join(f"{skill}: {rng.randint(3, 10) * 10}%" for skill in picked),
+        }))
+    return docs
+
+
+def benchmark(docs=30000, queries=300):
+    """가짜 이력서 docs개로 색인 시간과 검색어 종류별 검색 지연 시간(ms: p50/p99/max) 측정
+    (색인 직후 첫 검색부터 모두 측정 - 검색 전에 미리 데워 두는 단계 없음)"""
+    corpus = _synthetic_resumes(docs)
+    index = ResumeSearchIndex()
+    started_at = time.perf_counter()
+    for start in range(0, len(corpus), 100):
+        index.add_many(corpus[start:start + 100])
+    index_seconds = time.perf_counter() - started_at
+
+    rng = random.Random(7)
+    kinds = {
+        "tech": lambda: rng.choice(["python", "react", "node.js", "kafka", "c++", "spring", "aws"]),
+        "multi_tech": lambda: " ".join(rng.sample(["python", "java", "react", "sql", "docker", "aws", "kafka",
+                                                   "spring", "django", "kubernetes"], rng.randint(2, 4))),
+        "name": lambda: rng.choice(corpus)[1]["name"],
+        "surname": lambda: rng.choice("김이박최정"),
+        "korean": lambda: rng.choice(["백엔드 개발자", "데이터 파이프라인", "성능 최적화", "핀테크", "팀 리딩",
+                                      "머신러닝 모델 서빙 경험"]),
+        "mixed": lambda: rng.choice(["python 백엔드", "react 프론트엔드 개발자", "kafka 데이터 엔지니어",
+                                     "aws 클라우드 인프라"]),
+    }
+    latencies = {}
+    for kind, make_query in kinds.items():
+        samples = []
+        for query in (make_query() for _ in range(queries)):
+            started_at = time.perf_counter()
+            index.search(query, k=3)
+            samples.append((time.perf_counter() - started_at) * 1000)
+        samples.sort()
+        latencies[kind] = {"p50": round(samples[len(samples) // 2], 2),
+                           "p99": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 2),
+                           "max": round(samples[-1], 2)}
+    return {"docs": docs, "index_seconds": round(index_seconds, 2), **index.stats(), "latency_ms": latencies}
+
+
+if __name__ == "__main__":
+    doc_count = int(sys.argv[1]) if len(sys.argv) > 1 else 30000
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    print(benchmark(doc_count, query_count))
@@ -1,45 +1,29 @@
 import os
 import json
-import requests
 import logging
 from flask import Flask, request, jsonify, make_response
 from docx import Document
-from openai import OpenAI
 from notion_client import Client
 import PyPDF2
 import io
 from datetime import datetime
-from io import BytesIO
-import fitz
 import matplotlib
 matplotlib.use('Agg')  # 반드시 plt import 전에 설정해야 함
 import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-import numpy as np
 from wordcloud import WordCloud
 import base64
 import re
 import plotly.graph_objects as go
 import plotly.io as pio
 from plotly.subplots import make_subplots
-import tempfile
-from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 import math
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image as RLImage
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from PIL import Image
 import hashlib
 import pickle
 # 스크래핑 라이브러리 추가
 from bs4 import BeautifulSoup
 import time
-from urllib.parse import urljoin, quote
+from urllib.parse import urljoin, quote, urlparse, unquote
 from collections import Counter
 # Selenium 추가
 from selenium import webdriver
@@ -50,35 +34,82 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from job_queue import (JobQueue, JOB_ANALYZE_RESUME, JOB_MATCH_JD, JOB_MATCH_ALL_JDS,
+                       JOB_REGISTER_JD, JOB_BUILD_PDF, JOB_REFRESH_MARKET, JOB_MARKET_CHART,
+                       JOB_NOTION_SYNC)
+from result_cache import ResultCache, normalize_text, make_cache_key
+from artifact_cache import ArtifactCache, UserArtifactStore
+from notion_mirror import NotionMirror
+from llm_gateway import chat_completion
+from pipeline import Stage, StageFailed, run_pipeline
+from chart_renderer import get_radar_chart, get_skill_distribution_chart
+from plotly_exporter import exporter as plotly_exporter, export_image
+import metrics
+import slack_transport
+from slack_outbox import OutboundScheduler
+import font_service
+from pdf_report import render_report, replace_emojis
+from resume_extractor import (extract_text, tidy_text, is_supported_file, UnsupportedFormatError,
+                              EXTRACT_MAX_PAGES, EXTRACT_MAX_CHARS)
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# 한글 폰트 설정
-font_path = 'C:/Windows/Fonts/malgun.ttf'  # 맑은 고딕 폰트 경로
-font_prop = fm.FontProperties(fname=font_path)
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
-
 # API 키 및 토큰을 환경변수에서 가져오기
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN", "your-slack-bot-token-here")
 GPT_API_KEY = os.getenv("GPT_API_KEY", "your-openai-api-key-here")
 NOTION_DATABASE_ID = os.getenv("NOTION_DATABASE_ID", "your-notion-database-id-here")
 NOTION_TOKEN = os.getenv("NOTION_TOKEN", "your-notion-token-here")
 JD_STORAGE_FILE = "stored_jd.pkl"  # JD 데이터 저장 파일
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "jobs.db")  # 백그라운드 작업 큐 저장 파일
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))  # 동시에 처리할 작업 수 (워커 풀 크기)
+ANALYSIS_STAGE_WORKERS = int(os.getenv("ANALYSIS_STAGE_WORKERS", "8"))  # 분석 단계(차트/매칭/전송) 동시 실행 수
+MATCH_FANOUT_CONCURRENCY = int(os.getenv("MATCH_FANOUT_CONCURRENCY", "3"))  # 전체 JD 비교 시 동시 매칭 수
+JD_COMPARISON_TOP_N = 40  # JD 비교 결과에 하나씩 표시할 상위 JD 수 (Slack 메시지 블록은 최대 50개)
+MARKET_CHART_TOP_SKILLS = 15  # 기술스택 분포 차트에 표시할 기술 수
+DASHBOARD_PAGE_SIZE = 10  # 대시보드에 표시할 이력서 수 (미러에서 이만큼만 조회)
+PDF_PREBUILD_ENABLED = os.getenv("PDF_PREBUILD_ENABLED", "true").lower() == "true"  # 분석 완료 직후 PDF 미리 생성
+PDF_ARTIFACT_TTL = int(os.getenv("PDF_ARTIFACT_TTL", "3600"))  # 미리 생성한 PDF 보관 시간 (초)
+PDF_ARTIFACTS_PER_USER = int(os.getenv("PDF_ARTIFACTS_PER_USER", "3"))  # 사용자별 보관할 PDF 수
+PDF_BUILD_WAIT_SECONDS = 60  # 버튼 클릭 시 진행 중인 사전 생성을 기다리는 최대 시간 (초)
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", "result_cache.db")  # GPT 분석 결과 캐시 파일
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "2000"))  # 이력서 분석 결과 최대 보관 개수
+ANALYSIS_MODEL = "gpt-4"
+ANALYSIS_PROMPT_VERSION = "resume-v1"  # 이력서 분석 프롬프트를 수정하면 버전을 올려 캐시를 무효화
+JD_PROMPT_VERSION = "jd-v1"  # JD 분석 프롬프트 버전
+MATCHING_PROMPT_VERSION = "matching-v1"  # JD 매칭 프롬프트 버전
+MATCHING_CACHE_SIZE = int(os.getenv("MATCHING_CACHE_SIZE", "5000"))  # JD 분석/매칭 결과 최대 보관 개수
+TEXT_CACHE_SIZE = int(os.getenv("TEXT_CACHE_SIZE", "500"))  # 추출된 이력서 텍스트 최대 보관 개수
+TEXT_CACHE_TTL = int(os.getenv("TEXT_CACHE_TTL", str(7 * 24 * 3600)))  # 추출된 이력서 텍스트 보관 기간 (초)
+CACHE_ADMIN_USER_IDS = {user_id.strip() for user_id in os.getenv("CACHE_ADMIN_USER_IDS", "").split(",")
+                        if user_id.strip()}  # 캐시 초기화 명령을 쓸 수 있는 Slack 사용자 ID (쉼표로 구분)
+CACHE_CLEAR_COMMANDS = {"캐시 초기화", "캐시초기화", "캐시 삭제", "cache clear", "clear cache"}  # 메시지 전체가 이 중 하나일 때만 실행
+TEXT_CACHE_FORMAT = "lines-v2"  # 저장하는 추출 텍스트 형식 (줄바꿈 유지) - 바꾸면 이전 캐시는 쓰지 않음
+DM_CHANNEL_CACHE_SIZE = int(os.getenv("DM_CHANNEL_CACHE_SIZE", "5000"))  # 보관할 사용자 DM 채널 ID 수
+DM_CHANNEL_CACHE_TTL = int(os.getenv("DM_CHANNEL_CACHE_TTL", str(24 * 3600)))  # DM 채널 ID 보관 기간 (초)
+FILE_INFO_CACHE_SIZE = int(os.getenv("FILE_INFO_CACHE_SIZE", "1000"))  # 보관할 Slack 파일 정보 수
+FILE_INFO_CACHE_TTL = int(os.getenv("FILE_INFO_CACHE_TTL", "300"))  # Slack 파일 정보 보관 기간 (초)
+NOTION_MIRROR_PATH = os.getenv("NOTION_MIRROR_PATH", "notion_mirror.db")  # Notion 이력서 DB 로컬 미러 파일
+NOTION_SYNC_INTERVAL = int(os.getenv("NOTION_SYNC_INTERVAL", "60"))  # Notion 증분 동기화 주기 (초)
+NOTION_FULL_RESYNC_INTERVAL = int(os.getenv("NOTION_FULL_RESYNC_INTERVAL", str(6 * 3600)))  # 전체 동기화 주기 (초, 삭제된 페이지 정리)
+SEARCH_RESULT_LIMIT = 3  # DM 키워드 검색 결과로 보여줄 이력서 수
 
 # Notion 클라이언트 초기화
 notion = Client(auth=NOTION_TOKEN)
 
-# Slack WebClient 초기화
-client = WebClient(token=SLACK_BOT_TOKEN)
+# Slack WebClient 초기화 (SDK 메서드) + 풀링된 HTTP 세션 (직접 호출하는 API/파일 다운로드)
+client = slack_transport.create_web_client(SLACK_BOT_TOKEN)
+slack_http = slack_transport.get_transport(SLACK_BOT_TOKEN)
+slack_outbox = OutboundScheduler(slack_http)  # DM 발송 스케줄러 (rate limit 준수 + 메시지 합치기)
 
 # JD 데이터 저장/불러오기 함수들
 def save_jd_data():
     """JD 데이터를 파일로 저장"""
     try:
-        with open(JD_STORAGE_FILE, 'wb') as f:
-            pickle.dump(stored_jd, f)
+        with stored_jd_lock:
+            with open(JD_STORAGE_FILE, 'wb') as f:
+                pickle.dump(stored_jd, f)
         logging.info(f"JD data saved to {JD_STORAGE_FILE}")
     except Exception as e:
         logging.error(f"Failed to save JD data: {str(e)}")
@@ -98,27 +129,102 @@ def load_jd_data():
         logging.error(f"Failed to load JD data: {str(e)}")
         return {}
 
-# Global variables for PDF generation and JD storage
-last_analysis_result = None
-last_analysis_user_id = None
-stored_jd = load_jd_data()  # 시작 시 저장된 JD 데이터 불러오기
+# Global variables for JD storage
+stored_jd_lock = threading.RLock()  # 요청 스레드와 작업 워커가 함께 stored_jd를 수정하므로 보호
 processed_messages = set()  # 처리된 메시지 ID 캐시
 user_last_message = {}  # 사용자별 마지막 메시지 추적: {user_id: (timestamp, message_hash)}
 
-SLACK_HEADERS = {
-    "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
-    "Content-Type": "application/json"
-}
-
 app = Flask(__name__)
 
+# 분석 파이프라인의 독립 단계들을 동시에 실행하는 executor
+analysis_executor = ThreadPoolExecutor(max_workers=ANALYSIS_STAGE_WORKERS, thread_name_prefix="analysis-stage")
+
+# 미리 생성한 PDF 보고서 (사용자별, 분석 ID 기준, TTL 만료)
+pdf_artifacts = UserArtifactStore("pdf_reports", max_entries_per_user=PDF_ARTIFACTS_PER_USER, ttl=PDF_ARTIFACT_TTL)
+pdf_builds_in_flight = {}  # 생성 중인 PDF: {(user_id, analysis_id): threading.Event}
+pdf_builds_lock = threading.Lock()
+
+# Slack 조회 결과 캐시 (모든 핸들러/작업 워커 공유) - 사용자 DM 채널 ID / files.info 결과
+# (값이 바이트가 아니므로 UTF-8 인코딩 / JSON 직렬화 크기로 stats()의 bytes를 계산)
+dm_channel_cache = ArtifactCache("dm_channel", max_entries=DM_CHANNEL_CACHE_SIZE, ttl=DM_CHANNEL_CACHE_TTL,
+                                 sizeof=lambda channel_id: len(channel_id.encode("utf-8")))
+file_info_cache = ArtifactCache("file_info", max_entries=FILE_INFO_CACHE_SIZE, ttl=FILE_INFO_CACHE_TTL,
+                                sizeof=lambda info: len(json.dumps(info, ensure_ascii=False).encode("utf-8")))
+slack_lookup_total = metrics.counter("slack_lookup_cache_total", "Slack 조회 캐시(DM 채널/파일 정보) 적중/미스 횟수")
+slack_lookup_hit_rate = metrics.gauge("slack_lookup_cache_hit_rate", "Slack 조회 캐시 적중률")
+
+def init_services():
+    """서버 자원 생성 (한글 폰트, 저장된 JD, 작업 큐, 결과 캐시, Notion 미러)
+    파일/SQLite를 열고 검색 인덱스를 만드는 무거운 초기화라 맨 아래에서 서버 프로세스일 때만 호출"""
+    global stored_jd, job_queue, analysis_cache, jd_analysis_cache, matching_cache, extracted_text_cache, notion_mirror
+
+    # 한글 폰트 설정 (한 번만 탐색하여 matplotlib/ReportLab에 등록)
+    font_service.setup_fonts()
+
+    stored_jd = load_jd_data()  # 시작 시 저장된 JD 데이터 불러오기
+
+    # 백그라운드 작업 큐 (Slack 요청은 즉시 응답하고 느린 처리는 워커 풀에서 수행)
+    job_queue = JobQueue(JOB_DB_PATH, max_workers=JOB_WORKERS)
+
+    # 이력서 분석 결과 캐시 (정규화된 이력서 텍스트 해시 + 프롬프트/모델 버전 기준)
+    analysis_cache = ResultCache(RESULT_CACHE_PATH, namespace="resume_analysis", max_entries=ANALYSIS_CACHE_SIZE)
+
+    # JD 분석 결과 캐시 (JD 텍스트 해시 기준) / 매칭 결과 캐시 ((이력서 해시, JD 해시) 기준)
+    jd_analysis_cache = ResultCache(RESULT_CACHE_PATH, namespace="jd_analysis", max_entries=MATCHING_CACHE_SIZE)
+    matching_cache = ResultCache(RESULT_CACHE_PATH, namespace="jd_matching", max_entries=MATCHING_CACHE_SIZE)
+
+    # 추출된 이력서 텍스트 캐시 (Slack file_id / 파일 내용 SHA-256 기준) - 다운로드와 텍스트 추출 모두 생략
+    extracted_text_cache = ResultCache(RESULT_CACHE_PATH, namespace="extracted_text",
+                                       max_entries=TEXT_CACHE_SIZE, ttl=TEXT_CACHE_TTL)
+
+    # Notion 이력서 DB 로컬 미러 (대시보드/검색은 이 미러만 읽음)
+    notion_mirror = NotionMirror(NOTION_MIRROR_PATH, notion, NOTION_DATABASE_ID,
+                                 parse_pages=parse_notion_resume_data,
+                                 sync_interval=NOTION_SYNC_INTERVAL,
+                                 full_resync_interval=NOTION_FULL_RESYNC_INTERVAL)
+
 def get_message_hash(user_id, text, timestamp):
     """메시지의 고유 해시 생성"""
     content = f"{user_id}:{text[:100]}:{timestamp}"  # 사용자ID:텍스트100자:타임스탬프
     return hashlib.md5(content.encode()).hexdigest()
 
-def send_dm(user_id, text, blocks=None, file_url=None):
-    """ 슬랙 DM + 버튼 옵션 """
+def record_slack_lookup(cache, hit):
+    """Slack 조회 캐시 적중 여부를 메트릭에 기록"""
+    slack_lookup_total.inc(cache=cache.name, result="hit" if hit else "miss")
+    slack_lookup_hit_rate.set(cache.stats()["hit_rate"], cache=cache.name)
+
+def get_dm_channel_id(user_id):
+    """사용자 DM 채널 ID (캐시에 없을 때만 conversations.open 호출) - 실패하면 None"""
+    channel_id = dm_channel_cache.get(user_id)
+    record_slack_lookup(dm_channel_cache, channel_id is not None)
+    if channel_id is not None:
+        return channel_id
+
+    dm_response = client.conversations_open(users=[user_id])
+    if not dm_response.get("ok"):
+        logging.error(f"Failed to open DM channel: {dm_response}")
+        return None
+    channel_id = dm_response["channel"]["id"]
+    dm_channel_cache.set(user_id, channel_id)
+    return channel_id
+
+def get_file_info(file_id):
+    """Slack 파일 정보 (같은 파일의 이벤트가 연달아 오면 files.info 재호출 생략) - 실패하면 None"""
+    file_info = file_info_cache.get(file_id)
+    record_slack_lookup(file_info_cache, file_info is not None)
+    if file_info is not None:
+        return file_info
+
+    info = slack_http.api_call("files.info", http_method="GET", params={"file": file_id})
+    if not info.get("ok"):
+        logging.error(f"Failed to get file info: {info.get('error')}")
+        return None
+    file_info_cache.set(file_id, info["file"])
+    return info["file"]
+
+def send_dm(user_id, text, blocks=None, file_url=None, update_key=None, final=False):
+    """ 슬랙 DM + 버튼 옵션 (발송 스케줄러 경유 - update_key가 같은 DM은 새로 올리지 않고 이전 메시지를 수정,
+    final=True면 그 상태 메시지를 마무리) """
     payload = {
         "channel": user_id,
         "text": text,
@@ -205,6 +311,13 @@ def send_dm(user_id, text, blocks=None, file_url=None):
                         "options": jd_options,
                         "style": "primary"
                     },
+                    {
+                        "name": "analyze_resume_all_jds",
+                        "text": "전체 JD 비교 분석",
+                        "type": "button",
+                        "value": file_url,
+                        "style": "default"
+                    },
                     {
                         "name": "analyze_resume",
                         "text": "JD 없이 분석",
@@ -222,49 +335,16 @@ def send_dm(user_id, text, blocks=None, file_url=None):
                 ]
             }]
     
-    res = requests.post(
-        "https://slack.com/api/chat.postMessage", 
-        headers=SLACK_HEADERS, 
-        json=payload  # data=json.dumps(payload) 대신 json=payload 사용
-    )
-    print("DM 전송결과:", res.status_code, res.text)
+    # 채널별 간격/Retry-After를 지키며 발송하고, 연달아 보내는 DM은 한 메시지로 합쳐짐
+    slack_outbox.post(user_id, payload["text"], blocks=payload.get("blocks"),
+                      attachments=payload.get("attachments"), update_key=update_key, final=final)
 
-def search_notion_db(query):
-    """Notion DB에서 검색을 수행하는 함수"""
+def search_notion_db(query, limit=SEARCH_RESULT_LIMIT):
+    """로컬 검색 인덱스에서 BM25 순위 상위 limit개 검색 (성명/강점 Top3/역량카드 요약/기술스택, Notion API 호출 없음)"""
     try:
-        # 검색 필터 설정
-        filter_conditions = {
-            "or": [
-                {
-                    "property": "성명",
-                    "title": {
-                        "contains": query
-                    }
-                },
-                {
-                    "property": "강점 Top3",
-                    "rich_text": {
-                        "contains": query
-                    }
-                },
-                {
-                    "property": "역량카드 요약",
-                    "rich_text": {
-                        "contains": query
-                    }
-                }
-            ]
-        }
-        
-        # Notion DB 검색 실행
-        results = notion.databases.query(
-            database_id=NOTION_DATABASE_ID,
-            filter=filter_conditions
-        )
-        
-        return results.get('results', [])
+        return notion_mirror.search(query, limit=limit)
     except Exception as e:
-        logging.error(f"Notion DB 검색 중 오류 발생: {str(e)}")
+        logging.error(f"Notion 미러 검색 중 오류 발생: {str(e)}")
         return []
 
 def create_search_result_blocks(notion_page):
@@ -327,6 +407,13 @@ def create_search_result_blocks(notion_page):
         logging.error(f"검색 결과 블록 생성 중 오류 발생: {str(e)}")
         return None
 
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    """프로세스 메트릭 (Prometheus 텍스트 형식)"""
+    response = make_response(metrics.render_prometheus(), 200)
+    response.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+    return response
+
 @app.route("/slack/events", methods=["GET", "POST"])
 def slack_events():
     # GET 요청 처리 (URL 검증용)
@@ -335,6 +422,12 @@ def slack_events():
         
     # POST 요청 처리
     try:
+        # Slack 재전송 이벤트는 이미 접수된 이벤트이므로 즉시 응답 (중복 처리 방지)
+        retry_num = request.headers.get('X-Slack-Retry-Num')
+        if retry_num:
+            logging.info(f"Ignoring Slack retry #{retry_num} ({request.headers.get('X-Slack-Retry-Reason', '')})")
+            return make_response("", 200)
+        
         # Content-Type 확인 및 데이터 파싱
         content_type = request.headers.get('Content-Type', '')
         logging.info(f"Received request with Content-Type: {content_type}")
@@ -386,22 +479,23 @@ def slack_events():
                 logging.info(f"File shared - file_id: {file_id}, user_id: {user_id}")
 
                 # 파일 정보 가져오기
-                info = requests.get(
-                    f"https://slack.com/api/files.info?file={file_id}",
-                    headers=SLACK_HEADERS
-                ).json()
-                
-                if not info.get("ok"):
-                    logging.error(f"Failed to get file info: {info.get('error')}")
+                file_info = get_file_info(file_id)
+                if not file_info:
                     return make_response("", 200)
 
                 # 봇이 업로드한 파일은 무시
-                uploader_id = info["file"].get("user")
+                uploader_id = file_info.get("user")
                 if uploader_id == "U08TYB64MD3":  # 봇 ID
                     logging.info("Ignoring file uploaded by resume-bot")
                     return make_response("", 200)
 
-                file_url = info["file"]["url_private_download"]
+                # 분석할 수 없는 형식은 다운로드/GPT 호출 전에 안내하고 종료
+                if not is_supported_file(file_info):
+                    logging.info(f"Unsupported file type: {file_info.get('filetype')} ({file_info.get('name')})")
+                    send_dm(user_id, "⚠️ 지원하지 않는 파일 형식입니다. PDF, DOCX, TXT 파일을 올려주세요.")
+                    return make_response("", 200)
+
+                file_url = file_info["url_private_download"]
                 send_dm(user_id, ":page_facing_up: 새 이력서가 업로드되었습니다. 분석을 시작할까요?", file_url=file_url)
                 
             except Exception as e:
@@ -463,6 +557,29 @@ def slack_events():
                 
                 logging.info(f"Processing message - user_id: {user_id}, hash: {message_hash}, text: {text[:50]}...")
                 
+                # 분석 캐시 초기화 명령 (공유 캐시를 모두 지우므로 정확한 명령어 + 관리자만)
+                if text.strip().lower() in CACHE_CLEAR_COMMANDS:
+                    if user_id not in CACHE_ADMIN_USER_IDS:
+                        send_dm(user_id, "⛔ 캐시 초기화는 관리자만 사용할 수 있습니다.")
+                        return make_response("", 200)
+                    removed = sum(cache.invalidate() for cache in
+                                  (analysis_cache, jd_analysis_cache, matching_cache, extracted_text_cache))
+                    send_dm(user_id, f"🧹 분석 결과 캐시를 초기화했습니다. ({removed}건 삭제)\n다음 분석부터는 GPT로 새로 분석합니다.")
+                    return make_response("", 200)
+                
+                # Notion 미러 전체 재동기화 키워드 감지
+                notion_sync_keywords = ["노션 동기화", "노션동기화", "notion sync", "resync"]
+                if any(keyword in text.lower() for keyword in notion_sync_keywords):
+                    # 전체 동기화는 한 번에 하나만 실행 - 다른 사용자의 동기화가 대기/실행 중이면 그 작업에 합쳐지므로 따로 안내
+                    job_id = job_queue.enqueue(JOB_NOTION_SYNC, {"user_id": user_id}, dedupe_key=JOB_NOTION_SYNC)
+                    job = job_queue.get_job(job_id)
+                    if job and json.loads(job["payload"]).get("user_id") != user_id:
+                        send_dm(user_id, "🔄 다른 사용자가 요청한 Notion 전체 동기화가 이미 진행 중입니다. "
+                                         "끝나면 검색/대시보드에 최신 데이터가 반영됩니다.")
+                    else:
+                        send_dm(user_id, "🔄 Notion 이력서 DB 전체 동기화를 시작합니다. 완료되면 알려드릴게요.")
+                    return make_response("", 200)
+                
                 # JD 등록 키워드 감지
                 jd_registration_keywords = ["jd 등록", "JD 등록", "jd등록", "JD등록", "jd 등록하기", "JD 등록하기"]
                 if any(keyword in text for keyword in jd_registration_keywords):
@@ -511,34 +628,23 @@ def slack_events():
                             send_dm(user_id, "❌ 채용공고 내용이 너무 짧습니다. 더 자세한 내용을 보내주세요. (최소 100자)")
                             return make_response("", 200)
                         
-                        send_dm(user_id, "📋 채용공고를 분석 중입니다...")
+                        send_dm(user_id, "📋 채용공고를 분석 중입니다...", update_key="jd_status")
                         
-                        # JD 분석
-                        jd_data = analyze_jd(jd_content)
-                        if jd_data:
+                        # JD 분석은 백그라운드 작업으로 처리 (Slack 3초 타임아웃 방지)
+                        with stored_jd_lock:
                             jd_name = stored_jd[user_id]["_pending_jd_name"]
-                            
-                            # JD 저장
-                            if user_id not in stored_jd:
-                                stored_jd[user_id] = {}
-                            stored_jd[user_id][jd_name] = jd_data
-                            
-                            # 파일로 저장
-                            save_jd_data()
-                            
-                            # 등록 모드 정리
-                            if "_registration_mode" in stored_jd[user_id]:
-                                del stored_jd[user_id]["_registration_mode"]
-                            if "_pending_jd_name" in stored_jd[user_id]:
-                                del stored_jd[user_id]["_pending_jd_name"]
-                            
-                            # JD 분석 결과 전송
-                            blocks = create_jd_analysis_blocks(jd_data, jd_name)
-                            send_dm(user_id, f"✅ **{jd_name}** JD가 성공적으로 등록되었습니다!", blocks=blocks)
-                        else:
-                            send_dm(user_id, "❌ 채용공고 분석에 실패했습니다. 다시 시도해주세요.")
+                            stored_jd[user_id]["_registration_mode"] = "analyzing_jd_content"
+                        job_queue.enqueue(
+                            JOB_REGISTER_JD,
+                            {"user_id": user_id, "jd_name": jd_name, "jd_content": jd_content},
+                            dedupe_key=f"{JOB_REGISTER_JD}:{user_id}:{jd_name}"
+                        )
                         
                         return make_response("", 200)
+                    
+                    elif mode == "analyzing_jd_content":
+                        send_dm(user_id, "⏳ 채용공고를 분석하고 있습니다. 잠시만 기다려주세요.", update_key="jd_status")
+                        return make_response("", 200)
                 
                 # 일반 검색 및 도움말
                 results = search_notion_db(text)
@@ -567,7 +673,7 @@ def slack_events():
                     return make_response("", 200)
                     
                 # 검색 결과 전송
-                for page in results[:3]:  # 최대 3개 결과만 표시
+                for page in results:  # 점수 순 최대 SEARCH_RESULT_LIMIT개
                     blocks = create_search_result_blocks(page)
                     if blocks:
                         send_dm(user_id, f"🔍 '{text}' 검색 결과입니다.", blocks=blocks)
@@ -590,9 +696,6 @@ def slack_events():
     return make_response("", 200)
 
 def handle_interactive_message(data):
-    # Global variables for PDF generation
-    global last_analysis_result, last_analysis_user_id
-    
     logging.debug("Handling interactive message: %s", data)
     try:
         # Extract user ID and file URL
@@ -613,7 +716,7 @@ def handle_interactive_message(data):
                 return make_response("", 200)
             
             logging.debug("Processing resume for user %s with file %s", user_id, file_url)
-            perform_complete_analysis(user_id, file_url)
+            enqueue_resume_analysis(user_id, file_url)
                 
         elif action_name == "analyze_resume_with_jd":
             # JD 1개가 있는 경우 (자동 선택)
@@ -624,7 +727,7 @@ def handle_interactive_message(data):
             
             file_url, jd_name = value.split("|", 1)
             logging.debug("Processing resume with JD for user %s, file %s, JD %s", user_id, file_url, jd_name)
-            perform_complete_analysis(user_id, file_url, jd_name)
+            enqueue_resume_analysis(user_id, file_url, jd_name)
             
         elif action_name == "select_jd_for_analysis":
             # 드롭다운에서 JD 선택한 경우
@@ -636,7 +739,21 @@ def handle_interactive_message(data):
             
             file_url, jd_name = value.split("|", 1)
             logging.debug("Processing resume with selected JD for user %s, file %s, JD %s", user_id, file_url, jd_name)
-            perform_complete_analysis(user_id, file_url, jd_name)
+            enqueue_resume_analysis(user_id, file_url, jd_name)
+            
+        elif action_name == "analyze_resume_all_jds":
+            # 등록된 모든 JD와 한 번에 비교 분석
+            file_url = action.get("value")
+            if not file_url:
+                logging.error("No file URL in action")
+                return make_response("", 200)
+            
+            logging.debug("Processing resume against all JDs for user %s, file %s", user_id, file_url)
+            job_queue.enqueue(
+                JOB_MATCH_ALL_JDS,
+                {"user_id": user_id, "file_url": file_url},
+                dedupe_key=f"{JOB_MATCH_ALL_JDS}:{user_id}:{file_url}"
+            )
             
         else:
             # 기본적으로 기존 로직 수행 (다운로드 버튼 등)
@@ -656,9 +773,6 @@ def handle_interactive_message(data):
 
 @app.route("/slack/interact", methods=["POST", "GET"])
 def slack_interact():
-    # Global variables for PDF generation
-    global last_analysis_result, last_analysis_user_id
-    
     if request.method == "GET":
         return "OK"
     
@@ -702,86 +816,28 @@ def slack_interact():
                     action_id = action.get("action_id")
                     
                     if action_id == "generate_pdf_report":
-                        # PDF 보고서 생성
-                        try:
-                            if last_analysis_result is None:
-                                send_dm(user_id, "❌ 분석 결과가 없습니다. 먼저 이력서를 분석해주세요.")
-                                return make_response("", 200)
-                            
-                            # 기술 스킬 차트 재생성
-                            tech_skills = last_analysis_result.get("skill_cards", {}).get("tech_skills", "")
-                            skills_dict = parse_skills(tech_skills)
-                            chart_image = None
-                            
-                            if skills_dict:
-                                chart_image = create_plotly_radar_chart(skills_dict)
-                            
-                            # PDF 생성
-                            pdf_bytes = create_pdf_report(last_analysis_result, chart_image)
-                            
-                            if pdf_bytes:
-                                # DM 채널 ID 가져오기
-                                dm_response = client.conversations_open(users=[user_id])
-                                if dm_response.get("ok"):
-                                    dm_channel_id = dm_response["channel"]["id"]
-                                    
-                                    # PDF 업로드
-                                    temp_pdf_file = f"resume_analysis_report_{user_id}.pdf"
-                                    with open(temp_pdf_file, 'wb') as f:
-                                        f.write(pdf_bytes)
-                                    
-                                    upload_response = client.files_upload_v2(
-                                        channel=dm_channel_id,
-                                        title="이력서 분석 보고서",
-                                        filename="resume_analysis_report.pdf",
-                                        file=temp_pdf_file,
-                                        initial_comment="📊 이력서 분석 보고서가 생성되었습니다!"
-                                    )
-                                    
-                                    # 임시 파일 삭제
-                                    if os.path.exists(temp_pdf_file):
-                                        os.remove(temp_pdf_file)
-                                    
-                                    if upload_response.get("file"):
-                                        logging.info("PDF report uploaded successfully")
-                                else:
-                                    send_dm(user_id, "❌ DM 채널 정보를 가져올 수 없습니다.")
-                            else:
-                                send_dm(user_id, "❌ PDF 생성에 실패했습니다.")
-                        
-                        except Exception as e:
-                            logging.error(f"PDF generation error: {str(e)}")
-                            send_dm(user_id, f"❌ PDF 생성 중 오류가 발생했습니다: {str(e)}")
-                        
+                        # PDF 보고서 전송은 백그라운드 작업으로 처리 (미리 생성된 PDF가 있으면 바로 업로드)
+                        analysis_id = action.get("value") or None
+                        job_queue.enqueue(
+                            JOB_BUILD_PDF,
+                            {"user_id": user_id, "analysis_id": analysis_id},
+                            dedupe_key=f"{JOB_BUILD_PDF}:{user_id}:{analysis_id}"
+                        )
                         return make_response("", 200)
                     
                     elif action_id == "refresh_market_data":
-                        # 시장 데이터 새로고침
-                        try:
-                            # 사용자에게 로딩 메시지 전송
-                            send_dm(user_id, "🔄 실시간 채용 데이터를 수집하고 있습니다... (약 10초 소요)")
-                            
-                            # 업데이트된 Modal 생성 (강제 스크래핑 실행)
-                            updated_modal = create_market_intelligence_modal(force_scraping=True)
-                            
-                            # Modal 업데이트
-                            response = client.views_update(
-                                view_id=data["view"]["id"],
-                                hash=data["view"]["hash"],
-                                view=updated_modal
-                            )
-                            
-                            if response.get("ok"):
-                                logging.info("Market intelligence modal refreshed successfully")
-                                send_dm(user_id, "✅ 최신 채용 시장 데이터로 업데이트 완료!")
-                            else:
-                                logging.error(f"Failed to refresh modal: {response}")
-                                send_dm(user_id, "❌ 데이터 새로고침에 실패했습니다.")
-                            
-                        except Exception as e:
-                            logging.error(f"Market data refresh error: {str(e)}")
-                            send_dm(user_id, f"❌ 데이터 새로고침 중 오류가 발생했습니다: {str(e)}")
-                        
+                        # 시장 데이터 새로고침 (스크래핑은 백그라운드 작업으로 처리)
+                        send_dm(user_id, "🔄 실시간 채용 데이터를 수집하고 있습니다... (약 10초 소요)")
+                        job_queue.enqueue(
+                            JOB_REFRESH_MARKET,
+                            {
+                                "user_id": user_id,
+                                "view_id": data["view"]["id"],
+                                "view_hash": data["view"]["hash"],
+                                "refresh": True
+                            },
+                            dedupe_key=f"{JOB_REFRESH_MARKET}:{data['view']['id']}"
+                        )
                         return make_response("", 200)
                 
                 return make_response("", 200)
@@ -875,77 +931,12 @@ def handle_slash_command(form_data):
                 view_id = response["view"]["id"]
                 logging.info(f"로딩 모달 열기 성공, view_id: {view_id}")
                 
-                # 백그라운드에서 실제 데이터 처리
-                def process_market_modal():
-                    try:
-                        logging.info("백그라운드 시장 인텔리전스 데이터 처리 시작")
-                        
-                        # 실제 스크래핑 시도
-                        try:
-                            scraped_jobs = scrape_wanted_jobs()
-                            if scraped_jobs and len(scraped_jobs) > 0:
-                                logging.info(f"실제 스크래핑 성공: {len(scraped_jobs)}개 공고")
-                                analyzed_data = analyze_scraped_data(scraped_jobs)
-                                data_source = "실시간 데이터"
-                            else:
-                                logging.warning("스크래핑 결과 없음, 목업 데이터 사용")
-                                analyzed_data = get_mock_data()
-                                data_source = "데모 데이터"
-                        except Exception as e:
-                            logging.error(f"스크래핑 실패: {str(e)}")
-                            analyzed_data = get_mock_data()
-                            data_source = "데모 데이터"
-                        
-                        # 시장 인텔리전스 모달 생성
-                        market_modal = create_market_intelligence_modal_with_data(analyzed_data, data_source)
-                        
-                        # 모달 업데이트
-                        update_response = client.views_update(
-                            view_id=view_id,
-                            view=market_modal
-                        )
-                        
-                        if update_response.get("ok"):
-                            logging.info("시장 인텔리전스 모달 업데이트 성공")
-                        else:
-                            logging.error(f"모달 업데이트 실패: {update_response}")
-                            
-                    except Exception as e:
-                        logging.error(f"백그라운드 시장 인텔리전스 처리 오류: {str(e)}", exc_info=True)
-                        
-                        # 에러 모달 표시
-                        error_modal = {
-                            "type": "modal",
-                            "callback_id": "market_error",
-                            "title": {
-                                "type": "plain_text",
-                                "text": "❌ 오류 발생"
-                            },
-                            "blocks": [
-                                {
-                                    "type": "section",
-                                    "text": {
-                                        "type": "mrkdwn",
-                                        "text": f"*시장 인텔리전스 생성 중 오류가 발생했습니다.*\n\n```{str(e)}```\n\n잠시 후 다시 시도해주세요."
-                                    }
-                                }
-                            ],
-                            "close": {
-                                "type": "plain_text",
-                                "text": "닫기"
-                            }
-                        }
-                        
-                        try:
-                            client.views_update(view_id=view_id, view=error_modal)
-                        except:
-                            pass
-                
-                # 백그라운드 스레드 시작
-                import threading
-                thread = threading.Thread(target=process_market_modal)
-                thread.daemon = True
-                thread.start()
+                # 백그라운드 작업으로 실제 데이터 처리
+                job_queue.enqueue(
+                    JOB_REFRESH_MARKET,
+                    {"user_id": user_id, "view_id": view_id},
+                    dedupe_key=f"{JOB_REFRESH_MARKET}:{view_id}"
+                )
                 
                 return "", 200
                 
@@ -991,16 +982,14 @@ def handle_modal_submission(data):
             
             logging.info(f"Dashboard filters: job={job_filter}, years={years_filter}, sort={sort_filter}")
             
-            # Notion 데이터 조회 및 필터링
+            # 로컬 Notion 미러에서 필터/정렬/통계를 쿼리로 처리하고 화면에 보일 행만 조회 (Notion API 호출 없음)
             try:
-                notion_pages = get_all_resumes_from_notion()
-                all_data = parse_notion_resume_data(notion_pages)
-                filtered_data = apply_filters(all_data, job_filter, years_filter, sort_filter)
+                dashboard = notion_mirror.dashboard(**get_dashboard_query(job_filter, years_filter, sort_filter))
                 
-                logging.info(f"Found {len(all_data)} total resumes, {len(filtered_data)} after filtering")
+                logging.info(f"Found {dashboard['total']} total resumes, {dashboard['count']} after filtering")
                 
                 # 차트 생성
-                chart_image = create_dashboard_chart(filtered_data)
+                chart_image = create_dashboard_chart(dashboard["matching_scores"])
                 
                 # 새로운 Modal 컨텐츠 생성
                 new_blocks = [
@@ -1017,7 +1006,7 @@ def handle_modal_submission(data):
                 ]
                 
                 # 필터링된 결과 블록 추가
-                result_blocks = create_filtered_results_blocks(filtered_data, len(all_data))
+                result_blocks = create_filtered_results_blocks(dashboard)
                 new_blocks.extend(result_blocks)
                 
                 # 차트가 있는 경우 업로드
@@ -1104,195 +1093,19 @@ def handle_modal_submission(data):
         return "", 500
 
 def replace_emojis_for_pdf(text):
-    """PDF용으로 이모지를 텍스트로 변환"""
-    emoji_replacements = {
-        '📊': '[차트]',
-        '👤': '[인물]',
-        '💫': '[별]',
-        '⭐': '[별점]',
-        '📈': '[그래프]',
-        '🎯': '[목표]',
-        '📌': '[핀]',
-        '💻': '[컴퓨터]',
-        '👥': '[사람들]',
-        '✅': '[체크]',
-        '📚': '[책]',
-        '🔍': '[검색]',
-        '❌': '[X]',
-        '📋': '[클립보드]',
-        '🎉': '[축하]',
-        '💡': '[전구]',
-        '🚀': '[로켓]',
-        '🏆': '[트로피]',
-        '📝': '[메모]',
-        '⚡': '[번개]',
-        '🌟': '[별]',
-        '🎨': '[팔레트]',
-        '🔧': '[도구]',
-        '📖': '[열린책]',
-        '🎭': '[연극]',
-        '🎪': '[서커스]',
-        '🎸': '[기타]',
-        '🎯': '[다트]'
-    }
-    
-    result = text
-    for emoji, replacement in emoji_replacements.items():
-        result = result.replace(emoji, replacement)
-    
-    return result
+    """PDF용으로 이모지를 텍스트로 변환 (미리 만든 변환 테이블 사용)"""
+    return replace_emojis(text)
 
 def create_pdf_report(result, chart_image=None):
-    """분석 결과를 PDF 보고서로 생성 (reportlab 사용)"""
+    """분석 결과를 PDF 보고서로 생성 (미리 준비된 reportlab 템플릿 사용)"""
     try:
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*inch, bottomMargin=1*inch)
-        
-        # 한글 폰트 등록
-        try:
-            # 맑은 고딕 폰트 등록
-            pdfmetrics.registerFont(TTFont('MalgunGothic', 'C:/Windows/Fonts/malgun.ttf'))
-            pdfmetrics.registerFont(TTFont('MalgunGothic-Bold', 'C:/Windows/Fonts/malgunbd.ttf'))
-            font_name = 'MalgunGothic'
-            bold_font_name = 'MalgunGothic-Bold'
-        except:
-            try:
-                # 대체 폰트: 나눔고딕
-                pdfmetrics.registerFont(TTFont('NanumGothic', 'C:/Windows/Fonts/NanumGothic.ttf'))
-                pdfmetrics.registerFont(TTFont('NanumGothic-Bold', 'C:/Windows/Fonts/NanumGothicBold.ttf'))
-                font_name = 'NanumGothic'
-                bold_font_name = 'NanumGothic-Bold'
-            except:
-                # 기본 폰트 사용 (한글 깨질 수 있음)
-                font_name = 'Helvetica'
-                bold_font_name = 'Helvetica-Bold'
-        
-        # 스타일 설정 (한글 폰트 적용)
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'TitleStyle',
-            parent=styles['Title'],
-            fontName=bold_font_name,
-            fontSize=24,
-            spaceAfter=30,
-            textColor=colors.darkblue,
-            alignment=1  # center
-        )
-        
-        heading_style = ParagraphStyle(
-            'HeadingStyle',
-            parent=styles['Heading2'],
-            fontName=bold_font_name,
-            fontSize=14,
-            spaceAfter=12,
-            textColor=colors.darkblue,
-            spaceBefore=20
-        )
-        
-        normal_style = ParagraphStyle(
-            'NormalStyle',
-            parent=styles['Normal'],
-            fontName=font_name,
-            fontSize=11,
-            spaceAfter=8,
-            leftIndent=20
-        )
-        
-        info_style = ParagraphStyle(
-            'InfoStyle',
-            parent=styles['Normal'],
-            fontName=font_name,
-            fontSize=10,
-            spaceAfter=8
-        )
-        
-        # PDF 컨텐츠 구성
-        story = []
-        
-        # 제목
-        story.append(Paragraph(replace_emojis_for_pdf("📊 이력서 분석 보고서"), title_style))
-        story.append(Spacer(1, 20))
-        
-        # 기본 정보
-        current_time = datetime.now().strftime('%Y년 %m월 %d일 %H:%M')
-        story.append(Paragraph(f"생성일시: {current_time}", info_style))
-        story.append(Spacer(1, 20))
-        
-        # 분석 대상자 정보
-        story.append(Paragraph(replace_emojis_for_pdf("👤 분석 대상자 정보"), heading_style))
-        story.append(Paragraph(f"• 이름: {result.get('name', '미기재')}", normal_style))
-        story.append(Paragraph(f"• 총 경력: {result.get('total_years', 'N/A')}년", normal_style))
-        story.append(Spacer(1, 15))
-        
-        # 캐치프레이즈
-        story.append(Paragraph(replace_emojis_for_pdf("💫 캐치프레이즈"), heading_style))
-        catchphrase = result.get('catchphrase', 'N/A')
-        story.append(Paragraph(f"'{replace_emojis_for_pdf(catchphrase)}'", normal_style))
-        story.append(Spacer(1, 15))
-        
-        # 강점 Top 3
-        story.append(Paragraph(replace_emojis_for_pdf("⭐ 강점 Top 3"), heading_style))
-        for i, strength in enumerate(result.get('top_strengths', []), 1):
-            story.append(Paragraph(f"{i}. {replace_emojis_for_pdf(strength)}", normal_style))
-        story.append(Spacer(1, 15))
-        
-        # 기술 스킬 차트 (있는 경우)
-        if chart_image:
-            story.append(Paragraph(replace_emojis_for_pdf("📈 기술 스킬 레이더 차트"), heading_style))
-            try:
-                # 차트 이미지를 메모리에서 직접 처리 (임시 파일 없이)
-                from PIL import Image
-                import io
-                
-                # BytesIO 객체에서 이미지 생성
-                image_buffer = io.BytesIO(chart_image)
-                pil_image = Image.open(image_buffer)
-                
-                # PIL 이미지를 reportlab Image로 직접 변환
-                chart_img = RLImage(pil_image, width=5*inch, height=5*inch)
-                story.append(chart_img)
-                story.append(Spacer(1, 15))
-                
-                logging.info("Chart image successfully added to PDF")
-                    
-            except Exception as e:
-                logging.error(f"Chart image processing error: {str(e)}")
-                story.append(Paragraph(replace_emojis_for_pdf("📈 기술 스킬 레이더 차트"), heading_style))
-                story.append(Paragraph("차트 이미지를 포함할 수 없습니다.", normal_style))
-                story.append(Spacer(1, 15))
-        
-        # 역량 카드
-        story.append(Paragraph(replace_emojis_for_pdf("🎯 역량 분석"), heading_style))
-        
-        skill_cards = result.get('skill_cards', {})
-        
-        # Domain Knowledge
-        story.append(Paragraph(replace_emojis_for_pdf("📌 Domain Knowledge"), heading_style))
-        domain_knowledge = skill_cards.get('domain_knowledge', 'N/A')
-        story.append(Paragraph(replace_emojis_for_pdf(domain_knowledge), normal_style))
-        story.append(Spacer(1, 10))
-        
-        # Tech Skills
-        story.append(Paragraph(replace_emojis_for_pdf("💻 Tech Skills"), heading_style))
-        tech_skills = skill_cards.get('tech_skills', 'N/A')
-        story.append(Paragraph(replace_emojis_for_pdf(tech_skills), normal_style))
-        story.append(Spacer(1, 10))
-        
-        # Soft Skills
-        story.append(Paragraph(replace_emojis_for_pdf("👥 Soft Skills"), heading_style))
-        soft_skills = skill_cards.get('soft_skills', 'N/A')
-        story.append(Paragraph(replace_emojis_for_pdf(soft_skills), normal_style))
-        
-        # PDF 생성
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return render_report(result, chart_image)
         
     except Exception as e:
         logging.error(f"PDF generation error: {str(e)}")
         raise
 
-def create_stat_card_blocks(result):
+def create_stat_card_blocks(result, analysis_id=None):
     blocks = [
         {
             "type": "header",
@@ -1447,6 +1260,7 @@ def create_stat_card_blocks(result):
                         "emoji": True
                     },
                     "action_id": "generate_pdf_report",
+                    "value": analysis_id or "",
                     "style": "primary"
                 }
             ]
@@ -1482,13 +1296,7 @@ def upload_to_slack(file_content, filename, user_id):
             'channels': user_id,
             'initial_comment': '📊 이력서 분석 보고서가 생성되었습니다.'
         }
-        response = requests.post(
-            'https://slack.com/api/files.upload',
-            headers={'Authorization': f'Bearer {SLACK_BOT_TOKEN}'},
-            params=params,
-            files=files
-        )
-        return response.json()
+        return slack_http.api_call("files.upload", params=params, files=files)
     except Exception as e:
         print(f"Slack upload error: {str(e)}")
         raise
@@ -1531,80 +1339,9 @@ def create_simple_test_chart():
         return None
 
 def create_plotly_radar_chart(skills_dict):
-    """matplotlib을 사용한 레이더 차트 생성 (PNG 형식)"""
-    logging.debug("Creating radar chart with matplotlib - skills: %s", skills_dict)
-    
-    if not skills_dict:
-        logging.error("Empty skills dictionary provided")
-        return None
-        
-    try:
-        # 데이터 정제 - 상위 8개 스킬만 선택
-        sorted_skills = dict(sorted(skills_dict.items(), key=lambda x: x[1], reverse=True)[:8])
-        logging.debug("Selected top 8 skills: %s", sorted_skills)
-        
-        # 데이터 준비
-        categories = list(sorted_skills.keys())
-        values = list(sorted_skills.values())
-        N = len(categories)
-        
-        if N == 0:
-            logging.error("No skills to chart")
-            return None
-        
-        # 각도 계산 (360도를 N개로 분할)
-        angles = [n / N * 2 * np.pi for n in range(N)]
-        angles += angles[:1]  # 원을 완성하기 위해 첫 번째 값을 마지막에 추가
-        
-        # 값도 순환 완성
-        values += values[:1]
-        
-        # 그래프 생성
-        fig, ax = plt.subplots(figsize=(10, 10), subplot_kw=dict(projection='polar'))
-        
-        # 차트 색상 설정
-        ax.plot(angles, values, 'o-', linewidth=2, label='기술 스킬', color='#36A2EB')
-        ax.fill(angles, values, alpha=0.25, color='#36A2EB')
-        
-        # 카테고리 라벨 설정
-        ax.set_xticks(angles[:-1])
-        ax.set_xticklabels(categories, fontsize=11)
-        
-        # Y축 (반지름) 설정
-        ax.set_ylim(0, 100)
-        ax.set_yticks([20, 40, 60, 80, 100])
-        ax.set_yticklabels(['20%', '40%', '60%', '80%', '100%'], fontsize=9)
-        
-        # 격자 스타일 설정
-        ax.grid(True, alpha=0.3)
-        ax.set_facecolor('#FAFAFA')
-        
-        # 제목 설정
-        plt.title('기술 스킬 레이더 차트', size=16, fontweight='bold', pad=20)
-        
-        # 범례 설정
-        plt.legend(loc='upper right', bbox_to_anchor=(1.2, 1.0))
-        
-        # 여백 조정
-        plt.tight_layout()
-        
-        # PNG 바이트로 변환
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight', 
-                   facecolor='white', edgecolor='none')
-        buffer.seek(0)
-        png_bytes = buffer.read()
-        buffer.close()
-        
-        # 메모리 정리
-        plt.close(fig)
-        
-        logging.debug("Generated PNG size: %d bytes", len(png_bytes))
-        return png_bytes
-        
-    except Exception as e:
-        logging.error("Error creating radar chart: %s", str(e), exc_info=True)
-        return None
+    """레이더 차트 생성 (PNG 형식) - 같은 스킬 데이터의 차트는 캐시에서 재사용"""
+    logging.debug("Creating radar chart - skills: %s", skills_dict)
+    return get_radar_chart(skills_dict)
 
 def create_wordcloud(skills_dict):
     """기술 스킬 워드클라우드 생성"""
@@ -1626,7 +1363,7 @@ def create_wordcloud(skills_dict):
         width=800,
         height=400,
         background_color='white',
-        font_path='C:/Windows/Fonts/malgun.ttf',  # 한글 폰트 경로
+        font_path=font_service.wordcloud_font_path(),  # 한글 폰트 경로
         min_font_size=10,
         max_font_size=100,
         prefer_horizontal=0.7
@@ -1707,115 +1444,146 @@ def upload_image_to_slack(image_bytes, title, channel_id):
     
     # Determine file extension based on image content
     file_extension = "png" if image_bytes.startswith(b'\x89PNG') else "svg"
-    temp_file = f"temp_{title}.{file_extension}"
     
+    # Upload file to Slack (메모리의 바이트를 바로 전송 - 임시 파일 없음)
+    logging.debug("Attempting to upload file to Slack")
     try:
-        with open(temp_file, 'wb') as f:
-            f.write(image_bytes)
-        logging.debug("Temporary file created: %s", temp_file)
+        response = client.files_upload_v2(
+            channel=channel_id,
+            title=title,
+            filename=f"{title}.{file_extension}",
+            content=image_bytes,
+            request_file_info=True
+        )
+        logging.debug("Slack upload response: %s", response)
         
-        # Upload file to Slack
-        logging.debug("Attempting to upload file to Slack")
-        try:
-            response = client.files_upload_v2(
-                channel=channel_id,
-                title=title,
-                filename=f"{title}.{file_extension}",
-                file=temp_file,
-                request_file_info=True
-            )
-            logging.debug("Slack upload response: %s", response)
+        if response and response.get("file"):
+            file_id = response["file"]["id"]
+            file_url = response["file"].get("url_private")
+            logging.info("File uploaded successfully. File ID: %s, URL: %s", file_id, file_url)
             
-            if response and response.get("file"):
-                file_id = response["file"]["id"]
-                file_url = response["file"].get("url_private")
-                logging.info("File uploaded successfully. File ID: %s, URL: %s", file_id, file_url)
-                
-                # For PNG files, try to display as inline image
-                if file_extension == "png":
-                    try:
-                        blocks = [
-                            {
-                                "type": "image",
-                                "title": {
-                                    "type": "plain_text",
-                                    "text": title
-                                },
-                                "image_url": file_url,
-                                "alt_text": title
-                            }
-                        ]
-                        
-                        client.chat_postMessage(
-                            channel=channel_id,
-                            blocks=blocks,
-                            text=f"📊 {title}"
-                        )
-                        logging.debug("Posted PNG image block to channel")
-                    except Exception as block_error:
-                        logging.error("Error posting image block: %s", str(block_error))
-                
-                return file_id
-            else:
-                logging.error("Upload response missing file info: %s", response)
-                return None
-                
-        except Exception as upload_error:
-            logging.error("Error during Slack upload: %s", str(upload_error), exc_info=True)
+            # For PNG files, try to display as inline image
+            if file_extension == "png":
+                try:
+                    blocks = [
+                        {
+                            "type": "image",
+                            "title": {
+                                "type": "plain_text",
+                                "text": title
+                            },
+                            "image_url": file_url,
+                            "alt_text": title
+                        }
+                    ]
+                    
+                    client.chat_postMessage(
+                        channel=channel_id,
+                        blocks=blocks,
+                        text=f"📊 {title}"
+                    )
+                    logging.debug("Posted PNG image block to channel")
+                except Exception as block_error:
+                    logging.error("Error posting image block: %s", str(block_error))
+            
+            return file_id
+        else:
+            logging.error("Upload response missing file info: %s", response)
             return None
             
-    except Exception as file_error:
-        logging.error("Error handling temporary file: %s", str(file_error))
+    except Exception as upload_error:
+        logging.error("Error during Slack upload: %s", str(upload_error), exc_info=True)
         return None
-        
-    finally:
-        # Clean up temporary file
-        try:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-                logging.debug("Cleaned up temporary upload file")
-        except Exception as cleanup_error:
-            logging.error("Error cleaning up upload file: %s", str(cleanup_error))
-            
-    return None
+
+def get_slack_file_id(file_url):
+    """Slack 비공개 파일 URL(.../files-pri/T팀ID-F파일ID/...)에서 파일 ID 추출"""
+    match = re.search(r"/files-pri/[A-Z0-9]+-(F[A-Z0-9]+)/", file_url or "")
+    return match.group(1) if match else None
+
+def text_cache_key(kind, value):
+    """텍스트 캐시 키 - 추출 상한/저장 형식이 바뀌면 다른 키가 되도록 함께 포함"""
+    return make_cache_key(kind, value, EXTRACT_MAX_PAGES, EXTRACT_MAX_CHARS, TEXT_CACHE_FORMAT)
 
 def download_resume(file_url):
-    """Download resume file from Slack"""
+    """Download resume file from Slack
+
+    지원하지 않는 형식이면 UnsupportedFormatError를 그대로 올려 호출한 쪽이 사유를 사용자에게 전달하도록 함
+    """
     logging.debug("Attempting to download resume from URL: %s", file_url)
     try:
-        headers = {"Authorization": f"Bearer {SLACK_BOT_TOKEN}"}
-        res = requests.get(file_url, headers=headers, timeout=30)
+        # 같은 Slack 파일이면 다운로드 없이 캐시된 텍스트 사용
+        file_id = get_slack_file_id(file_url)
+        if file_id:
+            cached = extracted_text_cache.get(text_cache_key("file_id", file_id))
+            if cached is not None:
+                logging.info(f"추출 텍스트 캐시 적중 - file_id: {file_id}, pages: {cached['page_count']}")
+                return cached["text"]
+        
+        res = slack_http.download(file_url)
         
         if res.status_code != 200:
             logging.error("File download failed: Status code %d", res.status_code)
             return None
 
-        file_path = "temp.pdf"
-        with open(file_path, "wb") as f:
-            f.write(res.content)
-            
-        # Extract text from PDF
-        text = ""
-        with fitz.open(file_path) as doc:
-            for page in doc:
-                text += page.get_text()
-                
-        if not text.strip():
-            logging.error("No text could be extracted from the PDF")
+        # 다른 파일 ID로 다시 올린 같은 파일이면 추출 생략
+        content_hash = hashlib.sha256(res.content).hexdigest()
+        cached = extracted_text_cache.get(text_cache_key("sha256", content_hash))
+        if cached is not None:
+            logging.info(f"추출 텍스트 캐시 적중 - sha256: {content_hash[:12]}")
+            if file_id:
+                extracted_text_cache.set(text_cache_key("file_id", file_id), cached)
+            return cached["text"]
+
+        # 매직 바이트 + Slack 파일 정보(filetype/mimetype/파일명)로 형식 판별 후 메모리에서 바로 추출 (임시 파일 없음)
+        file_info = (get_file_info(file_id) if file_id else None) or {}
+        filename = file_info.get("name") or unquote(os.path.basename(urlparse(file_url).path))
+        try:
+            extracted = extract_text(
+                res.content,
+                filetype=file_info.get("filetype"),
+                mimetype=file_info.get("mimetype") or res.headers.get("Content-Type"),
+                filename=filename
+            )
+        except UnsupportedFormatError as e:
+            logging.error("Unsupported resume file (%s): %s", filename, str(e))
+            raise
+        
+        # 줄바꿈은 GPT 프롬프트에 이력서 구조가 남도록 유지 (normalize_text는 캐시 키 계산에만 사용)
+        text = tidy_text(extracted["text"])
+        if not text:
+            logging.error("No text could be extracted from the %s file", extracted["format"])
             return None
+        
+        cache_value = {"text": text, "page_count": extracted["page_count"], "sha256": content_hash}
+        extracted_text_cache.set(text_cache_key("sha256", content_hash), cache_value)
+        if file_id:
+            extracted_text_cache.set(text_cache_key("file_id", file_id), cache_value)
             
-        logging.debug("Successfully extracted text from PDF, length: %d", len(text))
+        logging.debug("Successfully extracted text from %s, length: %d", extracted["format"], len(text))
         return text
         
+    except UnsupportedFormatError:
+        raise
     except Exception as e:
         logging.error("Error downloading resume: %s", str(e), exc_info=True)
         return None
 
+def get_analysis_id(text):
+    """분석 ID - 이력서 분석 캐시 키와 같음 (정규화된 텍스트 해시 + 프롬프트/모델 버전)"""
+    return make_cache_key(ANALYSIS_MODEL, ANALYSIS_PROMPT_VERSION, normalize_text(text))
+
 def analyze_resume(text, user_id=None):
     """Analyze resume text using GPT-4"""
     logging.debug("Starting resume analysis")
+    
+    # 같은 이력서(정규화 후 동일 텍스트)는 캐시된 결과 사용 - OpenAI 호출 생략
+    cache_key = get_analysis_id(text)
+    cached_result = analysis_cache.get(cache_key)
+    if cached_result is not None:
+        logging.info(f"이력서 분석 캐시 적중 - key: {cache_key[:12]}")
+        return cached_result
+    
     try:
-        openai_client = OpenAI(api_key=GPT_API_KEY)
         prompt = f"""
         이력서를 분석하여 정확히 아래 JSON 형식으로만 출력하세요. 반드시 한국어로 응답해주세요.
 
@@ -1845,12 +1613,13 @@ def analyze_resume(text, user_id=None):
             }}
         }}"""
 
-        logging.info("API 요청 시작 - openai_client: %s", openai_client)
+        logging.info("API 요청 시작 - model: %s", ANALYSIS_MODEL)
         logging.info("API 요청 데이터: %s", text[:100] + "...")
         
         print("GPT API 호출 시작...")
-        response = openai_client.chat.completions.create(
-            model="gpt-4",
+        response = chat_completion(
+            api_key=GPT_API_KEY,
+            model=ANALYSIS_MODEL,
             messages=[
                 {"role": "system", "content": "You are a Korean resume analyzer. You MUST respond in Korean language ONLY. All descriptions, explanations, and content must be in Korean. Only technical terms (like programming languages, tools) can remain in English. Always output ONLY valid JSON format in Korean."},
                 {"role": "user", "content": prompt}
@@ -1865,6 +1634,7 @@ def analyze_resume(text, user_id=None):
         # JSON 형식 검증
         try:
             parsed_result = json.loads(result)
+            analysis_cache.set(cache_key, parsed_result)
             return parsed_result
             
         except Exception as e:
@@ -1882,8 +1652,14 @@ def analyze_resume(text, user_id=None):
 
 def analyze_jd(jd_text):
     """JD 텍스트를 분석하여 요구사항 추출"""
+    # 같은 채용공고(이름이 달라도 내용이 같으면)는 캐시된 분석 결과 사용
+    cache_key = make_cache_key(ANALYSIS_MODEL, JD_PROMPT_VERSION, normalize_text(jd_text))
+    cached_result = jd_analysis_cache.get(cache_key)
+    if cached_result is not None:
+        logging.info(f"JD 분석 캐시 적중 - key: {cache_key[:12]}")
+        return cached_result
+    
     try:
-        openai_client = OpenAI(api_key=GPT_API_KEY)
         prompt = f"""
         다음 채용공고(JD)를 분석하여 JSON 형식으로 요구사항을 추출해주세요:
 
@@ -1904,8 +1680,9 @@ def analyze_jd(jd_text):
         }}
         """
 
-        response = openai_client.chat.completions.create(
-            model="gpt-4",
+        response = chat_completion(
+            api_key=GPT_API_KEY,
+            model=ANALYSIS_MODEL,
             messages=[
                 {"role": "system", "content": "You are a JD analyzer that outputs ONLY valid JSON format."},
                 {"role": "user", "content": prompt}
@@ -1914,7 +1691,9 @@ def analyze_jd(jd_text):
         )
 
         result = response.choices[0].message.content.strip()
-        return json.loads(result)
+        jd_data = json.loads(result)
+        jd_analysis_cache.set(cache_key, jd_data)
+        return jd_data
 
     except Exception as e:
         logging.error(f"JD 분석 오류: {str(e)}")
@@ -1922,9 +1701,16 @@ def analyze_jd(jd_text):
 
 def calculate_matching_score(resume_result, jd_data, original_resume_text=None):
     """이력서와 JD 매칭 점수 계산 (범용적 의미적 매칭)"""
+    # (이력서 해시, JD 해시)가 같으면 캐시된 매칭 결과 사용 - 토큰 비용 없이 즉시 반환
+    resume_hash = make_cache_key(resume_result, normalize_text(original_resume_text))
+    jd_hash = make_cache_key(jd_data)
+    cache_key = make_cache_key(ANALYSIS_MODEL, MATCHING_PROMPT_VERSION, resume_hash, jd_hash)
+    cached_result = matching_cache.get(cache_key)
+    if cached_result is not None:
+        logging.info(f"매칭 결과 캐시 적중 - resume: {resume_hash[:12]}, jd: {jd_hash[:12]}")
+        return cached_result
+    
     try:
-        openai_client = OpenAI(api_key=GPT_API_KEY)
-        
         # 디버깅: 입력 데이터 로깅
         print("=== 매칭 분석 디버깅 정보 ===")
         print(f"이력서 요약 데이터: {json.dumps(resume_result, ensure_ascii=False, indent=2)}")
@@ -2022,8 +1808,9 @@ def calculate_matching_score(resume_result, jd_data, original_resume_text=None):
         logging.info(f"전체 프롬프트: {prompt}")
         
         print("GPT API 호출 시작 (적극적 의미적 매칭)...")
-        response = openai_client.chat.completions.create(
-            model="gpt-4",
+        response = chat_completion(
+            api_key=GPT_API_KEY,
+            model=ANALYSIS_MODEL,
             messages=[
                 {"role": "system", "content": "You are an expert Korean HR analyst specializing in AGGRESSIVE SEMANTIC MATCHING. Your core principle: when in doubt, match it. Look for ANY possible connection between resume experiences and JD requirements. Be extremely generous and positive in recognizing relevant experience. Focus on transferable skills, related competencies, and the essence of work rather than exact keywords. If there's even 30% relevance, mark it as matched. Always respond in Korean. Be an advocate for the candidate."},
                 {"role": "user", "content": prompt}
@@ -2066,6 +1853,7 @@ def calculate_matching_score(resume_result, jd_data, original_resume_text=None):
         try:
             parsed_result = json.loads(cleaned_result)
             logging.info("적극적 의미적 매칭 분석 성공적으로 파싱됨")
+            matching_cache.set(cache_key, parsed_result)
             return parsed_result
         except json.JSONDecodeError as json_err:
             logging.error(f"JSON 파싱 실패: {str(json_err)}")
@@ -2187,23 +1975,22 @@ def create_jd_analysis_blocks(jd_data, jd_name=None):
     
     return blocks
 
-def create_matching_result_blocks(matching_result, jd_data, jd_name=None):
+def get_matching_score_status(overall_score):
+    """매칭 점수에 따른 색상/평가 반환"""
+    if overall_score >= 80:
+        return "🟢", "매우 적합"
+    elif overall_score >= 60:
+        return "🟡", "적합"
+    elif overall_score >= 40:
+        return "🟠", "보통"
+    return "🔴", "부족"
+
+def create_matching_result_blocks(matching_result, jd_data, jd_name=None, analysis_id=None):
     """매칭 결과를 Slack 블록으로 변환 (이전 완벽 버전)"""
     overall_score = matching_result.get('overall_score', 0)
     
     # 점수에 따른 색상 결정
-    if overall_score >= 80:
-        color = "🟢"
-        status = "매우 적합"
-    elif overall_score >= 60:
-        color = "🟡"
-        status = "적합"
-    elif overall_score >= 40:
-        color = "🟠"
-        status = "보통"
-    else:
-        color = "🔴"
-        status = "부족"
+    color, status = get_matching_score_status(overall_score)
     
     # 헤더 제목 설정
     header_title = "🎯 JD 매칭 분석 결과"
@@ -2448,6 +2235,7 @@ def create_matching_result_blocks(matching_result, jd_data, jd_name=None):
                         "emoji": True
                     },
                     "action_id": "generate_pdf_report",
+                    "value": analysis_id or "",
                     "style": "primary"
                 }
             ]
@@ -2465,6 +2253,85 @@ def create_matching_result_blocks(matching_result, jd_data, jd_name=None):
     
     return blocks
 
+def create_jd_comparison_blocks(ranked_results, failed_jds=None):
+    """여러 JD 매칭 결과를 점수순으로 비교하는 Slack 블록 생성
+    (상위 JD_COMPARISON_TOP_N개만 하나씩 표시하고 나머지는 요약 한 줄 - Slack 블록 50개 제한)"""
+    blocks = [
+        {
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": "🏆 JD별 매칭 비교 결과",
+                "emoji": True
+            }
+        },
+        {
+            "type": "divider"
+        }
+    ]
+    
+    for rank, (jd_name, matching_result) in enumerate(ranked_results[:JD_COMPARISON_TOP_N], 1):
+        overall_score = matching_result.get('overall_score', 0)
+        color, status = get_matching_score_status(overall_score)
+        skill_match = matching_result.get('skill_match', {})
+        experience_match = matching_result.get('experience_match', {})
+        domain_match = matching_result.get('domain_match', {})
+        
+        text = (f"*{rank}. {jd_name}*  {color} *{overall_score}점* ({status})\n"
+                f"💻 필수기술 {skill_match.get('required_skills_score', 0)}점 • "
+                f"📅 경력 {experience_match.get('score', 0)}점 • "
+                f"🏢 도메인 {domain_match.get('score', 0)}점 • "
+                f"⭐ 우대기술 {skill_match.get('preferred_skills_score', 0)}점")
+        if matching_result.get('recommendation'):
+            text += f"\n_{matching_result['recommendation']}_"
+        
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": text[:3000]
+            }
+        })
+    
+    rest = ranked_results[JD_COMPARISON_TOP_N:]
+    if rest:
+        scores = [matching_result.get('overall_score', 0) or 0 for _, matching_result in rest]
+        blocks.append({
+            "type": "context",
+            "elements": [
+                {
+                    "type": "mrkdwn",
+                    "text": f"… 외 {len(rest)}개 JD ({max(scores)}점 ~ {min(scores)}점)"
+                }
+            ]
+        })
+    
+    if failed_jds:
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"❌ 매칭 분석 실패: {', '.join(failed_jds)}"[:3000]
+            }
+        })
+    
+    blocks.extend([
+        {
+            "type": "divider"
+        },
+        {
+            "type": "context",
+            "elements": [
+                {
+                    "type": "mrkdwn",
+                    "text": "💡 특정 JD의 상세 매칭 분석이 필요하면 해당 JD를 선택해서 분석해주세요."
+                }
+            ]
+        }
+    ])
+    
+    return blocks
+
 def trigger_jd_registration(user_id):
     """JD 등록 프로세스를 시작하는 함수"""
     try:
@@ -2495,87 +2362,509 @@ JD 이름을 먼저 보내주시면, 다음에 받는 메시지를 채용공고
         send_dm(user_id, "❌ JD 등록 프로세스 시작 중 오류가 발생했습니다.")
 
 def perform_complete_analysis(user_id, file_url, jd_name=None):
-    """이력서 분석과 JD 매칭을 통합해서 수행하는 함수"""
+    """이력서 분석과 JD 매칭을 통합해서 수행하는 함수
+
+    다운로드 → 분석 이후의 단계는 의존성 그래프로 실행:
+    차트 렌더링/업로드, 스탯 카드 전송, JD 매칭은 서로 기다리지 않고 동시에 진행
+    """
     try:
+        jd_data = None
+        if jd_name and user_id in stored_jd and jd_name in stored_jd[user_id]:
+            jd_data = stored_jd[user_id][jd_name]
+
         # 이력서 다운로드 및 텍스트 추출
-        resume_text = download_resume(file_url)
+        def fetch_resume_text():
+            try:
+                resume_text = download_resume(file_url)
+            except UnsupportedFormatError as e:
+                raise StageFailed(f"❌ {str(e)}")
+            if not resume_text:
+                raise StageFailed("❌ 이력서 다운로드에 실패했습니다.")
+            return resume_text
+
+        # 이력서 분석
+        def analyze(resume_text):
+            parsed_result = analyze_resume(resume_text, user_id)
+            if not parsed_result:
+                raise StageFailed("❌ 이력서 분석에 실패했습니다.")
+            return parsed_result
+
+        # 분석 ID (PDF 버튼 값 / 사전 생성 PDF 키)
+        def get_analysis_id_stage(resume_text):
+            return get_analysis_id(resume_text)
+
+        # DM 채널 조회 (분석과 무관하므로 다운로드와 동시에 시작, 보통 캐시 적중)
+        def open_dm_channel():
+            return get_dm_channel_id(user_id)
+
+        # 기술 스킬 차트 생성
+        def render_chart(parsed_result):
+            tech_skills = parsed_result.get("skill_cards", {}).get("tech_skills", "")
+            skills_dict = parse_skills(tech_skills)
+            if not skills_dict:
+                return None
+            return create_plotly_radar_chart(skills_dict)
+
+        # 차트 업로드
+        def upload_chart(chart_bytes, dm_channel_id):
+            if not chart_bytes or not dm_channel_id:
+                return None
+            file_id = upload_image_to_slack(chart_bytes, "Technical Skills Radar Chart", dm_channel_id)
+            if not file_id:
+                logging.error("Failed to upload chart")
+            return file_id
+
+        # 이력서 분석 결과 전송
+        def post_stat_card(parsed_result, analysis_id):
+            blocks = create_stat_card_blocks(parsed_result, analysis_id)
+            send_dm(user_id, "✅ 이력서 분석이 완료되었습니다.", blocks=blocks)
+
+            if not jd_data and user_id in stored_jd:
+                # JD는 있지만 선택되지 않은 경우 안내
+                user_jds = [name for name in stored_jd[user_id].keys() if not name.startswith("_")]
+                if user_jds:
+                    send_dm(user_id, f"💡 등록된 JD({', '.join(user_jds)})와의 매칭 분석을 원하시면 JD를 선택해서 분석해주세요.")
+
+        # JD 매칭 분석 (선택된 JD가 있는 경우)
+        def match_jd(parsed_result, resume_text):
+            if not jd_data:
+                return None
+            send_dm(user_id, f"🎯 **{jd_name}** JD와의 매칭 분석을 시작합니다...")
+            return calculate_matching_score(parsed_result, jd_data, resume_text)
+
+        def post_matching(matching_result, analysis_id):
+            if not jd_data:
+                return
+            if matching_result:
+                matching_blocks = create_matching_result_blocks(matching_result, jd_data, jd_name, analysis_id)
+                send_dm(user_id, f"🎯 **{jd_name}** JD 매칭 분석이 완료되었습니다!", blocks=matching_blocks)
+            else:
+                send_dm(user_id, "❌ JD 매칭 분석에 실패했습니다.")
+
+        # PDF 보고서 사전 생성 (차트 렌더링 결과 재사용)
+        def prebuild_pdf(analysis_id, parsed_result, chart_bytes):
+            prebuild_pdf_report(user_id, analysis_id, parsed_result, chart_bytes)
+
+        stages = [
+            Stage("resume_text", fetch_resume_text),
+            Stage("dm_channel_id", open_dm_channel),
+            Stage("analysis_id", get_analysis_id_stage, depends_on=["resume_text"]),
+            Stage("parsed_result", analyze, depends_on=["resume_text"]),
+            Stage("chart_bytes", render_chart, depends_on=["parsed_result"]),
+            Stage("chart_upload", upload_chart, depends_on=["chart_bytes", "dm_channel_id"]),
+            Stage("stat_card", post_stat_card, depends_on=["parsed_result", "analysis_id"]),
+            Stage("matching_result", match_jd, depends_on=["parsed_result", "resume_text"]),
+            Stage("matching_post", post_matching, depends_on=["matching_result", "analysis_id"]),
+        ]
+        if PDF_PREBUILD_ENABLED:
+            stages.append(Stage("pdf_prebuild", prebuild_pdf, depends_on=["analysis_id", "parsed_result", "chart_bytes"]))
+
+        results, errors = run_pipeline(stages, analysis_executor, name=f"analysis:{user_id}")
+
+        # 다운로드/분석 실패는 사용자에게 안내
+        for stage_name in ("resume_text", "parsed_result"):
+            error = errors.get(stage_name)
+            if isinstance(error, StageFailed):
+                send_dm(user_id, str(error))
+                return False
+            if error is not None:
+                raise error
+
+        if "matching_result" in errors and jd_data:
+            send_dm(user_id, "❌ JD 매칭 분석에 실패했습니다.")
+
+        return True
+        
+    except Exception as e:
+        logging.error(f"Complete analysis error: {str(e)}")
+        send_dm(user_id, f"❌ 분석 중 오류 발생: {str(e)}")
+        return False
+
+def perform_multi_jd_analysis(user_id, file_url):
+    """이력서를 한 번만 분석한 뒤 등록된 모든 JD와 병렬로 매칭하여 순위 비교"""
+    try:
+        with stored_jd_lock:
+            user_jds = {name: jd_data for name, jd_data in stored_jd.get(user_id, {}).items()
+                        if not name.startswith("_")}
+        if not user_jds:
+            send_dm(user_id, "📋 등록된 JD가 없습니다. \"JD 등록하기\"로 먼저 JD를 등록해주세요.")
+            return False
+        
+        # 이력서 다운로드 및 분석 (1회)
+        try:
+            resume_text = download_resume(file_url)
+        except UnsupportedFormatError as e:
+            send_dm(user_id, f"❌ {str(e)}")
+            return False
         if not resume_text:
             send_dm(user_id, "❌ 이력서 다운로드에 실패했습니다.")
             return False
-            
-        # 이력서 분석
+        
         parsed_result = analyze_resume(resume_text, user_id)
         if not parsed_result:
             send_dm(user_id, "❌ 이력서 분석에 실패했습니다.")
             return False
         
-        # 전역 변수에 저장 (PDF 생성용)
-        global last_analysis_result, last_analysis_user_id
-        last_analysis_result = parsed_result
-        last_analysis_user_id = user_id
-        
-        # 기술 스킬 차트 생성 및 업로드
-        tech_skills = parsed_result.get("skill_cards", {}).get("tech_skills", "")
-        skills_dict = parse_skills(tech_skills)
-        
-        if skills_dict:
-            chart_bytes = create_plotly_radar_chart(skills_dict)
-            if chart_bytes:
+        analysis_id = get_analysis_id(resume_text)
+        send_dm(user_id, "✅ 이력서 분석이 완료되었습니다.", blocks=create_stat_card_blocks(parsed_result, analysis_id))
+        send_dm(user_id, f"🎯 등록된 JD {len(user_jds)}개와의 매칭 분석을 동시에 진행합니다...")
+        if PDF_PREBUILD_ENABLED:
+            analysis_executor.submit(prebuild_pdf_report, user_id, analysis_id, parsed_result)
+        
+        # JD별 매칭을 워커 풀에서 제한된 동시성으로 실행
+        matching_results = {}
+        in_flight = {}
+        jd_queue = list(user_jds.items())
+        while jd_queue or in_flight:
+            while jd_queue and len(in_flight) < MATCH_FANOUT_CONCURRENCY:
+                jd_name, jd_data = jd_queue.pop(0)
+                future = analysis_executor.submit(calculate_matching_score, parsed_result, jd_data, resume_text)
+                in_flight[future] = jd_name
+            
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                jd_name = in_flight.pop(future)
                 try:
-                    dm_response = client.conversations_open(users=[user_id])
-                    if dm_response.get("ok"):
-                        dm_channel_id = dm_response["channel"]["id"]
-                        file_id = upload_image_to_slack(chart_bytes, "Technical Skills Radar Chart", dm_channel_id)
-                        if not file_id:
-                            logging.error("Failed to upload chart")
+                    matching_results[jd_name] = future.result()
                 except Exception as e:
-                    logging.error(f"Chart upload error: {str(e)}")
+                    logging.error(f"JD 매칭 오류 ({jd_name}): {str(e)}")
+                    matching_results[jd_name] = None
         
-        # 이력서 분석 결과 전송
-        blocks = create_stat_card_blocks(parsed_result)
-        send_dm(user_id, "✅ 이력서 분석이 완료되었습니다.", blocks=blocks)
+        ranked_results = sorted(
+            [(name, result) for name, result in matching_results.items() if result],
+            key=lambda item: item[1].get('overall_score', 0) or 0,
+            reverse=True
+        )
+        failed_jds = [name for name, result in matching_results.items() if not result]
         
-        # JD 매칭 분석 (선택된 JD가 있는 경우)
-        if jd_name and user_id in stored_jd and jd_name in stored_jd[user_id]:
-            send_dm(user_id, f"🎯 **{jd_name}** JD와의 매칭 분석을 시작합니다...")
-            
-            jd_data = stored_jd[user_id][jd_name]
-            matching_result = calculate_matching_score(parsed_result, jd_data, resume_text)
-            
-            if matching_result:
-                matching_blocks = create_matching_result_blocks(matching_result, jd_data, jd_name)
-                send_dm(user_id, f"🎯 **{jd_name}** JD 매칭 분석이 완료되었습니다!", blocks=matching_blocks)
-            else:
-                send_dm(user_id, "❌ JD 매칭 분석에 실패했습니다.")
-        elif user_id in stored_jd:
-            # JD는 있지만 선택되지 않은 경우 안내
-            user_jds = [name for name in stored_jd[user_id].keys() if not name.startswith("_")]
-            if user_jds:
-                send_dm(user_id, f"💡 등록된 JD({', '.join(user_jds)})와의 매칭 분석을 원하시면 JD를 선택해서 분석해주세요.")
+        if not ranked_results:
+            send_dm(user_id, "❌ JD 매칭 분석에 실패했습니다.")
+            return False
         
+        blocks = create_jd_comparison_blocks(ranked_results, failed_jds)
+        send_dm(user_id, f"🏆 JD {len(ranked_results)}개 매칭 비교가 완료되었습니다!", blocks=blocks)
         return True
         
     except Exception as e:
-        logging.error(f"Complete analysis error: {str(e)}")
+        logging.error(f"Multi JD analysis error: {str(e)}", exc_info=True)
         send_dm(user_id, f"❌ 분석 중 오류 발생: {str(e)}")
         return False
 
-# Modal 대시보드 관련 함수들 추가
-def get_all_resumes_from_notion():
-    """Notion DB에서 모든 이력서 데이터를 가져오는 함수"""
+# 백그라운드 작업 관련 함수들
+def enqueue_resume_analysis(user_id, file_url, jd_name=None):
+    """이력서 분석 작업 등록 (같은 파일/JD 조합이 처리 중이면 중복 등록하지 않음)"""
+    job_type = JOB_MATCH_JD if jd_name else JOB_ANALYZE_RESUME
+    return job_queue.enqueue(
+        job_type,
+        {"user_id": user_id, "file_url": file_url, "jd_name": jd_name},
+        dedupe_key=f"{job_type}:{user_id}:{file_url}:{jd_name or ''}"
+    )
+
+def register_jd(user_id, jd_name, jd_content):
+    """JD 분석 후 저장하고 결과를 DM으로 전송"""
+    jd_data = analyze_jd(jd_content)
+
+    with stored_jd_lock:
+        if user_id not in stored_jd:
+            stored_jd[user_id] = {}
+
+        if not jd_data:
+            # 다시 채용공고를 받을 수 있도록 등록 모드 복구
+            stored_jd[user_id]["_registration_mode"] = "waiting_for_jd_content"
+            stored_jd[user_id]["_pending_jd_name"] = jd_name
+        else:
+            # JD 저장
+            stored_jd[user_id][jd_name] = jd_data
+
+            # 등록 모드 정리
+            stored_jd[user_id].pop("_registration_mode", None)
+            stored_jd[user_id].pop("_pending_jd_name", None)
+
+    if not jd_data:
+        send_dm(user_id, "❌ 채용공고 분석에 실패했습니다. 다시 시도해주세요.", update_key="jd_status", final=True)
+        return False
+
+    # 파일로 저장
+    save_jd_data()
+
+    # JD 분석 결과 전송
+    blocks = create_jd_analysis_blocks(jd_data, jd_name)
+    send_dm(user_id, f"✅ **{jd_name}** JD가 성공적으로 등록되었습니다!", blocks=blocks,
+            update_key="jd_status", final=True)
+    return True
+
+def build_pdf_report(parsed_result, chart_image=None):
+    """분석 결과로 PDF 보고서 생성 (차트가 없으면 차트 캐시에서 가져오거나 새로 렌더링)"""
+    if chart_image is None:
+        skills_dict = parse_skills(parsed_result.get("skill_cards", {}).get("tech_skills", ""))
+        if skills_dict:
+            chart_image = create_plotly_radar_chart(skills_dict)
+    return create_pdf_report(parsed_result, chart_image)
+
+def build_pdf_once(user_id, analysis_id, parsed_result, chart_image=None):
+    """같은 분석의 PDF는 한 번만 생성 - 이미 생성 중이면 끝날 때까지 기다렸다가 그 결과를 사용"""
+    key = (user_id, analysis_id)
+    with pdf_builds_lock:
+        build_done = pdf_builds_in_flight.get(key)
+        is_owner = build_done is None
+        if is_owner:
+            build_done = pdf_builds_in_flight[key] = threading.Event()
+
+    if not is_owner:
+        build_done.wait(PDF_BUILD_WAIT_SECONDS)
+        return pdf_artifacts.get(user_id, analysis_id)
+
+    try:
+        pdf_bytes = pdf_artifacts.get(user_id, analysis_id)
+        if pdf_bytes is None and parsed_result is not None:
+            pdf_bytes = build_pdf_report(parsed_result, chart_image)
+            if pdf_bytes:
+                pdf_artifacts.set(user_id, analysis_id, pdf_bytes)
+        return pdf_bytes
+    finally:
+        with pdf_builds_lock:
+            pdf_builds_in_flight.pop(key, None)
+        build_done.set()
+
+def prebuild_pdf_report(user_id, analysis_id, parsed_result, chart_image=None):
+    """분석 완료 직후 PDF를 미리 생성해 두어 다운로드 버튼은 업로드만 하도록 함"""
+    if not PDF_PREBUILD_ENABLED or pdf_artifacts.get(user_id, analysis_id) is not None:
+        return None
+    try:
+        started_at = time.time()
+        pdf_bytes = build_pdf_once(user_id, analysis_id, parsed_result, chart_image)
+        if pdf_bytes:
+            logging.info(f"PDF 보고서 사전 생성 완료 - user: {user_id}, analysis: {analysis_id[:12]}, "
+                         f"{len(pdf_bytes)} bytes, 소요: {time.time() - started_at:.2f}s")
+        return pdf_bytes
+    except Exception as e:
+        # 사전 생성 실패는 무시 - 버튼을 누르면 그때 다시 생성
+        logging.error(f"PDF 보고서 사전 생성 실패: {str(e)}", exc_info=True)
+        return None
+
+def send_pdf_report(user_id, analysis_id=None):
+    """분석 결과 PDF 보고서를 DM으로 업로드 (미리 생성된 PDF가 있으면 그대로 사용)"""
     try:
-        results = notion.databases.query(
-            database_id=NOTION_DATABASE_ID
+        if not analysis_id:
+            send_dm(user_id, "❌ 분석 결과가 만료되었습니다. 이력서를 다시 분석해주세요.")
+            return False
+
+        pdf_bytes = pdf_artifacts.get(user_id, analysis_id)
+        if pdf_bytes is not None:
+            logging.info(f"사전 생성된 PDF 사용 - user: {user_id}, analysis: {analysis_id[:12]}")
+        else:
+            # 사전 생성본이 없거나 만료된 경우 분석 결과로 새로 생성 (사전 생성 중이면 그 결과를 기다림)
+            parsed_result = analysis_cache.get(analysis_id)
+            pdf_bytes = build_pdf_once(user_id, analysis_id, parsed_result)
+            if pdf_bytes is None and parsed_result is None:
+                send_dm(user_id, "❌ 분석 결과가 만료되었습니다. 이력서를 다시 분석해주세요.")
+                return False
+            if not pdf_bytes:
+                send_dm(user_id, "❌ PDF 생성에 실패했습니다.")
+                return False
+
+        # DM 채널 ID 가져오기
+        dm_channel_id = get_dm_channel_id(user_id)
+        if not dm_channel_id:
+            send_dm(user_id, "❌ DM 채널 정보를 가져올 수 없습니다.")
+            return False
+
+        # PDF 업로드 (메모리의 바이트를 바로 전송)
+        upload_response = client.files_upload_v2(
+            channel=dm_channel_id,
+            title="이력서 분석 보고서",
+            filename="resume_analysis_report.pdf",
+            content=pdf_bytes,
+            initial_comment="📊 이력서 분석 보고서가 생성되었습니다!"
         )
-        return results.get('results', [])
+
+        if upload_response.get("file"):
+            logging.info("PDF report uploaded successfully")
+        return True
+
     except Exception as e:
-        logging.error(f"Notion DB 조회 중 오류 발생: {str(e)}")
-        return []
+        logging.error(f"PDF generation error: {str(e)}")
+        send_dm(user_id, f"❌ PDF 생성 중 오류가 발생했습니다: {str(e)}")
+        return False
+
+def process_market_modal(view_id, user_id=None):
+    """시장 데이터를 스크래핑/분석하여 로딩 모달을 결과 모달로 교체"""
+    try:
+        logging.info("백그라운드 시장 인텔리전스 데이터 처리 시작")
+
+        # 실제 스크래핑 시도
+        try:
+            scraped_jobs = scrape_wanted_jobs()
+            if scraped_jobs and len(scraped_jobs) > 0:
+                logging.info(f"실제 스크래핑 성공: {len(scraped_jobs)}개 공고")
+                analyzed_data = analyze_scraped_data(scraped_jobs)
+                data_source = "실시간 데이터"
+            else:
+                logging.warning("스크래핑 결과 없음, 목업 데이터 사용")
+                analyzed_data = get_mock_data()
+                data_source = "데모 데이터"
+        except Exception as e:
+            logging.error(f"스크래핑 실패: {str(e)}")
+            analyzed_data = get_mock_data()
+            data_source = "데모 데이터"
+
+        # 시장 인텔리전스 모달 생성
+        skill_distribution = get_skill_distribution(analyzed_data)
+        chart_pending = bool(user_id and skill_distribution)
+        market_modal = create_market_intelligence_modal_with_data(analyzed_data, data_source, chart_pending=chart_pending)
+
+        # 모달 업데이트
+        update_response = client.views_update(
+            view_id=view_id,
+            view=market_modal
+        )
+
+        if update_response.get("ok"):
+            logging.info("시장 인텔리전스 모달 업데이트 성공")
+        else:
+            logging.error(f"모달 업데이트 실패: {update_response}")
+
+        # 기술스택 분포 차트는 모달과 별도로 생성하여 DM 전송
+        if chart_pending:
+            enqueue_market_chart(user_id, skill_distribution, data_source)
+
+    except Exception as e:
+        logging.error(f"백그라운드 시장 인텔리전스 처리 오류: {str(e)}", exc_info=True)
+
+        # 에러 모달 표시
+        error_modal = {
+            "type": "modal",
+            "callback_id": "market_error",
+            "title": {
+                "type": "plain_text",
+                "text": "❌ 오류 발생"
+            },
+            "blocks": [
+                {
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": f"*시장 인텔리전스 생성 중 오류가 발생했습니다.*\n\n```{str(e)}```\n\n잠시 후 다시 시도해주세요."
+                    }
+                }
+            ],
+            "close": {
+                "type": "plain_text",
+                "text": "닫기"
+            }
+        }
+
+        try:
+            client.views_update(view_id=view_id, view=error_modal)
+        except:
+            pass
+
+def refresh_market_modal(user_id, view_id, view_hash=None):
+    """새로고침 버튼 - 강제 스크래핑 후 열려 있는 모달 업데이트"""
+    try:
+        # 업데이트된 Modal 생성 (강제 스크래핑 실행)
+        updated_modal = create_market_intelligence_modal(force_scraping=True, user_id=user_id)
+
+        # Modal 업데이트
+        response = client.views_update(
+            view_id=view_id,
+            hash=view_hash,
+            view=updated_modal
+        )
+
+        if response.get("ok"):
+            logging.info("Market intelligence modal refreshed successfully")
+            send_dm(user_id, "✅ 최신 채용 시장 데이터로 업데이트 완료!")
+        else:
+            logging.error(f"Failed to refresh modal: {response}")
+            send_dm(user_id, "❌ 데이터 새로고침에 실패했습니다.")
+
+    except Exception as e:
+        logging.error(f"Market data refresh error: {str(e)}")
+        send_dm(user_id, f"❌ 데이터 새로고침 중 오류가 발생했습니다: {str(e)}")
+
+def run_analysis_job(payload):
+    """작업 처리: 이력서 분석 (+ 선택된 JD 매칭)"""
+    perform_complete_analysis(payload["user_id"], payload["file_url"], payload.get("jd_name"))
+
+def run_multi_jd_job(payload):
+    """작업 처리: 등록된 모든 JD와 비교 분석"""
+    perform_multi_jd_analysis(payload["user_id"], payload["file_url"])
+
+def run_register_jd_job(payload):
+    """작업 처리: JD 분석 및 등록"""
+    register_jd(payload["user_id"], payload["jd_name"], payload["jd_content"])
+
+def run_build_pdf_job(payload):
+    """작업 처리: PDF 보고서 생성 및 업로드"""
+    send_pdf_report(payload["user_id"], payload.get("analysis_id"))
+
+def get_skill_distribution(market_data):
+    """시장 분석 결과에서 기술스택별 공고 수 추출 (스크래핑 결과/목업 데이터 형식 모두 지원)"""
+    if market_data.get("skill_distribution"):
+        return dict(market_data["skill_distribution"])
+    distribution = {}
+    for skill in market_data.get("skills", []):
+        distribution[skill.get("name", "")] = skill.get("companies_using", 0)
+    for skill in market_data.get("hot_skills", []):
+        distribution[skill.get("skill", "")] = skill.get("companies", 0)
+    return {name: count for name, count in distribution.items() if name and count}
+
+def enqueue_market_chart(user_id, skill_distribution, data_source):
+    """기술스택 분포 차트 생성/전송 작업 등록 (같은 스냅샷의 중복 요청은 하나로)"""
+    snapshot_key = make_cache_key(skill_distribution)[:16]
+    job_queue.enqueue(
+        JOB_MARKET_CHART,
+        {"user_id": user_id, "skill_distribution": skill_distribution, "data_source": data_source},
+        dedupe_key=f"{JOB_MARKET_CHART}:{user_id}:{snapshot_key}"
+    )
+
+def send_market_chart(user_id, skill_distribution, data_source):
+    """기술스택 분포 차트를 그려(스냅샷별 캐시) 요청자에게 DM 전송"""
+    chart_bytes = get_skill_distribution_chart(skill_distribution, title=f"기술스택 분포 ({data_source})")
+    if not chart_bytes:
+        send_dm(user_id, "❌ 기술스택 분포 차트 생성에 실패했습니다.")
+        return False
+
+    dm_channel_id = get_dm_channel_id(user_id)
+    if not dm_channel_id:
+        return False
+
+    file_id = upload_image_to_slack(chart_bytes, "기술스택 분포 차트", dm_channel_id)
+    if not file_id:
+        send_dm(user_id, "❌ 기술스택 분포 차트 업로드에 실패했습니다.")
+        return False
+    return True
+
+def run_market_job(payload):
+    """작업 처리: 시장 인텔리전스 모달 생성/새로고침"""
+    if payload.get("refresh"):
+        refresh_market_modal(payload["user_id"], payload["view_id"], payload.get("view_hash"))
+    else:
+        process_market_modal(payload["view_id"], payload.get("user_id"))
+
+def run_market_chart_job(payload):
+    """작업 처리: 기술스택 분포 차트 생성 및 DM 전송"""
+    send_market_chart(payload["user_id"], payload["skill_distribution"], payload["data_source"])
 
+def run_notion_sync_job(payload):
+    """작업 처리: Notion 미러 전체 재동기화 후 결과 DM 전송"""
+    try:
+        result = notion_mirror.sync(full=True)
+    except Exception as e:
+        send_dm(payload["user_id"], f"❌ Notion 동기화에 실패했습니다: {str(e)}")
+        return
+    send_dm(payload["user_id"],
+            f"✅ Notion 동기화 완료 - 이력서 {result['total']}건 "
+            f"(갱신 {result['upserted']}건, 파싱 실패 {result['skipped']}건, 삭제 {result['removed']}건, "
+            f"{result['seconds']}초)")
+
+# Modal 대시보드 관련 함수들 추가
 def parse_notion_resume_data(notion_pages):
-    """Notion 페이지 데이터를 파싱하여 대시보드용 데이터로 변환"""
-    parsed_data = []
-    
+    """Notion 페이지 데이터를 파싱하여 대시보드용 데이터로 변환
+
+    페이지 스트림(iter_database_pages 등)을 하나씩 소비하며 파싱 결과를 바로 내보내는 제너레이터
+    """
     for page in notion_pages:
         try:
             properties = page.get('properties', {})
@@ -2627,7 +2916,7 @@ def parse_notion_resume_data(notion_pages):
             # 분석 일시
             created_time = page.get('created_time', '')
             
-            parsed_data.append({
+            yield {
                 'id': page['id'],
                 'name': name,
                 'years': years,
@@ -2638,13 +2927,11 @@ def parse_notion_resume_data(notion_pages):
                 'tech_skills': tech_skills,
                 'created_time': created_time,
                 'notion_url': f"https://www.notion.so/{page['id'].replace('-', '')}"
-            })
+            }
             
         except Exception as e:
             logging.error(f"페이지 파싱 중 오류: {str(e)}")
             continue
-    
-    return parsed_data
 
 def create_dashboard_modal():
     """대시보드 Modal UI 생성"""
@@ -2844,56 +3131,37 @@ def create_dashboard_modal():
         }
     }
 
-def apply_filters(data, job_filter="all", years_filter="all", sort_filter="latest"):
-    """필터링 및 정렬 적용"""
-    filtered_data = data.copy()
-    
-    # 직무 필터
-    if job_filter != "all":
-        job_mapping = {
-            "developer": "개발자",
-            "pm": "PM/기획자", 
-            "designer": "디자이너",
-            "hr": "HR/채용",
-            "marketing": "마케팅"
-        }
-        target_job = job_mapping.get(job_filter, job_filter)
-        filtered_data = [item for item in filtered_data if item['job_category'] == target_job]
-    
-    # 경력 필터
-    if years_filter != "all":
-        if years_filter == "0-1":
-            filtered_data = [item for item in filtered_data if item['years'] <= 1]
-        elif years_filter == "2-3":
-            filtered_data = [item for item in filtered_data if 2 <= item['years'] <= 3]
-        elif years_filter == "4-6":
-            filtered_data = [item for item in filtered_data if 4 <= item['years'] <= 6]
-        elif years_filter == "7+":
-            filtered_data = [item for item in filtered_data if item['years'] >= 7]
-    
-    # 정렬
-    if sort_filter == "latest":
-        filtered_data.sort(key=lambda x: x['created_time'], reverse=True)
-    elif sort_filter == "matching_desc":
-        filtered_data.sort(key=lambda x: x['matching_score'], reverse=True)
-    elif sort_filter == "years_desc":
-        filtered_data.sort(key=lambda x: x['years'], reverse=True)
-    elif sort_filter == "name":
-        filtered_data.sort(key=lambda x: x['name'])
+def get_dashboard_query(job_filter="all", years_filter="all", sort_filter="latest"):
+    """대시보드 필터/정렬 선택값을 미러 쿼리 조건으로 변환"""
+    job_mapping = {
+        "developer": "개발자",
+        "pm": "PM/기획자", 
+        "designer": "디자이너",
+        "hr": "HR/채용",
+        "marketing": "마케팅"
+    }
+    years_ranges = {
+        "0-1": (None, 1),
+        "2-3": (2, 3),
+        "4-6": (4, 6),
+        "7+": (7, None)
+    }
     
-    return filtered_data
+    min_years, max_years = years_ranges.get(years_filter, (None, None))
+    return {
+        "job_category": job_mapping.get(job_filter, job_filter) if job_filter != "all" else None,
+        "min_years": min_years,
+        "max_years": max_years,
+        "sort": sort_filter,
+        "limit": DASHBOARD_PAGE_SIZE
+    }
 
-def create_dashboard_chart(data):
-    """대시보드용 차트 생성"""
-    if not data:
+def create_dashboard_chart(matching_scores):
+    """대시보드용 차트 생성 (필터 결과의 매칭률 목록으로 분포 히스토그램)"""
+    if not matching_scores:
         return None
         
     try:
-        # 매칭률 분포 히스토그램 생성
-        matching_scores = [item['matching_score'] for item in data if item['matching_score'] > 0]
-        
-        if not matching_scores:
-            return None
             
         fig = go.Figure()
         fig.add_trace(go.Histogram(
@@ -2910,22 +3178,22 @@ def create_dashboard_chart(data):
             yaxis_title="인원 수",
             width=800,
             height=400,
-            font=dict(family="Malgun Gothic", size=12),
+            font=dict(family=font_service.plotly_font_family(), size=12),
             paper_bgcolor='white',
             plot_bgcolor='white',
             showlegend=False
         )
         
-        # PNG로 변환
-        img_bytes = fig.to_image(format="png")
+        # PNG로 변환 (상주 내보내기 엔진 사용)
+        img_bytes = export_image(fig, format="png")
         return img_bytes
         
     except Exception as e:
         logging.error(f"차트 생성 중 오류: {str(e)}")
         return None
 
-def create_filtered_results_blocks(data, total_count):
-    """필터링된 결과를 Slack 블록으로 변환"""
+def create_filtered_results_blocks(dashboard):
+    """필터링된 결과(notion_mirror.dashboard() 결과)를 Slack 블록으로 변환"""
     blocks = []
     
     # 요약 섹션
@@ -2934,7 +3202,7 @@ def create_filtered_results_blocks(data, total_count):
             "type": "section",
             "text": {
                 "type": "mrkdwn",
-                "text": f"📋 *검색 결과: {len(data)}명* (전체 {total_count}명 중)"
+                "text": f"📋 *검색 결과: {dashboard['count']}명* (전체 {dashboard['total']}명 중)"
             }
         },
         {
@@ -2942,20 +3210,13 @@ def create_filtered_results_blocks(data, total_count):
         }
     ])
     
-    # 통계 요약
-    if data:
-        avg_years = sum(item['years'] for item in data) / len(data)
-        avg_matching = sum(item['matching_score'] for item in data if item['matching_score'] > 0)
-        if avg_matching > 0:
-            avg_matching = avg_matching / len([item for item in data if item['matching_score'] > 0])
+    # 통계 요약 (집계는 쿼리에서 계산됨)
+    if dashboard['count']:
+        avg_years = dashboard['avg_years']
+        avg_matching = dashboard['avg_matching'] or 0
         
         # 직무별 분포
-        job_counts = {}
-        for item in data:
-            job = item['job_category']
-            job_counts[job] = job_counts.get(job, 0) + 1
-        
-        job_summary = ", ".join([f"{job}: {count}명" for job, count in job_counts.items()])
+        job_summary = ", ".join([f"{job}: {count}명" for job, count in dashboard['job_counts']])
         
         blocks.extend([
             {
@@ -2983,8 +3244,8 @@ def create_filtered_results_blocks(data, total_count):
             }
         ])
     
-    # 개별 이력서 목록 (최대 10개)
-    for i, item in enumerate(data[:10]):
+    # 개별 이력서 목록 (쿼리에서 가져온 상위 DASHBOARD_PAGE_SIZE명)
+    for i, item in enumerate(dashboard['items']):
         matching_emoji = "🟢" if item['matching_score'] >= 80 else "🟡" if item['matching_score'] >= 60 else "🔴" if item['matching_score'] > 0 else "⚪"
         
         blocks.append({
@@ -3007,13 +3268,13 @@ def create_filtered_results_blocks(data, total_count):
         })
     
     # 더 많은 결과가 있는 경우
-    if len(data) > 10:
+    if dashboard['count'] > len(dashboard['items']):
         blocks.append({
             "type": "context",
             "elements": [
                 {
                     "type": "mrkdwn",
-                    "text": f"... 외 {len(data) - 10}명 더 있습니다."
+                    "text": f"... 외 {dashboard['count'] - len(dashboard['items'])}명 더 있습니다."
                 }
             ]
         })
@@ -3099,77 +3360,12 @@ def slack_commands():
                 view_id = response["view"]["id"]
                 logging.info(f"로딩 모달 열기 성공, view_id: {view_id}")
                 
-                # 백그라운드에서 실제 데이터 처리
-                def process_market_modal():
-                    try:
-                        logging.info("백그라운드 시장 인텔리전스 데이터 처리 시작")
-                        
-                        # 실제 스크래핑 시도
-                        try:
-                            scraped_jobs = scrape_wanted_jobs()
-                            if scraped_jobs and len(scraped_jobs) > 0:
-                                logging.info(f"실제 스크래핑 성공: {len(scraped_jobs)}개 공고")
-                                analyzed_data = analyze_scraped_data(scraped_jobs)
-                                data_source = "실시간 데이터"
-                            else:
-                                logging.warning("스크래핑 결과 없음, 목업 데이터 사용")
-                                analyzed_data = get_mock_data()
-                                data_source = "데모 데이터"
-                        except Exception as e:
-                            logging.error(f"스크래핑 실패: {str(e)}")
-                            analyzed_data = get_mock_data()
-                            data_source = "데모 데이터"
-                        
-                        # 시장 인텔리전스 모달 생성
-                        market_modal = create_market_intelligence_modal_with_data(analyzed_data, data_source)
-                        
-                        # 모달 업데이트
-                        update_response = client.views_update(
-                            view_id=view_id,
-                            view=market_modal
-                        )
-                        
-                        if update_response.get("ok"):
-                            logging.info("시장 인텔리전스 모달 업데이트 성공")
-                        else:
-                            logging.error(f"모달 업데이트 실패: {update_response}")
-                            
-                    except Exception as e:
-                        logging.error(f"백그라운드 시장 인텔리전스 처리 오류: {str(e)}", exc_info=True)
-                        
-                        # 에러 모달 표시
-                        error_modal = {
-                            "type": "modal",
-                            "callback_id": "market_error",
-                            "title": {
-                                "type": "plain_text",
-                                "text": "❌ 오류 발생"
-                            },
-                            "blocks": [
-                                {
-                                    "type": "section",
-                                    "text": {
-                                        "type": "mrkdwn",
-                                        "text": f"*시장 인텔리전스 생성 중 오류가 발생했습니다.*\n\n```{str(e)}```\n\n잠시 후 다시 시도해주세요."
-                                    }
-                                }
-                            ],
-                            "close": {
-                                "type": "plain_text",
-                                "text": "닫기"
-                            }
-                        }
-                        
-                        try:
-                            client.views_update(view_id=view_id, view=error_modal)
-                        except:
-                            pass
-                
-                # 백그라운드 스레드 시작
-                import threading
-                thread = threading.Thread(target=process_market_modal)
-                thread.daemon = True
-                thread.start()
+                # 백그라운드 작업으로 실제 데이터 처리
+                job_queue.enqueue(
+                    JOB_REFRESH_MARKET,
+                    {"user_id": user_id, "view_id": view_id},
+                    dedupe_key=f"{JOB_REFRESH_MARKET}:{view_id}"
+                )
                 
                 return "", 200
                 
@@ -3319,19 +3515,17 @@ def create_market_intelligence_modal(force_scraping=False, user_id=None):
                         f"🔥 인기 포지션: {', '.join(company['hot_positions'][:2])}"
             }
         })
-    # 기술스택 분포 차트 생성 및 DM 전송 (안전성을 위해 비활성화)
-    try:
-        logging.info("차트 생성 시작")
-        # 차트 생성을 비활성화하여 안정성 확보
-        # TODO: 차트 기능은 별도 스레드나 비동기로 처리 필요
-        logging.info("차트 생성 완료 (안정성을 위해 비활성화됨)")
-    except Exception as e:
-        logging.error(f"기술스택 차트 생성/업로드 오류: {str(e)}", exc_info=True)
-    # 모달에 안내 텍스트 block 추가
-    blocks.append({
-        "type": "section",
-        "text": {"type": "mrkdwn", "text": "🔥 *기술스택 분포 차트는 DM(Direct Message)으로 전송되었습니다.*"}
-    })
+    # 기술스택 분포 차트는 작업 큐에서 생성하여 DM 전송 (모달은 기다리지 않음)
+    skill_distribution = get_skill_distribution(data)
+    if user_id and skill_distribution:
+        try:
+            enqueue_market_chart(user_id, skill_distribution, "실시간 데이터" if force_scraping else "Demo 데이터")
+            blocks.append({
+                "type": "section",
+                "text": {"type": "mrkdwn", "text": "🔥 *기술스택 분포 차트는 잠시 후 DM(Direct Message)으로 전송됩니다.*"}
+            })
+        except Exception as e:
+            logging.error(f"기술스택 차트 작업 등록 오류: {str(e)}", exc_info=True)
     # 핫한 기술스택
     blocks.append({"type": "divider"})
     blocks.append({
@@ -3702,6 +3896,7 @@ def analyze_scraped_data(jobs_data):
         "last_updated": "2025-06-16 14:35",
         "companies": companies_data,
         "skills": skills_data,
+        "skill_distribution": dict(skill_counts.most_common(MARKET_CHART_TOP_SKILLS)),
         "insights": generate_insights(jobs_data, skill_counts, company_counts)
     }
 
@@ -3965,7 +4160,7 @@ def test_plotly_chart_generation():
         fig.update_layout(title='테스트 차트', width=400, height=300)
         
         # PNG로 변환 테스트
-        img_bytes = fig.to_image(format="png")
+        img_bytes = export_image(fig, format="png")
         
         logging.info(f"차트 생성 성공! 이미지 크기: {len(img_bytes)} bytes")
         logging.info("=== Plotly 차트 생성 테스트 완료 ===")
@@ -4081,7 +4276,7 @@ def create_dashboard_text(data, user_id=None):
         logging.error(f"텍스트 대시보드 생성 오류: {str(e)}", exc_info=True)
         return f"❌ 대시보드 생성 중 오류가 발생했습니다: {str(e)}"
 
-def create_market_intelligence_modal_with_data(data, data_source="실시간 데이터"):
+def create_market_intelligence_modal_with_data(data, data_source="실시간 데이터", chart_pending=False):
     """실제 데이터로 채용 시장 인텔리전스 모달 생성"""
     try:
         logging.info(f"모달 생성 시작 - 데이터 소스: {data_source}")
@@ -4181,6 +4376,17 @@ def create_market_intelligence_modal_with_data(data, data_source="실시간 데
                 }
             })
         
+        if chart_pending:
+            blocks.append({
+                "type": "context",
+                "elements": [
+                    {
+                        "type": "mrkdwn",
+                        "text": "📊 기술스택 분포 차트는 잠시 후 DM으로 전송됩니다."
+                    }
+                ]
+            })
+        
         # 시장 인사이트
         blocks.extend([
             {
@@ -4263,11 +4469,30 @@ def create_market_intelligence_modal_with_data(data, data_source="실시간 데
             }
         }
 
+# 서버 자원 생성 + 작업 유형별 처리 함수 등록
+# (resume_extractor의 spawn 워커는 이 파일을 __mp_main__으로 다시 실행하므로 그때는 건너뜀 -
+#  워커마다 폰트 탐색, SQLite 열기, Notion 미러 색인을 반복하지 않도록)
+if __name__ != "__mp_main__":
+    init_services()
+    job_queue.register_handler(JOB_ANALYZE_RESUME, run_analysis_job)
+    job_queue.register_handler(JOB_MATCH_JD, run_analysis_job)
+    job_queue.register_handler(JOB_MATCH_ALL_JDS, run_multi_jd_job)
+    job_queue.register_handler(JOB_REGISTER_JD, run_register_jd_job)
+    job_queue.register_handler(JOB_BUILD_PDF, run_build_pdf_job)
+    job_queue.register_handler(JOB_REFRESH_MARKET, run_market_job)
+    job_queue.register_handler(JOB_MARKET_CHART, run_market_chart_job)
+    job_queue.register_handler(JOB_NOTION_SYNC, run_notion_sync_job)
+
 if __name__ == "__main__":
     # 서버 시작 전에 권한 테스트
     test_slack_permissions()
     
-    # 차트 기능은 안정성을 위해 비활성화
-    logging.info("📊 차트 기능은 안정성을 위해 현재 비활성화되어 있습니다")
+    # 이전 실행에서 남은 작업 처리 시작 (debug 리로더의 감시 프로세스에서는 실행하지 않음)
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        job_queue.start()
+        # Notion 미러 증분 동기화 시작 (대시보드/검색용)
+        notion_mirror.start()
+        # Plotly 내보내기 엔진 미리 띄우기 (첫 차트 요청의 시작 지연 제거)
+        plotly_exporter.warm_up()
     
     app.run(debug=True, port=5000)
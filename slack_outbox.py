@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+Slack 메시지 발송 스케줄러
+send_dm 등 봇이 보내는 메시지를 채널별 큐에 넣고 워커 스레드가 순서대로 발송합니다.
+- 채널당 초당 1건 간격을 지키고, 메서드별(chat.postMessage / chat.update) 토큰 버킷으로 전체 호출량을 제한하며
+- 429 응답의 Retry-After 동안 해당 메서드 발송을 멈췄다가 같은 메시지를 다시 보내고
+- 같은 채널에 연달아 쌓인 메시지는 한 번의 chat.postMessage로 합치고,
+  update_key가 같은 상태 메시지는 새로 올리지 않고 chat.update로 이전 메시지를 고칩니다.
+  (SLACK_UPDATE_TARGET_TTL보다 오래된 상태 메시지는 대화 위로 밀려 있으므로 새 메시지로 올립니다)
+
+대기 큐는 프로세스 메모리에만 있습니다. 정상 종료 시에는 shutdown_flush_timeout 동안 남은 메시지를
+발송하지만, 강제 종료/크래시 시 아직 보내지 않은 메시지는 유실됩니다.
+"""
+
+import os
+import time
+import atexit
+import logging
+import threading
+from collections import deque, OrderedDict
+
+import metrics
+from llm_gateway import TokenBucket
+
+SLACK_OUTBOX_WORKERS = int(os.getenv("SLACK_OUTBOX_WORKERS", "4"))  # 동시에 발송할 채널 수
+SLACK_COALESCE_WINDOW = float(os.getenv("SLACK_COALESCE_WINDOW", "0.3"))  # 같은 채널 메시지를 모으는 대기 시간 (초)
+SLACK_CHANNEL_INTERVAL = float(os.getenv("SLACK_CHANNEL_INTERVAL", "1.0"))  # 채널당 메시지 최소 간격 (초)
+# 메서드별 분당 호출 수 (Slack rate limit tier 기준)
+METHOD_RATE_LIMITS = {
+    "chat.postMessage": int(os.getenv("SLACK_POST_MESSAGE_RPM", "120")),
+    "chat.update": int(os.getenv("SLACK_UPDATE_RPM", "50")),
+}
+MAX_BLOCKS_PER_MESSAGE = 50  # Slack 메시지당 블록 수 상한
+MAX_MERGED_TEXT_LENGTH = 3000  # 합친 메시지 텍스트 / section 블록 텍스트 상한
+DEFAULT_RETRY_AFTER = 1.0  # Retry-After 헤더가 없을 때 대기 시간 (초)
+MAX_UPDATE_TARGETS = 1000  # 기억해 둘 상태 메시지(update_key) 수
+SLACK_UPDATE_TARGET_TTL = float(os.getenv("SLACK_UPDATE_TARGET_TTL", "300"))  # 이 시간(초)이 지난 상태 메시지는 고치지 않고 새로 발송
+SLACK_OUTBOX_SHUTDOWN_TIMEOUT = float(os.getenv("SLACK_OUTBOX_SHUTDOWN_TIMEOUT", "10"))  # 종료 시 남은 메시지 발송 대기 시간 (초)
+
+_queue_depth = metrics.gauge("slack_outbox_queue_depth", "발송 대기 중인 Slack 메시지 수")
+_messages_total = metrics.counter("slack_outbox_messages_total", "발송 스케줄러가 처리한 메시지 수")
+_api_calls_total = metrics.counter("slack_outbox_api_calls_total", "발송 스케줄러의 Slack API 호출 수")
+_rate_limited_total = metrics.counter("slack_outbox_rate_limited_total", "Retry-After로 발송을 미룬 횟수")
+
+
+class _ChannelQueue:
+    """채널 하나의 대기 메시지와 발송 간격 상태"""
+
+    __slots__ = ("messages", "next_send_at", "busy")
+
+    def __init__(self):
+        self.messages = deque()
+        self.next_send_at = 0.0
+        self.busy = False
+
+
+def _mergeable(message):
+    """다른 메시지와 합칠 수 있는지 (첨부/상태 메시지나 블록으로 바꿀 수 없는 긴 텍스트는 단독 발송)"""
+    if message["attachments"] or message["update_key"]:
+        return False
+    return bool(message["blocks"]) or len(message["text"]) <= MAX_MERGED_TEXT_LENGTH
+
+
+def _as_blocks(message):
+    if message["blocks"]:
+        return list(message["blocks"])
+    return [{"type": "section", "text": {"type": "mrkdwn", "text": message["text"]}}]
+
+
+def _merged_payload(batch):
+    """여러 메시지를 하나의 chat.postMessage 본문으로 합침"""
+    text = "\n\n".join(message["text"] for message in batch if message["text"])
+    if not any(message["blocks"] for message in batch):
+        return {"text": text}
+    return {"text": text[:MAX_MERGED_TEXT_LENGTH],
+            "blocks": [block for message in batch for block in _as_blocks(message)]}
+
+
+class OutboundScheduler:
+    """채널별 큐 + 메서드별 토큰 버킷으로 Slack 메시지를 발송"""
+
+    def __init__(self, transport, workers=SLACK_OUTBOX_WORKERS, coalesce_window=SLACK_COALESCE_WINDOW,
+                 channel_interval=SLACK_CHANNEL_INTERVAL, method_rate_limits=None,
+                 update_target_ttl=SLACK_UPDATE_TARGET_TTL, shutdown_flush_timeout=SLACK_OUTBOX_SHUTDOWN_TIMEOUT):
+        self.transport = transport
+        self.workers = workers
+        self.coalesce_window = coalesce_window
+        self.channel_interval = channel_interval
+        self.update_target_ttl = update_target_ttl
+
+        limits = method_rate_limits or METHOD_RATE_LIMITS
+        self._buckets = {method: TokenBucket(rpm, rpm / 60.0) for method, rpm in limits.items()}
+        self._blocked_until = {}  # method -> Retry-After가 끝나는 monotonic 시각
+        self._channels = {}  # channel -> _ChannelQueue
+        self._update_targets = OrderedDict()  # (channel, update_key) -> (채널 ID, ts, 발송 monotonic 시각)
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._threads = []
+        if shutdown_flush_timeout:
+            # 워커는 daemon 스레드라 종료 시 남은 메시지를 먼저 발송 (제한 시간 안에서)
+            atexit.register(self.flush, timeout=shutdown_flush_timeout)
+
+    def post(self, channel, text, blocks=None, attachments=None, update_key=None, final=False):
+        """메시지 발송 예약 (바로 반환) - update_key가 있으면 같은 키의 이전 메시지를 수정,
+        final=True면 이 메시지로 상태 메시지를 마무리하고 이후 같은 키는 새 메시지로 발송"""
+        message = {
+            "text": text or "",
+            "blocks": blocks,
+            "attachments": attachments,
+            "update_key": update_key,
+            "final": final,
+            "queued_at": time.monotonic(),
+        }
+        with self._cond:
+            state = self._channels.get(channel)
+            if state is None:
+                state = self._channels[channel] = _ChannelQueue()
+            if update_key:
+                # 아직 보내지 않은 같은 키의 상태 메시지는 최신 것만 보냄 (마무리 메시지는 대체하지 않음)
+                superseded = []
+                for queued in reversed(state.messages):
+                    if queued["update_key"] == update_key:
+                        if queued["final"]:
+                            break
+                        superseded.append(queued)
+                for queued in superseded:
+                    state.messages.remove(queued)
+                    _messages_total.inc(result="superseded")
+                self._pending -= len(superseded)
+            state.messages.append(message)
+            self._pending += 1
+            _queue_depth.set(self._pending)
+            self._cond.notify()
+        self._start()
+
+    def flush(self, timeout=None):
+        """대기 중인 메시지가 모두 발송될 때까지 대기 - 시간 안에 끝나면 True"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while self._pending or any(state.busy for state in self._channels.values()):
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(timeout=remaining)
+        return True
+
+    def _start(self):
+        with self._cond:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._run, name=f"slack-outbox-{len(self._threads)}")
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+    def _take_batch(self):
+        """발송 가능한 채널의 메시지 묶음 (채널, 묶음, 다음 확인까지 대기 시간) - 잠금 안에서 호출"""
+        now = time.monotonic()
+        next_ready = None
+        for channel, state in list(self._channels.items()):
+            if state.busy:
+                continue
+            if not state.messages:
+                if state.next_send_at <= now:
+                    del self._channels[channel]
+                continue
+
+            ready_at = max(state.next_send_at, state.messages[0]["queued_at"] + self.coalesce_window)
+            if ready_at > now:
+                next_ready = ready_at if next_ready is None else min(next_ready, ready_at)
+                continue
+
+            batch = [state.messages.popleft()]
+            if _mergeable(batch[0]):
+                block_count = len(_as_blocks(batch[0]))
+                text_length = len(batch[0]["text"])
+                while state.messages and _mergeable(state.messages[0]):
+                    candidate = state.messages[0]
+                    block_count += len(_as_blocks(candidate))
+                    text_length += len(candidate["text"]) + 2
+                    if block_count > MAX_BLOCKS_PER_MESSAGE or text_length > MAX_MERGED_TEXT_LENGTH:
+                        break
+                    batch.append(state.messages.popleft())
+            state.busy = True
+            return channel, batch, None
+        return None, None, (next_ready - now if next_ready is not None else None)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                channel, batch, wait = self._take_batch()
+                while channel is None:
+                    self._cond.wait(timeout=wait)
+                    channel, batch, wait = self._take_batch()
+            self._send(channel, batch)
+
+    def _wait_for_method(self, method):
+        """Retry-After가 끝나고 메서드 토큰을 얻을 때까지 대기"""
+        while True:
+            with self._cond:
+                blocked_for = self._blocked_until.get(method, 0) - time.monotonic()
+            if blocked_for <= 0:
+                break
+            time.sleep(blocked_for)
+        bucket = self._buckets.get(method)
+        if bucket is not None:
+            bucket.acquire()
+
+    def _send(self, channel, batch):
+        update_key = batch[0]["update_key"]
+        with self._cond:
+            target = self._update_targets.get((channel, update_key)) if update_key else None
+            if target is not None and time.monotonic() - target[2] > self.update_target_ttl:
+                # 오래된 상태 메시지는 대화 위로 밀려 보이지 않으므로 새 메시지로 발송
+                del self._update_targets[(channel, update_key)]
+                target = None
+
+        if target is not None:
+            method = "chat.update"
+            payload = {"channel": target[0], "ts": target[1], "text": batch[0]["text"]}
+            if batch[0]["blocks"]:
+                payload["blocks"] = batch[0]["blocks"]
+        else:
+            method = "chat.postMessage"
+            payload = {"channel": channel, **_merged_payload(batch)}
+            if batch[0]["attachments"]:
+                payload["attachments"] = batch[0]["attachments"]
+
+        self._wait_for_method(method)
+        try:
+            result = self.transport.api_call(method, json=payload)
+        except Exception as e:
+            logging.error(f"Slack 메시지 발송 오류 ({method}, {channel}): {str(e)}")
+            result = {"ok": False, "error": type(e).__name__}
+        _api_calls_total.inc(method=method)
+
+        with self._cond:
+            state = self._channels.setdefault(channel, _ChannelQueue())
+            state.busy = False
+            error = result.get("error")
+
+            if error == "ratelimited":
+                # 같은 메시지를 맨 앞에 되돌려 두고 Retry-After 동안 해당 메서드 발송 중지
+                retry_after = result.get("retry_after") or DEFAULT_RETRY_AFTER
+                self._blocked_until[method] = time.monotonic() + retry_after
+                state.messages.extendleft(reversed(batch))
+                _rate_limited_total.inc(method=method)
+                logging.warning(f"Slack {method} rate limit - {retry_after}초 후 재시도")
+            elif not result.get("ok") and method == "chat.update":
+                # 고칠 메시지가 없어졌으면 새 메시지로 발송
+                self._update_targets.pop((channel, update_key), None)
+                state.messages.extendleft(reversed(batch))
+            else:
+                self._pending -= len(batch)
+                state.next_send_at = time.monotonic() + self.channel_interval
+                if result.get("ok"):
+                    _messages_total.inc(len(batch), result="sent")
+                    if len(batch) > 1:
+                        _messages_total.inc(len(batch) - 1, result="coalesced")
+                    if update_key and batch[0]["final"]:
+                        self._update_targets.pop((channel, update_key), None)
+                    elif update_key and method == "chat.postMessage":
+                        self._update_targets[(channel, update_key)] = (result.get("channel", channel), result.get("ts"),
+                                                                       time.monotonic())
+                        while len(self._update_targets) > MAX_UPDATE_TARGETS:
+                            self._update_targets.popitem(last=False)
+                else:
+                    _messages_total.inc(len(batch), result="failed")
+                    logging.error(f"Slack 메시지 발송 실패 ({method}, {channel}): {error}")
+
+            _queue_depth.set(self._pending)
+            self._cond.notify_all()
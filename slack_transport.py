@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Slack HTTP 전송 계층
+requests로 직접 부르던 Slack Web API 호출과 파일 다운로드가 모두 이 모듈을 거치도록 하여
+- 토큰별로 하나의 requests.Session(keep-alive 커넥션 풀)을 재사용하고
+- 연결/응답 타임아웃을 일관되게 적용하며
+- Slack 메서드별 지연 시간과 오류 수를 메트릭으로 기록합니다.
+slack_sdk WebClient 호출도 create_web_client()로 만든 클라이언트를 쓰면 같은 메트릭에 기록됩니다.
+"""
+
+import os
+import time
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
+
+import metrics
+
+SLACK_API_BASE = "https://slack.com/api/"
+SLACK_HTTP_POOL_SIZE = int(os.getenv("SLACK_HTTP_POOL_SIZE", "10"))  # 호스트별 유지할 keep-alive 연결 수
+SLACK_HTTP_CONNECT_TIMEOUT = float(os.getenv("SLACK_HTTP_CONNECT_TIMEOUT", "5"))  # 연결 타임아웃 (초)
+SLACK_HTTP_READ_TIMEOUT = float(os.getenv("SLACK_HTTP_READ_TIMEOUT", "30"))  # 응답 타임아웃 (초)
+SLACK_HTTP_CONNECT_RETRIES = 2  # 연결 실패만 재시도 (요청이 전송된 뒤에는 재시도하지 않음)
+SLACK_RATE_LIMIT_RETRIES = 2  # WebClient가 429 응답을 Retry-After 후 재시도하는 횟수
+
+_api_seconds = metrics.histogram("slack_api_seconds", "Slack API 호출 소요 시간 (초)")
+_api_errors = metrics.counter("slack_api_errors_total", "Slack API 호출 실패 횟수")
+
+
+def _record(method, started_at, status, error=None):
+    _api_seconds.observe(time.monotonic() - started_at, method=method, status=status)
+    if error:
+        _api_errors.inc(method=method, error=error)
+
+
+class SlackTransport:
+    """토큰 하나에 대한 풀링된 Slack HTTP 세션"""
+
+    def __init__(self, token, pool_size=SLACK_HTTP_POOL_SIZE,
+                 timeout=(SLACK_HTTP_CONNECT_TIMEOUT, SLACK_HTTP_READ_TIMEOUT)):
+        self.timeout = timeout
+        self.session = requests.Session()
+        # Content-Type은 요청마다 requests가 정함 (json= / files= 멀티파트)
+        self.session.headers["Authorization"] = f"Bearer {token}"
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size,
+                              max_retries=SLACK_HTTP_CONNECT_RETRIES)
+        self.session.mount("https://", adapter)
+
+    def api_call(self, method, http_method="POST", params=None, json=None, data=None, files=None, timeout=None):
+        """Slack Web API 호출 - 응답 JSON(dict) 반환 (JSON이 아니면 {"ok": False, "error": "http_<코드>"},
+        429면 error="ratelimited"와 retry_after(초) 포함)"""
+        started_at = time.monotonic()
+        try:
+            response = self.session.request(
+                http_method, SLACK_API_BASE + method,
+                params=params, json=json, data=data, files=files,
+                timeout=timeout or self.timeout
+            )
+        except requests.RequestException as e:
+            _record(method, started_at, "exception", type(e).__name__)
+            raise
+
+        try:
+            result = response.json()
+        except ValueError:
+            result = {"ok": False, "error": f"http_{response.status_code}"}
+        if response.status_code == 429:
+            # 호출 측(발송 스케줄러)이 Retry-After만큼 해당 메서드를 멈출 수 있도록 전달
+            result["error"] = "ratelimited"
+            result["retry_after"] = float(response.headers.get("Retry-After", "1"))
+
+        if result.get("ok"):
+            _record(method, started_at, "ok")
+        else:
+            _record(method, started_at, "error", result.get("error") or "unknown")
+            logging.warning(f"Slack API {method} 실패: {result.get('error')}")
+        return result
+
+    def download(self, url, timeout=None):
+        """비공개 파일(url_private*) 다운로드 - requests.Response 반환"""
+        started_at = time.monotonic()
+        try:
+            response = self.session.get(url, timeout=timeout or self.timeout)
+        except requests.RequestException as e:
+            _record("files.download", started_at, "exception", type(e).__name__)
+            raise
+
+        if response.status_code == 200:
+            _record("files.download", started_at, "ok")
+        else:
+            _record("files.download", started_at, "error", f"http_{response.status_code}")
+        return response
+
+
+class InstrumentedWebClient(WebClient):
+    """모든 API 호출 지연 시간을 slack_api_seconds에 기록하는 WebClient"""
+
+    def api_call(self, api_method, **kwargs):
+        started_at = time.monotonic()
+        try:
+            response = super().api_call(api_method, **kwargs)
+        except SlackApiError as e:
+            _record(api_method, started_at, "error", e.response.get("error") or "unknown")
+            raise
+        except Exception as e:
+            _record(api_method, started_at, "exception", type(e).__name__)
+            raise
+        _record(api_method, started_at, "ok")
+        return response
+
+
+_transports = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(token):
+    """토큰별로 하나의 SlackTransport(커넥션 풀)를 만들어 재사용"""
+    with _transports_lock:
+        transport = _transports.get(token)
+        if transport is None:
+            transport = SlackTransport(token)
+            _transports[token] = transport
+        return transport
+
+
+def create_web_client(token):
+    """메트릭이 기록되고 429 응답 시 Retry-After만큼 기다렸다 재시도하는 slack_sdk WebClient 생성"""
+    web_client = InstrumentedWebClient(token=token, timeout=int(SLACK_HTTP_READ_TIMEOUT))
+    web_client.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=SLACK_RATE_LIMIT_RETRIES))
+    return web_client
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DM 키워드 검색 인덱스 회귀 테스트
+- 예전 SQLite LIKE 검색(성명/강점 Top3/역량카드 요약에 검색어가 그대로 포함)으로 찾던 이력서를
+  BM25 인덱스도 모두 찾는지 확인합니다. (영문은 단어/점으로 나뉜 부분 단위라 java로 javascript를 찾지는 않음)
+- champion list/비트맵으로 구한 상위 k개가 모든 후보를 채점한 결과와 같은지 확인합니다.
+
+실행: python -m pytest test_search_index.py  또는  python test_search_index.py
+"""
+
+import os
+import re
+import sys
+import random
+import sqlite3
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+import search_index
+from search_index import ResumeSearchIndex
+
+CORPUS_SIZE = 5000
+LIKE_FIELDS = ("name", "strengths", "summary")  # 예전 LIKE 검색 대상 열
+
+EXTRA_DOCS = [
+    ("page-react", {"name": "김하늘", "strengths": "프론트엔드 성능 개선", "summary": "React.js 기반 대시보드 개발",
+                    "tech_skills": "React.js: 90%, TypeScript: 80%"}),
+    ("page-node", {"name": "이도윤", "strengths": "API 설계", "summary": "Node.js 백엔드 5년",
+                   "tech_skills": "Node.js: 80%"}),
+]
+
+PHRASE_QUERIES = ["김", "이", "React", "react", "node", "Node.js", "js", "데이터", "백엔드 개발자", "파이프라인",
+                  "엔지니어", "성능 최적화", "핀테크", "kafka", "c++", "머신러닝 모델", "엔드 개", "리딩"]
+
+_corpus = None
+
+
+def load_corpus():
+    """(doc_id, 필드) 목록과 색인된 인덱스 - 모듈 안에서 한 번만 구성"""
+    global _corpus
+    if _corpus is None:
+        docs = search_index._synthetic_resumes(CORPUS_SIZE) + EXTRA_DOCS
+        index = ResumeSearchIndex()
+        for start in range(0, len(docs), 100):
+            index.add_many(docs[start:start + 100])
+        _corpus = docs, index
+    return _corpus
+
+
+def like_search(docs, query):
+    """예전 미러 검색과 같은 LIKE 조건으로 찾은 doc_id 집합"""
+    conn = sqlite3.connect(":memory:")
+    conn.execute(f"CREATE TABLE resumes (page_id TEXT, {', '.join(LIKE_FIELDS)})")
+    conn.executemany("INSERT INTO resumes VALUES (?, ?, ?, ?)",
+                     [(doc_id, *(fields[name] for name in LIKE_FIELDS)) for doc_id, fields in docs])
+    pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    where = " OR ".join(f"{name} LIKE ? ESCAPE '\\'" for name in LIKE_FIELDS)
+    rows = conn.execute(f"SELECT page_id FROM resumes WHERE {where}", [pattern] * len(LIKE_FIELDS)).fetchall()
+    conn.close()
+    return {row[0] for row in rows}
+
+
+def sample_queries(docs, count=60, seed=1):
+    """자주 쓰는 검색어 + 문서에서 잘라 낸 한글 부분 문자열 (1~5글자)"""
+    rng = random.Random(seed)
+    queries = list(PHRASE_QUERIES)
+    while len(queries) < count:
+        fields = rng.choice(docs)[1]
+        runs = re.findall(r"[가-힣]+", fields[rng.choice(LIKE_FIELDS)])
+        if runs:
+            run = rng.choice(runs)
+            start = rng.randrange(len(run))
+            queries.append(run[start:start + rng.randint(1, 5)])
+    return queries
+
+
+def check_like_recall():
+    """LIKE로 찾던 문서를 인덱스도 모두 찾는지 - 검색어 수 반환"""
+    docs, index = load_corpus()
+    queries = sample_queries(docs)
+    for query in queries:
+        expected = like_search(docs, query)
+        found = {doc_id for doc_id, _ in index.search(query, k=len(docs))}
+        missing = expected - found
+        assert not missing, f"'{query}': LIKE로 찾던 {len(missing)}건 누락 (예: {sorted(missing)[:3]})"
+    return len(queries)
+
+
+def check_top_k_exact(queries, k=3):
+    """상위 k개 점수가 모든 후보를 채점한 결과(k=전체)의 앞부분과 같은지"""
+    docs, index = load_corpus()
+    for query in queries:
+        expected = [round(score, 6) for _, score in index.search(query, k=len(docs))[:k]]
+        actual = [round(score, 6) for _, score in index.search(query, k=k)]
+        assert actual == expected, f"'{query}': {actual} != {expected}"
+
+
+def test_like_recall():
+    check_like_recall()
+
+
+def test_dotted_terms_and_single_hangul():
+    _, index = load_corpus()
+    assert "page-react" in {doc_id for doc_id, _ in index.search("react", k=10000)}
+    assert "page-node" in {doc_id for doc_id, _ in index.search("node", k=10000)}
+    assert "page-react" in {doc_id for doc_id, _ in index.search("하늘", k=10000)}
+    assert "page-react" in {doc_id for doc_id, _ in index.search("김", k=10000)}
+
+
+def test_top_k_matches_full_scoring(monkeypatch):
+    docs, _ = load_corpus()
+    queries = sample_queries(docs) + ["python java react sql", "kafka 데이터 엔지니어", "머신러닝 엔지니어 pytorch"]
+    check_top_k_exact(queries)
+    # 후보가 적어도 champion list 경로(상한 검사/목록 늘리기)를 타도록 해서 한 번 더 확인
+    monkeypatch.setattr(search_index, "DIRECT_SCORE_MAX_DOCS", 0)
+    check_top_k_exact(queries)
+
+
+def test_removed_documents_are_not_returned():
+    docs = search_index._synthetic_resumes(1200, seed=3)
+    index = ResumeSearchIndex()
+    index.add_many(docs)
+    top_id = index.search("백엔드 개발자", k=1)[0][0]
+    index.remove(top_id)
+    assert top_id not in {doc_id for doc_id, _ in index.search("백엔드 개발자", k=len(docs))}
+
+    # 절반 이상 삭제해 재구성한 뒤에도 남은 문서만 반환
+    removed = {doc_id for doc_id, _ in docs[:700]}
+    index.remove_many(removed)
+    found = {doc_id for doc_id, _ in index.search("개발", k=len(docs))}
+    assert found and not found & removed
+
+
+if __name__ == "__main__":
+    query_count = check_like_recall()
+    check_top_k_exact(sample_queries(load_corpus()[0]))
+    print(f"✅ 검색어 {query_count}개 - LIKE 결과를 모두 포함하고 상위 k개가 전체 채점과 같음")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+임시 파일 미사용 회귀 테스트
+이력서 다운로드 → 분석 → 차트 업로드 → PDF 보고서 전송 전체 흐름에서
+작업 디렉토리에 파일이 하나도 생기지 않는지, Slack 업로드가 모두 바이트(content=)로 전송되는지 확인합니다.
+Slack/OpenAI 호출은 가짜 객체로 대체합니다.
+
+실행: python -m pytest test_zero_temp_files.py  또는  python test_zero_temp_files.py
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import importlib
+from types import SimpleNamespace
+
+import fitz
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+USER_ID = "U0TEST0001"
+FILE_URL = "https://files.slack.com/files-pri/T0TEST0001-F0TEST0001/resume.pdf"
+
+ANALYSIS_RESULT = {
+    "name": "홍길동",
+    "total_years": 5,
+    "top_strengths": ["대용량 트래픽 처리", "데이터 파이프라인 설계", "팀 리딩"],
+    "catchphrase": "데이터로 문제를 푸는 백엔드 개발자",
+    "skill_cards": {
+        "domain_knowledge": "커머스/결제 도메인 5년",
+        "tech_skills": "Python: 90%, SQL: 70%, Django: 80%",
+        "soft_skills": "협업, 코드 리뷰 문화 정착",
+    },
+}
+
+
+def make_resume_pdf():
+    """테스트용 이력서 PDF 바이트"""
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "Backend Developer - Python, SQL, Django (5 years)")
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+class FakeSlackHTTP:
+    """Slack 파일 다운로드/메시지 전송용 slack_transport.SlackTransport 대체"""
+
+    def __init__(self, pdf_bytes):
+        self.pdf_bytes = pdf_bytes
+        self.calls = []
+
+    def download(self, url, timeout=None):
+        return SimpleNamespace(status_code=200, content=self.pdf_bytes,
+                               headers={"Content-Type": "application/pdf"})
+
+    def api_call(self, method, **kwargs):
+        self.calls.append((method, kwargs))
+        if method == "files.info":
+            return {"ok": True, "file": {"name": "resume.pdf", "filetype": "pdf", "mimetype": "application/pdf"}}
+        return {"ok": True}
+
+
+class FakeSlackClient:
+    """호출 내용을 기록하는 slack_sdk WebClient 대체"""
+
+    def __init__(self):
+        self.uploads = []
+        self.messages = []
+
+    def conversations_open(self, users=None, **kwargs):
+        return {"ok": True, "channel": {"id": "D0TEST0001"}}
+
+    def files_upload_v2(self, **kwargs):
+        self.uploads.append(kwargs)
+        index = len(self.uploads)
+        return {"ok": True, "file": {"id": f"F0UPLOAD{index}", "url_private": f"https://files.slack.com/{index}"}}
+
+    def chat_postMessage(self, **kwargs):
+        self.messages.append(kwargs)
+        return {"ok": True}
+
+
+def fake_chat_completion(**kwargs):
+    content = json.dumps(ANALYSIS_RESULT, ensure_ascii=False)
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def run_full_analysis(work_dir, data_dir):
+    """작업 디렉토리를 work_dir로 옮긴 뒤 분석 + PDF 전송 수행 - (작업 디렉토리 파일 목록, 가짜 Slack 클라이언트) 반환"""
+    os.environ["JOB_DB_PATH"] = os.path.join(data_dir, "jobs.db")
+    os.environ["RESULT_CACHE_PATH"] = os.path.join(data_dir, "result_cache.db")
+    os.environ["NOTION_MIRROR_PATH"] = os.path.join(data_dir, "notion_mirror.db")
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+
+    original_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        server = importlib.import_module("slack_app_server_debug_notion_v10")
+        server.slack_http = FakeSlackHTTP(make_resume_pdf())
+        server.slack_outbox.transport = server.slack_http
+        server.chat_completion = fake_chat_completion
+        server.client = FakeSlackClient()
+        server.PDF_PREBUILD_ENABLED = True
+
+        before = sorted(os.listdir(work_dir))
+        assert server.perform_complete_analysis(USER_ID, FILE_URL) is True
+        server.send_pdf_report(USER_ID, server.get_analysis_id(server.download_resume(FILE_URL)))
+        server.slack_outbox.flush(timeout=30)
+        after = sorted(os.listdir(work_dir))
+    finally:
+        os.chdir(original_cwd)
+
+    assert before == after, f"작업 디렉토리에 파일이 생성됨: {sorted(set(after) - set(before))}"
+    return after, server.client
+
+
+def check_uploads(client):
+    """차트와 PDF가 모두 바이트로 업로드되었는지 확인"""
+    assert len(client.uploads) >= 2, f"업로드 횟수 부족: {len(client.uploads)}"
+    for upload in client.uploads:
+        assert "file" not in upload, f"파일 경로로 업로드됨: {upload.get('file')}"
+        assert isinstance(upload.get("content"), bytes) and upload["content"]
+    filenames = [upload.get("filename", "") for upload in client.uploads]
+    assert any(name.endswith(".png") for name in filenames), filenames
+    assert any(name.endswith(".pdf") for name in filenames), filenames
+
+
+def test_full_analysis_leaves_working_directory_untouched(tmp_path):
+    work_dir = tmp_path / "cwd"
+    data_dir = tmp_path / "data"
+    work_dir.mkdir()
+    data_dir.mkdir()
+
+    _, client = run_full_analysis(str(work_dir), str(data_dir))
+    check_uploads(client)
+
+
+if __name__ == "__main__":
+    base_dir = tempfile.mkdtemp()
+    try:
+        work_dir = os.path.join(base_dir, "cwd")
+        data_dir = os.path.join(base_dir, "data")
+        os.makedirs(work_dir)
+        os.makedirs(data_dir)
+        files, client = run_full_analysis(work_dir, data_dir)
+        check_uploads(client)
+        print(f"✅ 임시 파일 없음 - 업로드 {len(client.uploads)}건 모두 메모리 바이트로 전송")
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
@@ -51,7 +51,7 @@ def compare_companies(csv_path="wanted_jobs.csv"):
 
 def generate_gpt_insight(top_jobs):
     try:
-        import openai
+        from llm_gateway import chat_completion
     except ImportError:
         print("[경고] openai 패키지가 설치되어 있지 않습니다. GPT 인사이트 생략.")
         return
@@ -59,9 +59,9 @@ def generate_gpt_insight(top_jobs):
     if not api_key:
         print("[경고] OPENAI_API_KEY 환경변수 없음. GPT 인사이트 생략.")
         return
-    client = openai.OpenAI(api_key=api_key)
     prompt = f"이번 달 채용 데이터에서 가장 많이 뽑는 직무 TOP 5는 다음과 같습니다: {top_jobs.to_dict()}. 이 데이터를 바탕으로 한 줄 요약 인사이트를 한국어로 생성해 주세요."
-    response = client.chat.completions.create(
+    response = chat_completion(
+        api_key=api_key,
         model="gpt-3.5-turbo",
         messages=[
             {"role": "system", "content": "너는 채용 데이터 분석가야. 반드시 한글로 한 줄 요약만 해줘."},
@@ -75,38 +75,22 @@ def generate_gpt_insight(top_jobs):
     return insight
 
 def send_to_slack(text, slack_token, channel):
-    url = "https://slack.com/api/chat.postMessage"
-    headers = {
-        "Authorization": f"Bearer {slack_token}",
-        "Content-Type": "application/json"
-    }
+    from slack_transport import get_transport as get_slack_transport
     data = {
         "channel": channel,
         "text": text
     }
-    response = requests.post(url, headers=headers, json=data)
-    print("[Slack 응답]", response.json())
+    result = get_slack_transport(slack_token).api_call("chat.postMessage", json=data)
+    print("[Slack 응답]", result)
 
 def main():
     top_jobs = analyze_top5_jobs()
     compare_companies()
-    # GPT 인사이트 생성
+    # GPT 인사이트 생성 (LLM 게이트웨이 경유)
     try:
-        import openai
-        api_key = os.getenv("OPENAI_API_KEY")
-        client = openai.OpenAI(api_key=api_key)
-        prompt = f"이번 달 채용 데이터에서 가장 많이 뽑는 직무 TOP 5는 다음과 같습니다: {top_jobs.to_dict()}. 이 데이터를 바탕으로 한 줄 요약 인사이트를 한국어로 생성해 주세요."
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "너는 채용 데이터 분석가야. 반드시 한글로 한 줄 요약만 해줘."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3
-        )
-        insight = response.choices[0].message.content.strip()
-        print("\n[GPT 자동 인사이트]")
-        print(insight)
+        insight = generate_gpt_insight(top_jobs)
+        if not insight:
+            return
         # 슬랙 전송
         SLACK_TOKEN = os.getenv("SLACK_BOT_TOKEN", "your-slack-bot-token-here")  # 환경변수에서 가져오기
         SLACK_CHANNEL = "U08TYB64MD3"             # ← 여기에 채널명(예: #general) 또는 채널ID(예: C12345678) 입력!